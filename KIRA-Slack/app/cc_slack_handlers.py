@@ -4,6 +4,9 @@ import re
 from app.queueing_extended import debounced_enqueue_message, enqueue_orchestrator_job
 from app.cc_utils.language_helper import detect_language
 from app.cc_utils.slack_helper import get_slack_context_data
+from app.cc_utils.slack_user_directory import get_user_directory
+from app.cc_utils.slack_channel_directory import get_channel_directory
+from app.cc_utils.slack_message_buffer import get_message_buffer
 from app.cc_agents.bot_call_detector import call_bot_call_detector
 from app.cc_agents.bot_thread_context_detector import call_bot_thread_context_detector
 from app.cc_agents.answer_aggregator import call_answer_aggregator
@@ -70,9 +73,8 @@ async def get_user_name(user_id: str, client: WebClient) -> str:
         str: display_name or real_name (returns user_id on failure)
     """
     try:
-        response = await client.users_info(user=user_id)
-        if response["ok"]:
-            user = response["user"]
+        user = await get_user_directory().get(user_id, client)
+        if user:
             profile = user.get("profile", {})
             # Prefer display_name, use real_name if not available
             return profile.get("display_name") or user.get("real_name", user_id)
@@ -82,6 +84,12 @@ async def get_user_name(user_id: str, client: WebClient) -> str:
     return user_id
 
 
+def invalidate_channel_on_change(event: dict) -> None:
+    """Drop cached channel info when a message reports a rename or topic/purpose change"""
+    if event.get("subtype") in ("channel_name", "channel_topic", "channel_purpose"):
+        get_channel_directory().invalidate(event.get("channel"))
+
+
 async def convert_mentions_to_readable(text: str, client: WebClient) -> str:
     """
     Convert Slack mention format <@U12345> to human-readable format
@@ -97,10 +105,9 @@ async def convert_mentions_to_readable(text: str, client: WebClient) -> str:
         user_id = match.group(1)
         if user_id not in user_map:
             try:
-                # Fetch user info via Slack API
-                response = await client.users_info(user=user_id)
-                if response["ok"]:
-                    user = response["user"]
+                # Fetch user info (cached user directory)
+                user = await get_user_directory().get(user_id, client)
+                if user:
                     profile = user.get("profile", {})
                     # Prefer display_name, use real_name if not available
                     display_name = profile.get("display_name") or user.get("real_name", f"User {user_id}")
@@ -144,7 +151,7 @@ async def _process_message_logic(message, client):
     user_text = await convert_mentions_to_readable(user_text, client)
 
     # Collect channel info from Slack API
-    slack_data = get_slack_context_data(channel_id, message_limit=10)
+    slack_data = await get_slack_context_data(channel_id, message_limit=10)
 
     # Add current message info
     message_data = {
@@ -399,9 +406,8 @@ def register_handlers(app):
             return False
 
         try:
-            # Check if bot is a member by fetching channel info
-            result = await client.conversations_info(channel=channel_id)
-            return result.get("channel", {}).get("is_member", False)
+            # Check membership from the cached channel info
+            return await get_channel_directory().is_member(channel_id, client)
         except Exception as e:
             # Return False if channel info fetch fails (e.g., no permission)
             logging.debug(f"Channel membership check failed for {channel_id}: {e}")
@@ -422,6 +428,9 @@ def register_handlers(app):
     @app.event("message", matchers=[is_dm])
     async def handle_dm_message(event, body, client):
         """Handle DM messages (1:1 DM + group DM, always processed, no channel membership check needed)"""
+        # Keep recent history current (including bot messages, edits and deletes)
+        get_message_buffer().apply_event(event)
+
         # Exclude bot messages
         if event.get("bot_id") is not None:
             return
@@ -458,6 +467,9 @@ def register_handlers(app):
     @app.event("message", matchers=[is_channel, is_bot_in_channel])
     async def handle_channel_message(event, body, client):
         """Handle channel messages (public/private channels, only where bot is a member)"""
+        # Keep recent history current (including bot messages, edits and deletes)
+        get_message_buffer().apply_event(event)
+
         # Exclude bot messages
         if event.get("bot_id") is not None:
             return
@@ -484,6 +496,7 @@ def register_handlers(app):
         # Ignore messages with subtype (edit, delete, etc.)
         subtype = event.get("subtype")
         if subtype is not None:
+            invalidate_channel_on_change(event)
             return
 
         # Process pure text messages (both normal and thread messages)
@@ -514,31 +527,58 @@ def register_handlers(app):
     async def ignore_link_shared(body, logger):
         logger.debug("link_shared event ignored (already handled via message event)")
 
-    # member_joined_channel - member joined channel
+    # user_change / team_join - keep the cached user directory current
+    @app.event("user_change")
+    async def handle_user_change(event, logger):
+        get_user_directory().update(event["user"])
+        logger.debug(f"user_change: refreshed {event['user'].get('id')}")
+
+    @app.event("team_join")
+    async def handle_team_join(event, logger):
+        get_user_directory().update(event["user"])
+        logger.debug(f"team_join: added {event['user'].get('id')}")
+
+    # member_joined_channel - member joined channel (update channel cache)
     @app.event("member_joined_channel")
-    async def ignore_member_joined(body, logger):
-        logger.debug("member_joined_channel event ignored")
+    async def handle_member_joined(event, logger):
+        user_id = event.get("user")
+        get_channel_directory().member_joined(
+            event["channel"], user_id, is_bot=user_id == get_bot_user_id()
+        )
+        logger.debug(f"member_joined_channel: {user_id} in {event['channel']}")
 
-    # member_left_channel - member left channel
+    # member_left_channel - member left channel (update channel cache)
     @app.event("member_left_channel")
-    async def ignore_member_left(body, logger):
-        logger.debug("member_left_channel event ignored")
+    async def handle_member_left(event, logger):
+        user_id = event.get("user")
+        get_channel_directory().member_left(
+            event["channel"], user_id, is_bot=user_id == get_bot_user_id()
+        )
+        logger.debug(f"member_left_channel: {user_id} in {event['channel']}")
 
-    # channel_left - bot left/removed from channel
+    # channel_left - bot left/removed from channel (update channel cache)
     @app.event("channel_left")
-    async def ignore_channel_left(body, logger):
-        logger.debug("channel_left event ignored")
+    async def handle_channel_left(event, logger):
+        get_channel_directory().member_left(
+            event["channel"], get_bot_user_id(), is_bot=True
+        )
+        logger.debug(f"channel_left: bot left {event['channel']}")
 
-    # group_left - bot left group
+    # group_left - bot left group (update channel cache)
     @app.event("group_left")
-    async def ignore_group_left(body, logger):
-        logger.debug("group_left event ignored")
+    async def handle_group_left(event, logger):
+        get_channel_directory().member_left(
+            event["channel"], get_bot_user_id(), is_bot=True
+        )
+        logger.debug(f"group_left: bot left {event['channel']}")
 
     # All other message subtypes (edit, delete, join/leave, etc.)
     @app.event("message")
     async def handle_other_message_subtypes(body, logger):
         event = body.get("event", {})
         subtype = event.get("subtype")
+        get_message_buffer().apply_event(event)
+        invalidate_channel_on_change(event)
         if subtype is not None:
             logger.debug(
                 f"Message subtype ignored: {subtype} in {event.get('channel')}"
@@ -13,15 +13,16 @@ from slack_sdk.errors import SlackApiError
 
 from app.config.settings import get_settings
 from app.cc_utils.confirm_db import add_confirm_request
+from app.cc_utils.slack_client import get_shared_async_client
 
 
 def get_slack_client() -> AsyncWebClient:
-    """Return Slack AsyncWebClient instance"""
+    """Return the shared Slack AsyncWebClient instance"""
     settings = get_settings()
     token = settings.SLACK_BOT_TOKEN
     if not token:
         raise ValueError("SLACK_BOT_TOKEN is not set in settings")
-    return AsyncWebClient(token=token)
+    return get_shared_async_client(token)
 
 
 @tool(
@@ -14,15 +14,17 @@ from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 
 from app.config.settings import get_settings
+from app.cc_utils.slack_client import get_shared_async_client, paginate
+from app.cc_utils.slack_user_directory import get_user_directory
 
 
 def get_slack_client() -> AsyncWebClient:
-    """Return Slack AsyncWebClient instance"""
+    """Return the shared Slack AsyncWebClient instance"""
     settings = get_settings()
     token = settings.SLACK_BOT_TOKEN
     if not token:
         raise ValueError("SLACK_BOT_TOKEN is not set in settings")
-    return AsyncWebClient(token=token)
+    return get_shared_async_client(token)
 
 
 
@@ -957,11 +959,9 @@ async def slack_get_user_profile(args: Dict[str, Any]) -> Dict[str, Any]:
     user_id = args["user_id"]
 
     try:
-        client = get_slack_client()
-        response = await client.users_info(user=user_id)
+        user = await get_user_directory().get(user_id, get_slack_client())
 
-        if response and response.get("ok"):
-            user = response.get("user", {})
+        if user:
             profile = user.get("profile", {})
 
             return {
@@ -1029,35 +1029,23 @@ async def slack_get_thread_replies(args: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         client = get_slack_client()
-        response = await client.conversations_replies(
+        messages = await paginate(
+            client.conversations_replies,
+            "messages",
             channel=channel_id,
             ts=thread_ts
         )
 
-        if response and response.get("ok"):
-            messages = response.get("messages", [])
-            return {
-                "content": [{
-                    "type": "text",
-                    "text": json.dumps({
-                        "success": True,
-                        "message_count": len(messages),
-                        "messages": messages
-                    }, ensure_ascii=False, indent=2)
-                }]
-            }
-        else:
-            return {
-                "content": [{
-                    "type": "text",
-                    "text": json.dumps({
-                        "success": False,
-                        "error": True,
-                        "message": "Failed to retrieve thread replies"
-                    }, ensure_ascii=False, indent=2)
-                }],
-                "error": True
-            }
+        return {
+            "content": [{
+                "type": "text",
+                "text": json.dumps({
+                    "success": True,
+                    "message_count": len(messages),
+                    "messages": messages
+                }, ensure_ascii=False, indent=2)
+            }]
+        }
 
     except SlackApiError as e:
         return {
@@ -1373,67 +1361,43 @@ async def slack_get_dm_channel_id(args: Dict[str, Any]) -> Dict[str, Any]:
 )
 async def slack_find_user_by_name(args: Dict[str, Any]) -> Dict[str, Any]:
     """Search user by name"""
-    search_name = args["name"].strip().lower()
-
     try:
-        client = get_slack_client()
-        response = await client.users_list()
-
-        if response and response.get("ok"):
-            members = response.get("members", [])
-            matches = []
-
-            for user in members:
-                if user.get("deleted") or user.get("is_bot"):
-                    continue
-
-                real_name = user.get("real_name", "").lower()
-                profile = user.get("profile", {})
-                display_name = profile.get("display_name", "").lower()
-
-                if search_name in real_name or search_name in display_name:
-                    matches.append({
-                        "user_id": user.get("id"),
-                        "real_name": user.get("real_name"),
-                        "display_name": profile.get("display_name"),
-                        "email": profile.get("email")
-                    })
+        users = await get_user_directory().find_by_name(
+            args["name"], get_slack_client()
+        )
+        matches = [
+            {
+                "user_id": user.get("id"),
+                "real_name": user.get("real_name"),
+                "display_name": user.get("profile", {}).get("display_name"),
+                "email": user.get("profile", {}).get("email")
+            }
+            for user in users
+        ]
 
-            if matches:
-                return {
-                    "content": [{
-                        "type": "text",
-                        "text": json.dumps({
-                            "success": True,
-                            "matches": matches,
-                            "count": len(matches),
-                            "message": f"Found {len(matches)} user(s)"
-                        }, ensure_ascii=False, indent=2)
-                    }]
-                }
-            else:
-                return {
-                    "content": [{
-                        "type": "text",
-                        "text": json.dumps({
-                            "success": False,
-                            "matches": [],
-                            "count": 0,
-                            "message": f"No users found matching '{args['name']}'"
-                        }, ensure_ascii=False, indent=2)
-                    }]
-                }
+        if matches:
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": json.dumps({
+                        "success": True,
+                        "matches": matches,
+                        "count": len(matches),
+                        "message": f"Found {len(matches)} user(s)"
+                    }, ensure_ascii=False, indent=2)
+                }]
+            }
         else:
             return {
                 "content": [{
                     "type": "text",
                     "text": json.dumps({
                         "success": False,
-                        "error": True,
-                        "message": "Failed to retrieve user list"
+                        "matches": [],
+                        "count": 0,
+                        "message": f"No users found matching '{args['name']}'"
                     }, ensure_ascii=False, indent=2)
-                }],
-                "error": True
+                }]
             }
 
     except SlackApiError as e:
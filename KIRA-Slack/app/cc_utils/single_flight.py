@@ -0,0 +1,50 @@
+"""
+Single Flight
+Share one in-flight request between concurrent callers asking for the same key
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+async def single_flight(
+    pending: Dict[Hashable, asyncio.Future],
+    key: Hashable,
+    fetch: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Run `fetch`, or wait for the identical fetch already in flight
+
+    Args:
+        pending: In-flight futures by key, owned by the caller's cache
+        key: Identifies the request; callers with the same key share it
+        fetch: Coroutine function that performs the request
+
+    Returns:
+        The result of `fetch`, also handed to every caller that joined it
+
+    Raises:
+        Whatever `fetch` raised, in the caller that ran it and in every
+        caller that joined it. Failures are not remembered.
+    """
+    future = pending.get(key)
+    if future is not None:
+        # A joiner being cancelled must not cancel the shared request
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    pending[key] = future
+    try:
+        result = await fetch()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a lookup nobody shared does not log a warning
+        future.exception()
+        raise
+    finally:
+        del pending[key]
@@ -0,0 +1,197 @@
+"""
+Slack Channel Directory
+Cache of channel info and membership, kept current from membership events
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from app.cc_utils.single_flight import single_flight
+from app.cc_utils.slack_client import paginate
+
+
+class _ChannelEntry:
+    __slots__ = ("channel", "members", "fetched_at")
+
+    def __init__(self, channel: Dict[str, Any]):
+        self.channel = channel
+        # Member IDs, loaded on first get_members() while the entry is fresh
+        self.members: Optional[Set[str]] = None
+        self.fetched_at = time.monotonic()
+
+
+class ChannelDirectory:
+    """
+    LRU + TTL cache of Slack channels (as returned by conversations.info)
+
+    Holds each channel's type, name, topic and whether the bot is a member,
+    plus its member set once requested. Membership events update entries in
+    place, so deciding whether to handle a channel message needs no Slack API
+    call while the entry is fresh. Concurrent lookups of the same channel
+    share one request.
+    """
+
+    def __init__(self, max_size: int = 5000, ttl_seconds: float = 600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._channels: "OrderedDict[str, _ChannelEntry]" = OrderedDict()
+        self._pending: Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _default_client():
+        from app.cc_utils.slack_helper import get_async_slack_client
+
+        return get_async_slack_client()
+
+    def _cached(self, channel_id: str) -> Optional[_ChannelEntry]:
+        entry = self._channels.get(channel_id)
+        if entry is None or time.monotonic() - entry.fetched_at > self.ttl_seconds:
+            return None
+        self._channels.move_to_end(channel_id)
+        return entry
+
+    def update(self, channel: Dict[str, Any]) -> None:
+        """
+        Insert or refresh a channel object
+
+        The member set is dropped along with the old entry, so it is refetched
+        on the next get_members() and expires with the channel info.
+        """
+        channel_id = channel.get("id")
+        if not channel_id:
+            return
+        self._channels.pop(channel_id, None)
+        self._channels[channel_id] = _ChannelEntry(channel)
+        while len(self._channels) > self.max_size:
+            self._channels.popitem(last=False)
+
+    def invalidate(self, channel_id: str) -> None:
+        """Drop a channel from the cache"""
+        self._channels.pop(channel_id, None)
+
+    async def get(self, channel_id: str, client=None) -> Dict[str, Any]:
+        """
+        Get a channel object by ID
+
+        Args:
+            channel_id: Slack channel ID
+            client: Slack AsyncWebClient (defaults to the shared client)
+
+        Returns:
+            Slack channel object
+
+        Raises:
+            SlackApiError: If the lookup failed (failures are not cached)
+        """
+        entry = self._cached(channel_id)
+        if entry is not None:
+            self.hits += 1
+            return entry.channel
+        self.misses += 1
+
+        async def fetch():
+            client_ = client or self._default_client()
+            response = await client_.conversations_info(channel=channel_id)
+            channel = response["channel"]
+            self.update(channel)
+            return channel
+
+        return await single_flight(self._pending, ("info", channel_id), fetch)
+
+    async def is_member(self, channel_id: str, client=None) -> bool:
+        """Whether the bot is a member of the channel"""
+        channel = await self.get(channel_id, client)
+        return channel.get("is_member", False)
+
+    async def get_members(self, channel_id: str, client=None) -> Set[str]:
+        """
+        Get the member IDs of a channel
+
+        Args:
+            channel_id: Slack channel ID
+            client: Slack AsyncWebClient (defaults to the shared client)
+
+        Returns:
+            Set of member user IDs
+
+        Raises:
+            SlackApiError: If the lookup failed (failures are not cached)
+        """
+        await self.get(channel_id, client)
+        entry = self._channels.get(channel_id)
+        if entry is not None and entry.members is not None:
+            return entry.members
+
+        async def fetch():
+            client_ = client or self._default_client()
+            members = set(
+                await paginate(
+                    client_.conversations_members,
+                    "members",
+                    page_size=1000,
+                    channel=channel_id,
+                )
+            )
+            entry = self._channels.get(channel_id)
+            if entry is not None:
+                entry.members = members
+            return members
+
+        return await single_flight(self._pending, ("members", channel_id), fetch)
+
+    def member_joined(self, channel_id: str, user_id: str, is_bot: bool) -> None:
+        """
+        Apply a member_joined_channel event
+
+        Args:
+            channel_id: Channel the user joined
+            user_id: User who joined
+            is_bot: Whether the user is this bot
+        """
+        entry = self._channels.get(channel_id)
+        if entry is None:
+            return
+        if is_bot:
+            entry.channel["is_member"] = True
+        if entry.members is not None:
+            if user_id in entry.members:
+                return
+            entry.members.add(user_id)
+        if "num_members" in entry.channel:
+            entry.channel["num_members"] += 1
+
+    def member_left(self, channel_id: str, user_id: str, is_bot: bool) -> None:
+        """
+        Apply a member_left_channel / channel_left event
+
+        Args:
+            channel_id: Channel the user left
+            user_id: User who left
+            is_bot: Whether the user is this bot
+        """
+        entry = self._channels.get(channel_id)
+        if entry is None:
+            return
+        if is_bot:
+            entry.channel["is_member"] = False
+        if entry.members is not None:
+            if user_id not in entry.members:
+                return
+            entry.members.discard(user_id)
+        if entry.channel.get("num_members"):
+            entry.channel["num_members"] -= 1
+
+
+_directory: Optional[ChannelDirectory] = None
+
+
+def get_channel_directory() -> ChannelDirectory:
+    """Return the process-wide channel directory"""
+    global _directory
+    if _directory is None:
+        _directory = ChannelDirectory()
+    return _directory
@@ -0,0 +1,324 @@
+"""
+Shared Slack Client
+Pooled AsyncWebClient per token with per-method rate limiting, pagination and metrics
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncConnectionErrorRetryHandler,
+    AsyncRateLimitErrorRetryHandler,
+)
+from slack_sdk.web.async_client import AsyncWebClient
+
+# Requests per minute and burst size of each Slack rate limit tier
+# (https://api.slack.com/apis/rate-limits)
+TIER_LIMITS: Dict[Any, Tuple[float, int]] = {
+    1: (1, 1),
+    2: (20, 3),
+    3: (50, 5),
+    4: (100, 10),
+    # chat.postMessage: about one message per second per channel
+    "post": (60, 3),
+}
+
+# Tier of the methods this app calls (others default to DEFAULT_TIER)
+METHOD_TIERS: Dict[str, Any] = {
+    "users.list": 2,
+    "conversations.list": 2,
+    "search.messages": 2,
+    "usergroups.users.list": 2,
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.info": 3,
+    "conversations.open": 3,
+    "users.lookupByEmail": 3,
+    "users.profile.set": 3,
+    "reactions.add": 3,
+    "chat.update": 3,
+    "chat.delete": 3,
+    "users.info": 4,
+    "conversations.members": 4,
+    "files.info": 4,
+    "chat.postMessage": "post",
+    "chat.postEphemeral": "post",
+}
+DEFAULT_TIER = 3
+
+# Max pooled HTTP connections per token
+MAX_CONNECTIONS = 20
+
+_clients: Dict[str, "PooledAsyncWebClient"] = {}
+
+
+class _TokenBucket:
+    """
+    Token bucket kept as a single "theoretical arrival time" (GCRA)
+
+    Callers reserve the next slot under the lock and sleep outside it, so
+    waiters are released in order, `burst` at once at most.
+    """
+
+    def __init__(self, per_minute: float, burst: int):
+        self.interval = 60.0 / per_minute
+        self.tolerance = (burst - 1) * self.interval
+        self._tat = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        async with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            wait = max(0.0, tat - self.tolerance - now)
+            self._tat = tat + self.interval
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def block(self, seconds: float) -> None:
+        """Hold every request back for `seconds` (after a 429 Retry-After)"""
+        self._tat = max(self._tat, time.monotonic() + seconds + self.tolerance)
+
+
+class SlackRateLimiter:
+    """
+    Per-method token buckets sized by the method's Slack rate limit tier
+
+    Slack applies its limits per method (and chat.postMessage per channel),
+    so each gets its own bucket. A 429 blocks that bucket for Retry-After
+    seconds, holding back every caller, not only the one that retries.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, _TokenBucket] = {}
+
+    @staticmethod
+    def _key(api_method: str, channel: Optional[str]) -> str:
+        if METHOD_TIERS.get(api_method) == "post" and channel:
+            return f"{api_method}:{channel}"
+        return api_method
+
+    def _bucket(self, key: str) -> _TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tier = METHOD_TIERS.get(key.split(":", 1)[0], DEFAULT_TIER)
+            bucket = self._buckets[key] = _TokenBucket(*TIER_LIMITS[tier])
+        return bucket
+
+    async def acquire(self, api_method: str, channel: Optional[str] = None) -> float:
+        """Wait for a request slot; returns seconds waited"""
+        return await self._bucket(self._key(api_method, channel)).acquire()
+
+    def block(
+        self, api_method: str, seconds: float, channel: Optional[str] = None
+    ) -> None:
+        self._bucket(self._key(api_method, channel)).block(seconds)
+
+
+class SlackApiMetrics:
+    """Per-method Slack API call counters"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.ratelimited: Dict[str, int] = defaultdict(int)
+        self.throttled_sec: Dict[str, float] = defaultdict(float)
+        self.latency_sec: Dict[str, float] = defaultdict(float)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the counters per method
+
+        Returns:
+            {method: {"calls", "errors", "ratelimited", "throttled_sec",
+                      "avg_latency_sec"}}
+        """
+        return {
+            method: {
+                "calls": calls,
+                "errors": self.errors[method],
+                "ratelimited": self.ratelimited[method],
+                "throttled_sec": round(self.throttled_sec[method], 3),
+                "avg_latency_sec": round(self.latency_sec[method] / calls, 3),
+            }
+            for method, calls in self.calls.items()
+        }
+
+
+class _RateLimitRetryHandler(AsyncRateLimitErrorRetryHandler):
+    """Retries 429s after Retry-After, and blocks the method's bucket meanwhile"""
+
+    def __init__(
+        self,
+        limiter: SlackRateLimiter,
+        metrics: SlackApiMetrics,
+        max_retry_count: int = 2,
+    ):
+        super().__init__(max_retry_count=max_retry_count)
+        self.limiter = limiter
+        self.metrics = metrics
+
+    async def prepare_for_next_attempt_async(
+        self, *, state, request, response=None, error=None
+    ) -> None:
+        if response is not None:
+            api_method = request.url.rsplit("/", 1)[-1]
+            retry_after = 1.0
+            for name, values in response.headers.items():
+                if name.lower() == "retry-after" and values:
+                    retry_after = float(values[0])
+            self.limiter.block(
+                api_method, retry_after, _request_channel(request.body_params)
+            )
+            self.metrics.ratelimited[api_method] += 1
+            logging.warning(
+                f"[SLACK_API] {api_method} rate limited, retrying after {retry_after}s "
+                f"({self.metrics.ratelimited[api_method]} so far)"
+            )
+        await super().prepare_for_next_attempt_async(
+            state=state, request=request, response=response, error=error
+        )
+
+
+def _request_channel(*sources: Optional[dict]) -> Optional[str]:
+    for source in sources:
+        if isinstance(source, dict) and source.get("channel"):
+            return source["channel"]
+    return None
+
+
+class PooledAsyncWebClient(AsyncWebClient):
+    """
+    AsyncWebClient that reuses one aiohttp session (keep-alive connections)
+    and passes every call through the shared rate limiter and metrics
+    """
+
+    def __init__(self, token: str, **kwargs):
+        self.limiter = SlackRateLimiter()
+        self.metrics = SlackApiMetrics()
+        super().__init__(
+            token=token,
+            retry_handlers=[
+                AsyncConnectionErrorRetryHandler(),
+                _RateLimitRetryHandler(self.limiter, self.metrics),
+            ],
+            **kwargs,
+        )
+
+    def _ensure_session(self) -> None:
+        # Created on first use so it belongs to the running event loop
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def api_call(self, api_method: str, **kwargs):
+        self._ensure_session()
+        channel = _request_channel(
+            kwargs.get("json"), kwargs.get("data"), kwargs.get("params")
+        )
+        self.metrics.throttled_sec[api_method] += await self.limiter.acquire(
+            api_method, channel
+        )
+
+        start = time.monotonic()
+        try:
+            return await super().api_call(api_method, **kwargs)
+        except SlackApiError:
+            self.metrics.errors[api_method] += 1
+            raise
+        finally:
+            self.metrics.calls[api_method] += 1
+            self.metrics.latency_sec[api_method] += time.monotonic() - start
+
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+
+def get_shared_async_client(token: str) -> PooledAsyncWebClient:
+    """
+    Return the process-wide Slack client for a token
+
+    Args:
+        token: Slack bot or user token
+
+    Returns:
+        PooledAsyncWebClient shared by every caller using this token
+    """
+    if not token:
+        raise ValueError("Slack token is not set")
+    client = _clients.get(token)
+    if client is None:
+        client = _clients[token] = PooledAsyncWebClient(token=token)
+    return client
+
+
+def log_shared_client_metrics() -> None:
+    """Log the per-method counters of every shared client (one line per client)"""
+    for token, client in _clients.items():
+        snapshot = client.metrics.snapshot()
+        if not snapshot:
+            continue
+        methods = ", ".join(
+            f"{method}: {m['calls']} calls, {m['errors']} errors, "
+            f"{m['ratelimited']} ratelimited, {m['throttled_sec']}s throttled, "
+            f"{m['avg_latency_sec']}s avg"
+            for method, m in sorted(
+                snapshot.items(), key=lambda item: -item[1]["calls"]
+            )
+        )
+        # Only the token type prefix (xoxb/xoxp), never the token itself
+        logging.info(f"[SLACK_API] {token.split('-', 1)[0]} client: {methods}")
+
+
+async def close_shared_clients() -> None:
+    """Close the pooled HTTP sessions (on shutdown)"""
+    for client in _clients.values():
+        await client.close()
+
+
+async def paginate(
+    method: Callable[..., Awaitable[Any]],
+    key: str,
+    page_size: int = 200,
+    max_items: Optional[int] = None,
+    **kwargs,
+) -> List[Any]:
+    """
+    Call a cursor-paginated Slack method until all pages are read
+
+    Args:
+        method: Client method, e.g. client.users_list
+        key: Response field holding the items, e.g. "members"
+        page_size: Items per page (Slack's `limit`)
+        max_items: Stop once this many items were collected
+        **kwargs: Other arguments of the method
+
+    Returns:
+        Items of every page, in order
+
+    Example:
+        members = await paginate(
+            client.conversations_members, "members", channel=channel_id
+        )
+    """
+    items: List[Any] = []
+    cursor = None
+    while True:
+        if cursor:
+            kwargs["cursor"] = cursor
+        response = await method(limit=page_size, **kwargs)
+        items.extend(response.get(key, []))
+        if max_items is not None and len(items) >= max_items:
+            return items[:max_items]
+        cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            return items
@@ -3,24 +3,71 @@ Slack API Helper Functions
 Utility functions for querying channel info, user info, etc.
 """
 
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, Iterable, Awaitable, TypeVar
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from app.cc_utils.slack_client import PooledAsyncWebClient, get_shared_async_client
+from app.cc_utils.slack_user_directory import get_user_directory
+from app.cc_utils.slack_channel_directory import get_channel_directory
+from app.cc_utils.slack_message_buffer import get_message_buffer
 import os
 
+T = TypeVar("T")
+
 # Bot profile image cache
 _bot_profile_image: Optional[str] = None
 
+# Sync client (created on first use)
+_sync_client: Optional[WebClient] = None
 
-def get_slack_client() -> WebClient:
-    """Return Slack WebClient instance"""
+# Max Slack API calls in flight while gathering context for one message
+MAX_CONCURRENT_REQUESTS = 10
+
+
+def _get_token() -> str:
     token = os.getenv("SLACK_BOT_TOKEN")
     if not token:
         raise ValueError("SLACK_BOT_TOKEN environment variable is not set")
-    return WebClient(token=token)
+    return token
+
+
+def get_slack_client() -> WebClient:
+    """Return the shared Slack WebClient instance"""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = WebClient(token=_get_token())
+    return _sync_client
+
+
+def get_async_slack_client() -> PooledAsyncWebClient:
+    """Return the shared (pooled, rate limited) Slack AsyncWebClient instance"""
+    return get_shared_async_client(_get_token())
+
+
+async def gather_bounded(
+    coros: Iterable[Awaitable[T]], limit: int = MAX_CONCURRENT_REQUESTS
+) -> List[T]:
+    """
+    Run awaitables concurrently with at most `limit` in flight
 
+    Args:
+        coros: Awaitables to run
+        limit: Max number running at the same time
 
-def get_channel_info(channel_id: str) -> Optional[Dict[str, Any]]:
+    Returns:
+        Results in the same order as `coros`
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(coro: Awaitable[T]) -> T:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros))
+
+
+async def get_channel_info(channel_id: str) -> Optional[Dict[str, Any]]:
     """
     Get channel info
 
@@ -39,12 +86,12 @@ def get_channel_info(channel_id: str) -> Optional[Dict[str, Any]]:
             "members": List[str]  # List of channel member IDs
         }
     """
-    client = get_slack_client()
+    client = get_async_slack_client()
+    channels = get_channel_directory()
 
     try:
-        # Get channel info
-        response = client.conversations_info(channel=channel_id)
-        channel = response["channel"]
+        # Get channel info (cached)
+        channel = await channels.get(channel_id, client)
 
         # Determine channel type
         if channel.get("is_im"):
@@ -60,8 +107,7 @@ def get_channel_info(channel_id: str) -> Optional[Dict[str, Any]]:
         members = []
         if not channel.get("is_im"):
             try:
-                members_response = client.conversations_members(channel=channel_id)
-                members = members_response["members"]
+                members = list(await channels.get_members(channel_id, client))
             except SlackApiError as e:
                 print(f"Failed to get channel members: {e}")
 
@@ -113,7 +159,7 @@ def get_bot_profile_image() -> str:
         return "https://ca.slack-edge.com/E01DL1Z9D6Z-U09EV9ED4HL-68cc5ad19dd2-512"
 
 
-def get_user_info(user_id: str) -> Optional[Dict[str, Any]]:
+async def get_user_info(user_id: str) -> Optional[Dict[str, Any]]:
     """
     Get user info
 
@@ -130,11 +176,10 @@ def get_user_info(user_id: str) -> Optional[Dict[str, Any]]:
             "timezone": str
         }
     """
-    client = get_slack_client()
-
     try:
-        response = client.users_info(user=user_id)
-        user = response["user"]
+        user = await get_user_directory().get(user_id, get_async_slack_client())
+        if not user:
+            return None
 
         return {
             "user_id": user["id"],
@@ -150,32 +195,49 @@ def get_user_info(user_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def get_channel_members_info(channel_id: str) -> List[Dict[str, Any]]:
+async def get_users_info(user_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Get user info for several users concurrently (each user fetched once)
+
+    Args:
+        user_ids: Slack user IDs (duplicates allowed)
+
+    Returns:
+        Dict of user ID -> user info (None if the lookup failed)
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    results = await gather_bounded(get_user_info(user_id) for user_id in unique_ids)
+    return dict(zip(unique_ids, results))
+
+
+async def get_channel_members_info(
+    channel_id: str,
+    channel_info: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
     """
     Get detailed info for channel members
 
     Args:
         channel_id: Slack channel ID
+        channel_info: Result of get_channel_info, if already fetched
 
     Returns:
         List of user info dicts
     """
-    channel_info = get_channel_info(channel_id)
+    if channel_info is None:
+        channel_info = await get_channel_info(channel_id)
     if not channel_info:
         return []
 
-    members = channel_info.get("members", [])
-    members_info = []
-
-    for user_id in members:
-        user_info = get_user_info(user_id)
-        if user_info and not user_info["is_bot"]:  # Exclude bots
-            members_info.append(user_info)
-
-    return members_info
+    users = await get_users_info(channel_info.get("members", []))
+    return [
+        user_info
+        for user_info in users.values()
+        if user_info and not user_info["is_bot"]  # Exclude bots
+    ]
 
 
-def get_thread_messages(channel_id: str, thread_ts: str) -> List[Dict[str, Any]]:
+async def get_thread_messages(channel_id: str, thread_ts: str) -> List[Dict[str, Any]]:
     """
     Get all messages in a thread
 
@@ -186,10 +248,10 @@ def get_thread_messages(channel_id: str, thread_ts: str) -> List[Dict[str, Any]]
     Returns:
         List of message dicts
     """
-    client = get_slack_client()
+    client = get_async_slack_client()
 
     try:
-        response = client.conversations_replies(
+        response = await client.conversations_replies(
             channel=channel_id,
             ts=thread_ts
         )
@@ -200,10 +262,13 @@ def get_thread_messages(channel_id: str, thread_ts: str) -> List[Dict[str, Any]]
         return []
 
 
-def get_recent_messages(channel_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+async def get_recent_messages(channel_id: str, limit: int = 100) -> List[Dict[str, Any]]:
     """
     Get recent messages from a channel
 
+    Served from the message buffer fed by message events; the Slack API is
+    only called to backfill it.
+
     Args:
         channel_id: Slack channel ID
         limit: Number of messages to retrieve (default 100)
@@ -211,34 +276,33 @@ def get_recent_messages(channel_id: str, limit: int = 100) -> List[Dict[str, Any
     Returns:
         List of message dicts (newest first)
     """
-    client = get_slack_client()
-
     try:
-        response = client.conversations_history(
-            channel=channel_id,
-            limit=limit
+        return await get_message_buffer().recent(
+            channel_id, limit, get_async_slack_client()
         )
-        return response["messages"]
 
     except SlackApiError as e:
         print(f"Error fetching recent messages: {e}")
         return []
 
 
-def format_message_for_context(message: Dict[str, Any]) -> str:
+def format_message_for_context(
+    message: Dict[str, Any],
+    users: Dict[str, Optional[Dict[str, Any]]]
+) -> str:
     """
     Format Slack message for context storage
 
     Args:
         message: Slack message dictionary
+        users: Dict of user ID -> user info for the message authors
 
     Returns:
         Formatted message string (e.g., "[Username]: Message content")
     """
-    # Get user info
     user_id = message.get("user")
     if user_id:
-        user_info = get_user_info(user_id)
+        user_info = users.get(user_id)
         user_name = user_info["real_name"] if user_info else user_id
     elif message.get("bot_id"):
         user_name = "Bot"
@@ -250,9 +314,10 @@ def format_message_for_context(message: Dict[str, Any]) -> str:
     return f"[{user_name}]: {text}"
 
 
-def get_conversation_history_for_context(
+async def get_conversation_history_for_context(
     channel_id: str,
-    limit: int = 10
+    limit: int = 10,
+    known_users: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
 ) -> List[str]:
     """
     Generate conversation history for ChannelContext storage
@@ -260,27 +325,39 @@ def get_conversation_history_for_context(
     Args:
         channel_id: Slack channel ID
         limit: Number of messages to retrieve
+        known_users: Already fetched user info, reused instead of looked up again
 
     Returns:
         List of formatted conversation entries (oldest first)
     """
-    messages = get_recent_messages(channel_id, limit)
+    messages = await get_recent_messages(channel_id, limit)
+    return await _format_history(messages, known_users or {})
 
+
+async def _format_history(
+    messages: List[Dict[str, Any]],
+    known_users: Dict[str, Optional[Dict[str, Any]]]
+) -> List[str]:
+    """Format messages oldest first, looking up only authors not in known_users"""
     # Sort oldest first (messages are returned newest first)
-    messages.reverse()
+    messages = list(reversed(messages))
 
-    formatted_messages = []
-    for msg in messages:
-        formatted = format_message_for_context(msg)
-        formatted_messages.append(formatted)
+    users = dict(known_users)
+    missing = [m["user"] for m in messages if m.get("user") and m["user"] not in users]
+    users.update(await get_users_info(missing))
 
-    return formatted_messages
+    return [format_message_for_context(msg, users) for msg in messages]
 
 
-def get_slack_context_data(channel_id: str, message_limit: int = 10) -> Dict[str, Any]:
+async def get_slack_context_data(channel_id: str, message_limit: int = 10) -> Dict[str, Any]:
     """
     Gather all Slack data to provide to Orchestrator
 
+    Uses the async client, so other channel workers and Socket Mode acks keep
+    running while the Slack API calls are in flight. Member lookups and the
+    conversation history are fetched concurrently, with at most
+    MAX_CONCURRENT_REQUESTS calls in flight, and each user is looked up once.
+
     Args:
         channel_id: Slack channel ID
         message_limit: Number of recent messages to retrieve (default 10)
@@ -311,7 +388,7 @@ def get_slack_context_data(channel_id: str, message_limit: int = 10) -> Dict[str
         }
     """
     # Get channel info
-    channel_info = get_channel_info(channel_id)
+    channel_info = await get_channel_info(channel_id)
     if not channel_info:
         return {
             "channel": {
@@ -326,11 +403,15 @@ def get_slack_context_data(channel_id: str, message_limit: int = 10) -> Dict[str
             "recent_messages": []
         }
 
-    # Get member info (excluding bots)
-    members_info = get_channel_members_info(channel_id)
+    # Get member info (all users, bots filtered below) and the recent messages
+    member_users, messages = await asyncio.gather(
+        get_users_info(channel_info.get("members", [])),
+        get_recent_messages(channel_id, message_limit),
+    )
+    members_info = [u for u in member_users.values() if u and not u["is_bot"]]
 
-    # Get recent conversation history
-    conversation_history = get_conversation_history_for_context(channel_id, message_limit)
+    # Format recent conversation history, reusing the member info
+    conversation_history = await _format_history(messages, member_users)
 
     return {
         "channel": {
@@ -352,5 +433,3 @@ def get_slack_context_data(channel_id: str, message_limit: int = 10) -> Dict[str
         ],
         "recent_messages": conversation_history
     }
-
-
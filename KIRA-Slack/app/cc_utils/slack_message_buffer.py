@@ -0,0 +1,174 @@
+"""
+Slack Message Buffer
+Recent channel messages kept from message events, backfilled from the API when needed
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class _ChannelMessages:
+    __slots__ = ("messages", "synced", "has_more", "lock")
+
+    def __init__(self):
+        # ts -> message
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        # Whether every message newer than the oldest buffered one is present
+        self.synced = False
+        # Whether the channel has history older than the buffer
+        self.has_more = True
+        self.lock = asyncio.Lock()
+
+
+def _in_channel_history(message: Dict[str, Any]) -> bool:
+    """Whether conversations.history would list the message (thread replies are not)"""
+    thread_ts = message.get("thread_ts")
+    return (
+        not thread_ts
+        or thread_ts == message.get("ts")
+        or message.get("subtype") == "thread_broadcast"
+    )
+
+
+class MessageBuffer:
+    """
+    Per-channel ring buffer of recent messages
+
+    Message events append new messages and apply edits (message_changed) and
+    deletes (message_deleted), so recent history is a dict lookup rather than
+    a conversations.history call. A channel is backfilled from the API only
+    when it has not been synced since startup or since the last Socket Mode
+    disconnect (events may have been missed), or when more messages are
+    requested than the buffer holds.
+    """
+
+    def __init__(self, capacity: int = 50, max_channels: int = 1000):
+        self.capacity = capacity
+        self.max_channels = max_channels
+        self._channels: "OrderedDict[str, _ChannelMessages]" = OrderedDict()
+        self.hits = 0
+        self.backfills = 0
+
+    @staticmethod
+    def _default_client():
+        from app.cc_utils.slack_helper import get_async_slack_client
+
+        return get_async_slack_client()
+
+    def _channel(self, channel_id: str) -> _ChannelMessages:
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            buffer = self._channels[channel_id] = _ChannelMessages()
+            while len(self._channels) > self.max_channels:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(channel_id)
+        return buffer
+
+    def _add(self, buffer: _ChannelMessages, message: Dict[str, Any]) -> None:
+        buffer.messages[message["ts"]] = message
+        if len(buffer.messages) > self.capacity:
+            del buffer.messages[min(buffer.messages)]
+            buffer.has_more = True
+
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        """
+        Apply a Slack message event to the buffer
+
+        Args:
+            event: Slack message event (any subtype)
+        """
+        channel_id = event.get("channel")
+        if not channel_id:
+            return
+        subtype = event.get("subtype")
+
+        if subtype == "message_changed":
+            buffer = self._channels.get(channel_id)
+            message = event.get("message", {})
+            if buffer is not None and message.get("ts") in buffer.messages:
+                buffer.messages[message["ts"]] = message
+        elif subtype == "message_deleted":
+            buffer = self._channels.get(channel_id)
+            if buffer is not None:
+                buffer.messages.pop(event.get("deleted_ts"), None)
+        elif event.get("ts") and _in_channel_history(event):
+            self._add(self._channel(channel_id), event)
+
+    def mark_stale(self) -> None:
+        """Require a backfill before the next read of each channel (events were missed)"""
+        for buffer in self._channels.values():
+            buffer.synced = False
+
+    async def recent(
+        self, channel_id: str, limit: int, client=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the most recent messages of a channel
+
+        Args:
+            channel_id: Slack channel ID
+            limit: Number of messages to return
+            client: Slack AsyncWebClient (defaults to the shared client)
+
+        Returns:
+            List of message dicts (newest first, like conversations.history)
+
+        Raises:
+            SlackApiError: If a needed backfill failed
+        """
+        if limit > self.capacity:
+            response = await (client or self._default_client()).conversations_history(
+                channel=channel_id, limit=limit
+            )
+            return response["messages"]
+
+        buffer = self._channel(channel_id)
+        if not self._covers(buffer, limit):
+            async with buffer.lock:
+                # Another caller may have backfilled while we waited
+                if not self._covers(buffer, limit):
+                    await self._backfill(channel_id, buffer, client)
+        else:
+            self.hits += 1
+
+        newest = sorted(buffer.messages, reverse=True)[:limit]
+        return [buffer.messages[ts] for ts in newest]
+
+    def _covers(self, buffer: _ChannelMessages, limit: int) -> bool:
+        return buffer.synced and (len(buffer.messages) >= limit or not buffer.has_more)
+
+    async def _backfill(
+        self, channel_id: str, buffer: _ChannelMessages, client=None
+    ) -> None:
+        self.backfills += 1
+        response = await (client or self._default_client()).conversations_history(
+            channel=channel_id, limit=self.capacity
+        )
+        fetched = response["messages"]
+
+        # Keep buffered messages newer than the fetched page (arrived meanwhile);
+        # anything older may have been edited or deleted while events were missed
+        newest_fetched = max((m["ts"] for m in fetched), default="")
+        kept = [m for ts, m in buffer.messages.items() if ts > newest_fetched]
+        buffer.messages = {}
+        for message in fetched + kept:
+            self._add(buffer, message)
+        buffer.has_more = response.get("has_more", False)
+        buffer.synced = True
+        logging.debug(
+            f"[MESSAGE_BUFFER] Backfilled {len(fetched)} messages for {channel_id}"
+        )
+
+
+_buffer: Optional[MessageBuffer] = None
+
+
+def get_message_buffer() -> MessageBuffer:
+    """Return the process-wide message buffer"""
+    global _buffer
+    if _buffer is None:
+        _buffer = MessageBuffer()
+    return _buffer
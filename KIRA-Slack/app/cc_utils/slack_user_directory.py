@@ -0,0 +1,240 @@
+"""
+Slack User Directory
+Workspace-wide cache of Slack users, keyed by user ID and email with a name index
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.cc_utils.single_flight import single_flight
+from app.cc_utils.slack_client import paginate
+
+
+class UserDirectory:
+    """
+    LRU + TTL cache of Slack user objects (as returned by users.info)
+
+    Lookups by user ID or email hit the Slack API only on a miss or after the
+    entry has expired, and concurrent lookups of the same user share one
+    request. The whole directory can be loaded with a paginated users.list
+    (at startup), and single users are refreshed from user_change/team_join
+    events. Once the loaded directory is older than the TTL, one users.list
+    reload runs in the background while lookups keep serving the stale
+    entries, instead of one users.info call per user.
+    """
+
+    def __init__(self, max_size: int = 20000, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # user_id -> (user object, fetched at)
+        self._users: "OrderedDict[str, tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._by_email: Dict[str, str] = {}
+        # user_id -> lowercase "real_name\ndisplay_name" for name searches
+        self._names: Dict[str, str] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._warmed_at: Optional[float] = None
+        self._warm_lock = asyncio.Lock()
+        self._rewarm_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _default_client():
+        from app.cc_utils.slack_helper import get_async_slack_client
+
+        return get_async_slack_client()
+
+    def update(self, user: Dict[str, Any]) -> None:
+        """Insert or refresh a user object (e.g. from a user_change event)"""
+        user_id = user.get("id")
+        if not user_id:
+            return
+        self.invalidate(user_id)
+        self._users[user_id] = (user, time.monotonic())
+        profile = user.get("profile", {})
+        email = (profile.get("email") or "").lower()
+        if email:
+            self._by_email[email] = user_id
+        self._names[user_id] = (
+            f"{user.get('real_name', '')}\n{profile.get('display_name', '')}".lower()
+        )
+        while len(self._users) > self.max_size:
+            self.invalidate(next(iter(self._users)))
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user from the cache"""
+        entry = self._users.pop(user_id, None)
+        self._names.pop(user_id, None)
+        if entry:
+            email = (entry[0].get("profile", {}).get("email") or "").lower()
+            if self._by_email.get(email) == user_id:
+                del self._by_email[email]
+
+    def _cached(self, user_id: str, client=None) -> Optional[Dict[str, Any]]:
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > self.ttl_seconds:
+            if self._warmed_at is None:
+                return None
+            # A reload refreshes every user at once; serve this one meanwhile
+            self._rewarm_in_background(client)
+        self._users.move_to_end(user_id)
+        return entry[0]
+
+    def _rewarm_in_background(self, client=None) -> None:
+        """Start one background users.list reload if the directory is stale"""
+        if self._is_warm() or (
+            self._rewarm_task is not None and not self._rewarm_task.done()
+        ):
+            return
+        self._rewarm_task = asyncio.create_task(self.warm(client))
+        self._rewarm_task.add_done_callback(self._log_rewarm_error)
+
+    @staticmethod
+    def _log_rewarm_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(
+                f"[USER_DIRECTORY] Background reload failed: {task.exception()}"
+            )
+
+    async def get(self, user_id: str, client=None) -> Optional[Dict[str, Any]]:
+        """
+        Get a user object by ID
+
+        Args:
+            user_id: Slack user ID
+            client: Slack AsyncWebClient (defaults to the shared client)
+
+        Returns:
+            Slack user object, or None if Slack returned no user
+
+        Raises:
+            SlackApiError: If the lookup failed (failures are not cached)
+        """
+        user = self._cached(user_id, client)
+        if user is not None:
+            self.hits += 1
+            return user
+        self.misses += 1
+
+        async def fetch():
+            client_ = client or self._default_client()
+            response = await client_.users_info(user=user_id)
+            user = response.get("user") if response.get("ok") else None
+            if user:
+                self.update(user)
+            return user
+
+        return await single_flight(self._pending, user_id, fetch)
+
+    async def get_by_email(self, email: str, client=None) -> Optional[Dict[str, Any]]:
+        """
+        Get a user object by email
+
+        Args:
+            email: User email (case-insensitive)
+            client: Slack AsyncWebClient (defaults to the shared client)
+
+        Returns:
+            Slack user object, or None if no user has this email
+        """
+        user_id = self._by_email.get(email.lower())
+        if user_id:
+            user = self._cached(user_id, client)
+            if user is not None:
+                self.hits += 1
+                return user
+        self.misses += 1
+
+        response = await (client or self._default_client()).users_lookupByEmail(
+            email=email
+        )
+        user = response.get("user") if response.get("ok") else None
+        if user:
+            self.update(user)
+        return user
+
+    async def find_by_name(self, query: str, client=None) -> List[Dict[str, Any]]:
+        """
+        Find users whose real_name or display_name contains `query`
+
+        Loads the full directory first if it was never loaded; once it is
+        older than the TTL, it is reloaded in the background and this search
+        uses the stale names. Deleted users and bots are skipped.
+
+        Args:
+            query: Name to search for (case-insensitive)
+            client: Slack AsyncWebClient (defaults to the shared client)
+
+        Returns:
+            Matching Slack user objects
+        """
+        if self._warmed_at is None:
+            await self.warm(client)
+        else:
+            self._rewarm_in_background(client)
+
+        query = query.strip().lower()
+        matches = []
+        for user_id, names in self._names.items():
+            if query not in names:
+                continue
+            user = self._users[user_id][0]
+            if user.get("deleted") or user.get("is_bot"):
+                continue
+            matches.append(user)
+        return matches
+
+    def _is_warm(self) -> bool:
+        return (
+            self._warmed_at is not None
+            and time.monotonic() - self._warmed_at <= self.ttl_seconds
+        )
+
+    async def warm(self, client=None, page_size: int = 200) -> int:
+        """
+        Load every workspace user with a paginated users.list
+
+        Args:
+            client: Slack AsyncWebClient (defaults to the shared client)
+            page_size: Users per page
+
+        Returns:
+            Number of users loaded (0 if another caller loaded them meanwhile)
+        """
+        async with self._warm_lock:
+            # Concurrent callers wait for the first load instead of repeating it
+            if self._is_warm():
+                return 0
+            client = client or self._default_client()
+            users = await paginate(client.users_list, "members", page_size=page_size)
+            for user in users:
+                self.update(user)
+            self._warmed_at = time.monotonic()
+            logging.info(f"[USER_DIRECTORY] Loaded {len(users)} users")
+            return len(users)
+
+    async def close(self) -> None:
+        """Cancel a background reload still in flight (on shutdown)"""
+        task = self._rewarm_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+_directory: Optional[UserDirectory] = None
+
+
+def get_user_directory() -> UserDirectory:
+    """Return the process-wide user directory"""
+    global _directory
+    if _directory is None:
+        _directory = UserDirectory()
+    return _directory
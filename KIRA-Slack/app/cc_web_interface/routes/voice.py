@@ -5,8 +5,8 @@ Voice input WebSocket and related routes
 
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from slack_sdk.web.async_client import AsyncWebClient
 
+from app.cc_utils.slack_client import get_shared_async_client
 from app.queueing_extended import enqueue_message
 from app.cc_web_interface.utils import get_slack_user_id
 from app.config.settings import get_settings
@@ -21,7 +21,7 @@ async def websocket_voice(websocket: WebSocket):
     await websocket.accept()
 
     settings = get_settings()
-    slack_client = AsyncWebClient(token=settings.SLACK_BOT_TOKEN)
+    slack_client = get_shared_async_client(settings.SLACK_BOT_TOKEN)
 
     try:
         while True:
@@ -8,6 +8,8 @@ from typing import Optional
 
 from fastapi import Request
 
+from app.cc_utils.slack_user_directory import get_user_directory
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,12 +48,11 @@ async def get_slack_user_id(email: str, slack_client) -> Optional[str]:
         Slack User ID or None
     """
     try:
-        response = await slack_client.users_lookupByEmail(email=email)
-        if response.get('ok'):
-            user = response.get('user', {})
+        user = await get_user_directory().get_by_email(email, slack_client)
+        if user:
             return user.get('id')
         else:
-            logger.error(f"Failed to find Slack user by email {email}: {response.get('error')}")
+            logger.error(f"Failed to find Slack user by email {email}")
             return None
     except Exception as e:
         logger.error(f"Error looking up Slack user: {e}")
@@ -124,11 +124,21 @@ async def main():
         )
         sys.exit(1)
 
-    # 3. Initialize Slack AsyncApp
+    # 3. Initialize Slack AsyncApp (on the shared pooled, rate limited client)
+    from app.cc_utils.slack_client import get_shared_async_client
+
     app = AsyncApp(
-        token=settings.SLACK_BOT_TOKEN, signing_secret=settings.SLACK_SIGNING_SECRET
+        client=get_shared_async_client(settings.SLACK_BOT_TOKEN),
+        signing_secret=settings.SLACK_SIGNING_SECRET,
     )
 
+    # Bolt builds a new client per event; hand listeners the shared one instead
+    async def use_shared_client(context, next):
+        context["client"] = app.client
+        await next()
+
+    app.use(use_shared_client)
+
     # 4. Get bot user ID
     try:
         auth_test = await app.client.auth_test()
@@ -143,6 +153,17 @@ async def main():
         logging.error(f"Error checking auth: {e}")
         sys.exit(1)
 
+    # 5. Load the Slack user directory in the background
+    from app.cc_utils.slack_user_directory import get_user_directory
+
+    async def warm_user_directory():
+        try:
+            await get_user_directory().warm(app.client)
+        except Exception as e:
+            logging.warning(f"[USER_DIRECTORY] Initial load failed: {e}")
+
+    user_directory_task = asyncio.create_task(warm_user_directory())
+
     # 6. Register handlers
     register_handlers(app)
 
@@ -277,6 +298,17 @@ async def main():
             f"[SCHEDULER] Dynamic suggester registered (interval: {settings.DYNAMIC_SUGGESTER_INTERVAL} minutes)"
         )
 
+    # 8-5. Log Slack API call counters of the shared clients
+    from app.cc_utils.slack_client import log_shared_client_metrics
+
+    scheduler.add_job(
+        log_shared_client_metrics,
+        trigger="interval",
+        minutes=10,
+        id="slack_api_metrics",
+        name="Slack API Metrics",
+    )
+
     scheduler.start()
 
     # 9. Start FastAPI Web Server (voice interface)
@@ -381,6 +413,14 @@ async def main():
     logging.info("Starting Socket Mode handler...")
     handler = AsyncSocketModeHandler(app, settings.SLACK_APP_TOKEN)
 
+    # Events may be missed while disconnected: resync buffered history on next read
+    from app.cc_utils.slack_message_buffer import get_message_buffer
+
+    async def on_socket_close(message):
+        get_message_buffer().mark_stale()
+
+    handler.client.on_close_listeners.append(on_socket_close)
+
     try:
         await handler.start_async()
     except KeyboardInterrupt:
@@ -404,6 +444,21 @@ async def main():
         logging.info("[SHUTDOWN] Stopping Slack handler...")
         await handler.close_async()
 
+        # 4. Stop the user directory load if it is still running
+        if not user_directory_task.done():
+            user_directory_task.cancel()
+            try:
+                await user_directory_task
+            except asyncio.CancelledError:
+                pass
+        await get_user_directory().close()
+
+        # 5. Close pooled Slack connections
+        from app.cc_utils.slack_client import close_shared_clients
+
+        log_shared_client_metrics()
+        await close_shared_clients()
+
         logging.info("[SHUTDOWN] ✅ Shutdown complete")
 
 
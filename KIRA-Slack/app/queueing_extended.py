@@ -179,6 +179,7 @@ def start_orchestrator_worker(app, orchestrator_func, num_workers=2):
 
     async def orchestrator_worker(worker_id: int):
         global _active_orchestrator_workers
+        # app.client is the shared pooled client (see get_shared_async_client)
         client = app.client
         logging.info(f"[ORCHESTRATOR_WORKER-{worker_id}] Started")
 
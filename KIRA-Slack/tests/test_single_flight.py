@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.cc_utils.single_flight import single_flight
+
+
+def test_concurrent_callers_share_one_fetch():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        pending = {}
+        results = await asyncio.gather(
+            *(single_flight(pending, "key", fetch) for _ in range(5))
+        )
+        return results, pending
+
+    results, pending = asyncio.run(main())
+    assert results == ["result"] * 5
+    assert calls == [1]
+    assert pending == {}
+
+
+def test_failure_reaches_every_caller_and_is_not_remembered():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        pending = {}
+        results = await asyncio.gather(
+            single_flight(pending, "key", fetch),
+            single_flight(pending, "key", fetch),
+            return_exceptions=True,
+        )
+        assert pending == {}
+        with pytest.raises(RuntimeError):
+            await single_flight(pending, "key", fetch)
+        return results
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert len(calls) == 2
+
+
+def test_cancelled_joiner_does_not_cancel_the_fetch():
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def main():
+        pending = {}
+        owner = asyncio.create_task(single_flight(pending, "key", fetch))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(single_flight(pending, "key", fetch))
+        await asyncio.sleep(0)
+        joiner.cancel()
+        return await owner, joiner.cancelled()
+
+    assert asyncio.run(main()) == ("result", True)
@@ -0,0 +1,98 @@
+import asyncio
+
+from app.cc_utils.slack_channel_directory import ChannelDirectory
+
+
+class FakeClient:
+    def __init__(self, is_member=False):
+        self.calls = []
+        self.is_member = is_member
+
+    async def conversations_info(self, channel):
+        self.calls.append(("conversations.info", channel))
+        await asyncio.sleep(0.01)
+        return {
+            "ok": True,
+            "channel": {
+                "id": channel,
+                "name": "general",
+                "is_member": self.is_member,
+                "num_members": 2,
+            },
+        }
+
+    async def conversations_members(self, channel, limit, cursor=None):
+        self.calls.append(("conversations.members", cursor))
+        if not cursor:
+            return {"members": ["U1"], "response_metadata": {"next_cursor": "page2"}}
+        return {"members": ["U2"], "response_metadata": {"next_cursor": ""}}
+
+
+def test_concurrent_lookups_share_one_request():
+    async def main():
+        directory, client = ChannelDirectory(), FakeClient()
+        results = await asyncio.gather(
+            *[directory.is_member("C1", client) for _ in range(10)]
+        )
+        assert results == [False] * 10
+        assert client.calls == [("conversations.info", "C1")]
+
+    asyncio.run(main())
+
+
+def test_membership_events_update_cached_entry():
+    async def main():
+        directory, client = ChannelDirectory(), FakeClient()
+        assert await directory.get_members("C1", client) == {"U1", "U2"}
+
+        directory.member_joined("C1", "UBOT", is_bot=True)
+        assert await directory.is_member("C1", client)
+        assert await directory.get_members("C1", client) == {"U1", "U2", "UBOT"}
+        assert (await directory.get("C1", client))["num_members"] == 3
+
+        directory.member_left("C1", "UBOT", is_bot=True)
+        directory.member_left("C1", "UBOT", is_bot=True)
+        assert not await directory.is_member("C1", client)
+        assert (await directory.get("C1", client))["num_members"] == 2
+        assert len(client.calls) == 3
+
+    asyncio.run(main())
+
+
+def test_bot_leaving_is_applied_even_if_not_in_member_list():
+    async def main():
+        directory, client = ChannelDirectory(), FakeClient(is_member=True)
+        await directory.get_members("C1", client)
+        directory.member_left("C1", "UBOT", is_bot=True)
+        assert not await directory.is_member("C1", client)
+
+    asyncio.run(main())
+
+
+def test_members_expire_with_channel_info():
+    async def main():
+        directory, client = ChannelDirectory(ttl_seconds=0.05), FakeClient()
+        await directory.get_members("C1", client)
+        await directory.get_members("C1", client)
+        assert len(client.calls) == 3
+
+        await asyncio.sleep(0.06)
+        await directory.get_members("C1", client)
+        assert client.calls[3:] == [
+            ("conversations.info", "C1"),
+            ("conversations.members", None),
+            ("conversations.members", "page2"),
+        ]
+
+    asyncio.run(main())
+
+
+def test_invalidate_refetches():
+    async def main():
+        directory, client = ChannelDirectory(), FakeClient()
+        await directory.get("C1", client)
+        directory.invalidate("C1")
+        await directory.get("C1", client)
+        assert len(client.calls) == 2
+
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+import asyncio
+
+from app.cc_utils.slack_message_buffer import MessageBuffer
+
+
+def ts(i):
+    return f"17000000{i:02d}.000100"
+
+
+class FakeClient:
+    def __init__(self, count=5, has_more=False):
+        self.calls = 0
+        self.count = count
+        self.has_more = has_more
+
+    async def conversations_history(self, channel, limit):
+        self.calls += 1
+        messages = [{"ts": ts(i), "text": f"m{i}"} for i in range(self.count, 0, -1)][
+            :limit
+        ]
+        return {"messages": messages, "has_more": self.has_more}
+
+
+def texts(messages):
+    return [message["text"] for message in messages]
+
+
+def test_first_read_backfills_then_serves_from_buffer():
+    async def main():
+        buffer, client = MessageBuffer(capacity=10), FakeClient()
+        assert texts(await buffer.recent("C", 3, client)) == ["m5", "m4", "m3"]
+        buffer.apply_event({"channel": "C", "ts": ts(6), "text": "m6"})
+        assert texts(await buffer.recent("C", 3, client)) == ["m6", "m5", "m4"]
+        assert client.calls == 1
+
+    asyncio.run(main())
+
+
+def test_events_newer_than_backfill_are_kept():
+    async def main():
+        buffer, client = MessageBuffer(capacity=10), FakeClient()
+        buffer.apply_event({"channel": "C", "ts": ts(9), "text": "live"})
+        assert texts(await buffer.recent("C", 2, client)) == ["live", "m5"]
+
+    asyncio.run(main())
+
+
+def test_edits_deletes_and_thread_replies():
+    async def main():
+        buffer, client = MessageBuffer(capacity=10), FakeClient()
+        await buffer.recent("C", 3, client)
+        buffer.apply_event(
+            {"channel": "C", "ts": ts(7), "thread_ts": ts(5), "text": "reply"}
+        )
+        buffer.apply_event(
+            {
+                "channel": "C",
+                "subtype": "message_changed",
+                "message": {"ts": ts(5), "text": "edited"},
+            }
+        )
+        buffer.apply_event(
+            {"channel": "C", "subtype": "message_deleted", "deleted_ts": ts(4)}
+        )
+        assert texts(await buffer.recent("C", 3, client)) == ["edited", "m3", "m2"]
+        assert client.calls == 1
+
+    asyncio.run(main())
+
+
+def test_mark_stale_forces_backfill():
+    async def main():
+        buffer, client = MessageBuffer(capacity=10), FakeClient()
+        await buffer.recent("C", 3, client)
+        buffer.mark_stale()
+        await buffer.recent("C", 3, client)
+        assert client.calls == 2
+
+    asyncio.run(main())
+
+
+def test_capacity_limits_buffer():
+    async def main():
+        buffer, client = MessageBuffer(capacity=3), FakeClient(has_more=True)
+        await buffer.recent("C", 3, client)
+        for i in (6, 7):
+            buffer.apply_event({"channel": "C", "ts": ts(i), "text": f"m{i}"})
+        assert texts(await buffer.recent("C", 3, client)) == ["m7", "m6", "m5"]
+        assert client.calls == 1
+        # More than the buffer holds goes to the API
+        await buffer.recent("C", 5, client)
+        assert client.calls == 2
+
+    asyncio.run(main())
+
+
+def test_concurrent_reads_backfill_once():
+    async def main():
+        buffer, client = MessageBuffer(capacity=10), FakeClient()
+        await asyncio.gather(*[buffer.recent("C", 3, client) for _ in range(5)])
+        assert client.calls == 1
+
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+import asyncio
+
+from app.cc_utils.slack_user_directory import UserDirectory
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    async def users_info(self, user):
+        self.calls.append(("users.info", user))
+        await asyncio.sleep(0.01)
+        return {
+            "ok": True,
+            "user": {
+                "id": user,
+                "real_name": f"Real {user}",
+                "profile": {"email": f"{user.lower()}@example.com"},
+            },
+        }
+
+    async def users_list(self, limit, cursor=None):
+        self.calls.append(("users.list", cursor))
+        if not cursor:
+            return {
+                "members": [
+                    {"id": "U1", "real_name": "Alice Kim", "profile": {}},
+                    {"id": "B1", "real_name": "Alice Bot", "is_bot": True},
+                ],
+                "response_metadata": {"next_cursor": "page2"},
+            }
+        return {
+            "members": [
+                {"id": "U2", "real_name": "Bob", "profile": {"display_name": "alice2"}},
+                {"id": "U3", "real_name": "Alice Gone", "deleted": True},
+            ],
+            "response_metadata": {"next_cursor": ""},
+        }
+
+    async def users_lookupByEmail(self, email):
+        self.calls.append(("users.lookupByEmail", email))
+        return {"ok": False}
+
+
+def test_concurrent_lookups_share_one_request():
+    async def main():
+        directory, client = UserDirectory(), FakeClient()
+        users = await asyncio.gather(*[directory.get("U9", client) for _ in range(5)])
+        assert [user["id"] for user in users] == ["U9"] * 5
+        assert client.calls == [("users.info", "U9")]
+
+        assert (await directory.get("U9", client))["id"] == "U9"
+        assert len(client.calls) == 1
+
+    asyncio.run(main())
+
+
+def test_lookup_by_email_uses_cached_users():
+    async def main():
+        directory, client = UserDirectory(), FakeClient()
+        await directory.get("U9", client)
+        user = await directory.get_by_email("U9@Example.com", client)
+        assert user["id"] == "U9"
+        assert await directory.get_by_email("nobody@example.com", client) is None
+        assert client.calls[-1] == ("users.lookupByEmail", "nobody@example.com")
+
+    asyncio.run(main())
+
+
+def test_find_by_name_loads_directory_once():
+    async def main():
+        directory, client = UserDirectory(), FakeClient()
+        matches = await directory.find_by_name(" ALICE ", client)
+        assert [user["id"] for user in matches] == ["U1", "U2"]
+        await directory.find_by_name("bob", client)
+        assert client.calls == [("users.list", None), ("users.list", "page2")]
+
+    asyncio.run(main())
+
+
+def test_concurrent_warms_load_once():
+    async def main():
+        directory, client = UserDirectory(), FakeClient()
+        loaded = await asyncio.gather(directory.warm(client), directory.warm(client))
+        assert sorted(loaded) == [0, 4]
+        assert len(client.calls) == 2
+
+    asyncio.run(main())
+
+
+def test_stale_directory_reloads_in_background():
+    async def main():
+        directory, client = UserDirectory(ttl_seconds=0.05), FakeClient()
+        await directory.warm(client)
+        await asyncio.sleep(0.06)
+
+        # Stale entries are served while a single reload runs
+        users = await asyncio.gather(*[directory.get(u, client) for u in ("U1", "U2")])
+        assert [user["id"] for user in users] == ["U1", "U2"]
+        await directory._rewarm_task
+        assert all(call[0] == "users.list" for call in client.calls)
+        assert len(client.calls) == 4
+
+    asyncio.run(main())
+
+
+def test_close_cancels_background_reload():
+    async def main():
+        directory, client = UserDirectory(ttl_seconds=0.05), FakeClient()
+        await directory.warm(client)
+        await asyncio.sleep(0.06)
+
+        assert (await directory.get("U1", client))["id"] == "U1"
+        task = directory._rewarm_task
+        await directory.close()
+        assert task.cancelled()
+        # Nothing left running once closed
+        await directory.close()
+
+    asyncio.run(main())
+
+
+def test_least_recently_used_users_are_evicted():
+    async def main():
+        directory, client = UserDirectory(max_size=2), FakeClient()
+        for user_id in ("U1", "U2", "U1", "U3"):
+            await directory.get(user_id, client)
+        await directory.get("U2", client)
+        assert client.calls.count(("users.info", "U2")) == 2
+        assert client.calls.count(("users.info", "U1")) == 1
+
+    asyncio.run(main())
+
+
+def test_update_and_invalidate_keep_email_index():
+    directory = UserDirectory()
+    directory.update({"id": "U1", "profile": {"email": "old@example.com"}})
+    directory.update({"id": "U1", "profile": {"email": "new@example.com"}})
+    assert directory._by_email == {"new@example.com": "U1"}
+    directory.invalidate("U1")
+    assert directory._by_email == {}
@@ -1,62 +1,216 @@
 import copy
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
 
 from litellm import Message
 
+# Anthropic accepts at most 4 cache_control blocks per request
+MAX_CACHE_BREAKPOINTS = 4
+# Prefixes shorter than this are never cached by Anthropic
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def is_anthropic_model(model_name: str) -> bool:
+    """Return True if prompt caching should be applied for this model."""
+    return "anthropic" in model_name.lower() or "claude" in model_name.lower()
+
+
+def _get_field(msg: Dict[str, Any] | Message, name: str) -> Any:
+    if isinstance(msg, dict):
+        return msg.get(name)
+    return getattr(msg, name, None)
+
+
+def estimate_message_tokens(msg: Dict[str, Any] | Message) -> int:
+    """Cheap token estimate (~4 characters per token) for breakpoint planning."""
+    content = _get_field(msg, "content")
+    if isinstance(content, str):
+        chars = len(content)
+    elif isinstance(content, list):
+        chars = sum(
+            len(item.get("text") or "") if isinstance(item, dict) else 0
+            for item in content
+        )
+    else:
+        chars = 0
+    return chars // 4 + 4
+
+
+@dataclass
+class CachePlan:
+    """Breakpoint placement for one request."""
+
+    indices: list[int]
+    total_tokens: int
+    expected_cached_tokens: int = 0
+    prefix_tokens: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def expected_hit_rate(self) -> float:
+        if self.total_tokens <= 0:
+            return 0.0
+        return self.expected_cached_tokens / self.total_tokens
+
+
+class CacheBreakpointPlanner:
+    """Decide which messages get a cache_control breakpoint.
+
+    The most recent `tail_breakpoints` messages are always marked. With
+    `pin_system`, the system prompt at index 0 is marked too, so the large
+    fixed prefix stays cached independently of the tail. Any remaining budget
+    is spent on rolling breakpoints, walking back from the tail and placing
+    one whenever at least `min_token_distance` tokens separate it from the
+    previous breakpoint.
+
+    The planner remembers the breakpoints of the previous request to estimate
+    how many prompt tokens the next request should read from cache.
+    """
+
+    def __init__(
+        self,
+        tail_breakpoints: int = 3,
+        pin_system: bool = False,
+        min_token_distance: int = MIN_CACHEABLE_TOKENS,
+        max_breakpoints: int = MAX_CACHE_BREAKPOINTS,
+        token_counter: Callable[[Dict[str, Any] | Message], int] | None = None,
+    ):
+        if tail_breakpoints > max_breakpoints:
+            raise ValueError(
+                f"tail_breakpoints ({tail_breakpoints}) exceeds "
+                f"max_breakpoints ({max_breakpoints})"
+            )
+        self.tail_breakpoints = tail_breakpoints
+        self.pin_system = pin_system
+        self.min_token_distance = min_token_distance
+        self.max_breakpoints = max_breakpoints
+        self._count_tokens = token_counter or estimate_message_tokens
+        self._previous_prefixes: dict[int, int] = {}
+
+    def plan(self, messages: List[Dict[str, Any] | Message]) -> CachePlan:
+        n = len(messages)
+        counts = [self._count_tokens(msg) for msg in messages]
+        prefix: list[int] = []
+        running = 0
+        for count in counts:
+            running += count
+            prefix.append(running)
+
+        chosen = set(range(max(0, n - self.tail_breakpoints), n))
+        if (
+            self.pin_system
+            and n > 0
+            and _get_field(messages[0], "role") == "system"
+            and len(chosen) < self.max_breakpoints
+        ):
+            chosen.add(0)
+
+        # Rolling breakpoints between the pinned prefix and the tail
+        anchor = min(max(0, n - self.tail_breakpoints), n - 1)
+        for i in range(anchor - 1, -1, -1):
+            if len(chosen) >= self.max_breakpoints:
+                break
+            if i in chosen:
+                continue
+            if prefix[anchor] - prefix[i] >= self.min_token_distance:
+                chosen.add(i)
+                anchor = i
+        indices = sorted(chosen)
+
+        # A previous breakpoint is still a cache hit if its prefix is unchanged
+        expected = 0
+        for i, tokens in self._previous_prefixes.items():
+            if i < n and prefix[i] == tokens and tokens >= MIN_CACHEABLE_TOKENS:
+                expected = max(expected, tokens)
+
+        prefix_tokens = {i: prefix[i] for i in indices}
+        self._previous_prefixes = prefix_tokens
+        return CachePlan(
+            indices=indices,
+            total_tokens=prefix[-1] if prefix else 0,
+            expected_cached_tokens=expected,
+            prefix_tokens=prefix_tokens,
+        )
+
+
+def _with_cache_control(content: Any) -> Any:
+    """Return a copy of message content with ephemeral cache_control added.
+
+    Only the content list and the content items that get a cache_control key
+    are copied; everything else is shared with the original message.
+    """
+    if isinstance(content, str):
+        return [
+            {
+                "type": "text",
+                "text": content,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+    if isinstance(content, list):
+        return [
+            {**item, "cache_control": {"type": "ephemeral"}}
+            if isinstance(item, dict) and "type" in item
+            else item
+            for item in content
+        ]
+    return content
+
+
+def apply_cache_breakpoints(
+    messages: List[Dict[str, Any] | Message], indices: List[int]
+) -> List[Dict[str, Any] | Message]:
+    """Return a shallow copy of messages with cache_control on the given indices.
+
+    Only the messages at `indices` are cloned; the input is never modified.
+    """
+    cached_messages = list(messages)
+
+    for n in indices:
+        msg = cached_messages[n]
+
+        # Handle both dict and Message-like objects
+        if isinstance(msg, dict):
+            # Ensure content is in the expected format
+            if isinstance(msg.get("content"), (str, list)):
+                msg = dict(msg)
+                msg["content"] = _with_cache_control(msg["content"])
+        elif hasattr(msg, "content"):
+            if isinstance(msg.content, (str, list)):
+                msg = copy.copy(msg)
+                msg.content = _with_cache_control(msg.content)  # type: ignore
+
+        cached_messages[n] = msg
+
+    return cached_messages
+
 
 def add_anthropic_caching(
-    messages: List[Dict[str, Any] | Message], model_name: str
+    messages: List[Dict[str, Any] | Message],
+    model_name: str,
+    planner: CacheBreakpointPlanner | None = None,
 ) -> List[Dict[str, Any] | Message]:
     """
     Add ephemeral caching to the most recent messages for Anthropic models.
 
+    The input messages are never modified. The list is copied shallowly and
+    only the messages that receive cache_control are cloned, so the cost
+    does not grow with the length of the conversation.
+
     Args:
         messages: List of message dictionaries
         model_name: The model name to check if it's an Anthropic model
+        planner: Optional breakpoint planner; defaults to the last 3 messages
 
     Returns:
-        List of messages with caching added to the most recent 3 messages
+        List of messages with caching added to the planned breakpoints
     """
     # Only apply caching for Anthropic models
-    if not ("anthropic" in model_name.lower() or "claude" in model_name.lower()):
+    if not is_anthropic_model(model_name):
         return messages
 
-    # Create a deep copy to avoid modifying the original messages
-    cached_messages = copy.deepcopy(messages)
-
-    # Add cache_control to the most recent 3 messages
-    for n in range(len(cached_messages)):
-        if n >= len(cached_messages) - 3:
-            msg = cached_messages[n]
-
-            # Handle both dict and Message-like objects
-            if isinstance(msg, dict):
-                # Ensure content is in the expected format
-                if isinstance(msg.get("content"), str):
-                    msg["content"] = [
-                        {
-                            "type": "text",
-                            "text": msg["content"],
-                            "cache_control": {"type": "ephemeral"},
-                        }
-                    ]
-                elif isinstance(msg.get("content"), list):
-                    # Add cache_control to each content item
-                    for content_item in msg["content"]:
-                        if isinstance(content_item, dict) and "type" in content_item:
-                            content_item["cache_control"] = {"type": "ephemeral"}
-            elif hasattr(msg, "content"):
-                if isinstance(msg.content, str):
-                    msg.content = [  # type: ignore
-                        {
-                            "type": "text",
-                            "text": msg.content,
-                            "cache_control": {"type": "ephemeral"},
-                        }
-                    ]  # type: ignore
-                elif isinstance(msg.content, list):
-                    for content_item in msg.content:  # type: ignore
-                        if isinstance(content_item, dict) and "type" in content_item:
-                            content_item["cache_control"] = {"type": "ephemeral"}
+    if planner is None:
+        indices = list(range(max(0, len(messages) - 3), len(messages)))
+    else:
+        indices = planner.plan(messages).indices
 
-    return cached_messages
+    return apply_cache_breakpoints(messages, indices)
@@ -0,0 +1,114 @@
+"""Benchmark for add_anthropic_caching.
+
+Compares the previous deepcopy-based implementation with the copy-on-write
+one on synthetic histories of 500 messages with 30 KB tool outputs, and
+checks that both produce the same request and leave the input untouched.
+
+Usage:
+    uv run python benchmarks/bench_anthropic_caching.py
+"""
+
+import copy
+import timeit
+
+from litellm import Message
+
+from anthropic_caching import add_anthropic_caching
+
+MODEL = "anthropic/claude-opus-4-6"
+N_MESSAGES = 500
+OBSERVATION_BYTES = 30_000
+REPEAT = 5
+
+
+def legacy_add_anthropic_caching(messages, model_name):
+    if not ("anthropic" in model_name.lower() or "claude" in model_name.lower()):
+        return messages
+    cached_messages = copy.deepcopy(messages)
+    for n in range(len(cached_messages)):
+        if n >= len(cached_messages) - 3:
+            msg = cached_messages[n]
+            if isinstance(msg, dict):
+                if isinstance(msg.get("content"), str):
+                    msg["content"] = [
+                        {
+                            "type": "text",
+                            "text": msg["content"],
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ]
+                elif isinstance(msg.get("content"), list):
+                    for content_item in msg["content"]:
+                        if isinstance(content_item, dict) and "type" in content_item:
+                            content_item["cache_control"] = {"type": "ephemeral"}
+            elif hasattr(msg, "content"):
+                if isinstance(msg.content, str):
+                    msg.content = [
+                        {
+                            "type": "text",
+                            "text": msg.content,
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ]
+                elif isinstance(msg.content, list):
+                    for content_item in msg.content:
+                        if isinstance(content_item, dict) and "type" in content_item:
+                            content_item["cache_control"] = {"type": "ephemeral"}
+    return cached_messages
+
+
+def make_history(use_message_objects: bool) -> list:
+    observation = ("x" * 99 + "\n") * (OBSERVATION_BYTES // 100)
+    history: list = [{"role": "system", "content": "You are an agent. " * 500}]
+    for i in range(N_MESSAGES - 1):
+        if i % 2 == 0:
+            history.append({"role": "user", "content": observation})
+        elif use_message_objects:
+            history.append(Message(role="assistant", content=f'{{"analysis": "{i}"}}'))
+        else:
+            history.append(
+                {
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": f'{{"analysis": "{i}"}}'}],
+                }
+            )
+    return history
+
+
+def _dump(messages: list) -> list:
+    return [m if isinstance(m, dict) else m.model_dump() for m in messages]
+
+
+def main() -> None:
+    print(f"{'input':>10} {'deepcopy (ms)':>14} {'cow (ms)':>10} {'speedup':>8}")
+    for label, use_objects in (("dict", False), ("Message", True)):
+        history = make_history(use_objects)
+        snapshot = _dump(copy.deepcopy(history))
+
+        expected = legacy_add_anthropic_caching(history, MODEL)
+        actual = add_anthropic_caching(history, MODEL)
+        assert _dump(actual) == _dump(expected)
+        assert _dump(history) == snapshot, "input history was modified"
+
+        legacy = min(
+            timeit.repeat(
+                lambda: legacy_add_anthropic_caching(history, MODEL),
+                number=1,
+                repeat=REPEAT,
+            )
+        )
+        cow = min(
+            timeit.repeat(
+                lambda: add_anthropic_caching(history, MODEL),
+                number=100,
+                repeat=REPEAT,
+            )
+        ) / 100
+        print(
+            f"{label:>10} {legacy * 1000:>14.2f} {cow * 1000:>10.4f} "
+            f"{legacy / cow:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
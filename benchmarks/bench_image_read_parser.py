@@ -0,0 +1,143 @@
+"""Micro-benchmark for ImageReadJSONParser.
+
+Compares the previous field-order check (one regex search over the raw
+response per field) with reading the order from the decoded object, over a
+corpus of model-style responses: long command batches, image reads, wrong
+field order, extra text around the JSON, and malformed JSON.
+
+Usage:
+    uv run python benchmarks/bench_image_read_parser.py
+"""
+
+import json
+import random
+import re
+import timeit
+
+from terminus_kira.image_read_json_parser import ImageReadJSONParser
+
+REPEAT = 5
+NUMBER = 20
+
+
+class LegacyImageReadJSONParser(ImageReadJSONParser):
+    def _validate_json_structure(self, data, json_content, warnings):
+        self._response = json_content
+        return super()._validate_json_structure(data, json_content, warnings)
+
+    def _check_field_order(self, data, warnings):
+        response = self._response
+        if "commands" in data:
+            expected_order = ["analysis", "plan", "commands"]
+        elif "image_read" in data:
+            expected_order = ["analysis", "plan", "image_read"]
+        else:
+            expected_order = ["analysis", "plan"]
+
+        positions = {}
+        for field_name in expected_order:
+            match = re.search(f'"({field_name})"\\s*:', response)
+            if match:
+                positions[field_name] = match.start()
+        if len(positions) < 2:
+            return
+
+        present = [(f, positions[f]) for f in expected_order if f in positions]
+        actual_order = [f for f, _ in sorted(present, key=lambda x: x[1])]
+        expected_present = [f for f in expected_order if f in positions]
+        if actual_order != expected_present:
+            warnings.append(
+                f"Fields appear in wrong order. Found: {' → '.join(actual_order)}, "
+                f"expected: {' → '.join(expected_present)}"
+            )
+
+
+def make_corpus() -> list[str]:
+    rng = random.Random(0)
+    analysis = (
+        "The build failed because the linker could not find libssl. "
+        "Installing the dev package and re-running configure should fix it. "
+    ) * 4
+    corpus = []
+    for i in range(200):
+        commands = [
+            {
+                "keystrokes": f"gcc -O2 -c src/module_{j}.c -o build/module_{j}.o\n",
+                "duration": rng.choice([0.1, 1.0, 5.0]),
+            }
+            for j in range(rng.randint(1, 12))
+        ]
+        kind = i % 8
+        if kind == 0:
+            data = {
+                "analysis": analysis,
+                "plan": "Look at the chart.",
+                "image_read": {
+                    "file_path": "/app/plot.png",
+                    "image_read_instruction": "Describe the axes and trend.",
+                },
+            }
+        elif kind == 1:
+            data = {
+                "analysis": analysis,
+                "plan": "Compare the screenshots.",
+                "image_read": [
+                    {
+                        "file_path": f"/app/shot_{k}.png",
+                        "image_read_instruction": "What is on screen?",
+                    }
+                    for k in range(3)
+                ],
+            }
+        elif kind == 2:
+            # Wrong field order
+            data = {"plan": "Build.", "analysis": analysis, "commands": commands}
+        elif kind == 3:
+            data = {"analysis": analysis, "plan": "Done.", "task_complete": True}
+        else:
+            data = {"analysis": analysis, "plan": "Build.", "commands": commands}
+
+        response = json.dumps(data, indent=2)
+        if kind == 5:
+            response = "Here is my response:\n" + response + "\nLet me know."
+        elif kind == 6:
+            # Truncated mid-object
+            response = response[: len(response) * 2 // 3]
+        elif kind == 7 and i % 16 == 7:
+            # Missing required field
+            response = json.dumps({"plan": "Build.", "commands": commands})
+        corpus.append(response)
+    return corpus
+
+
+def parse_all(parser: ImageReadJSONParser, corpus: list[str]) -> list:
+    return [parser.parse_response(response) for response in corpus]
+
+
+def main() -> None:
+    corpus = make_corpus()
+    legacy = LegacyImageReadJSONParser()
+    single_pass = ImageReadJSONParser()
+    for old, new in zip(parse_all(legacy, corpus), parse_all(single_pass, corpus)):
+        assert (old.error, old.warning, old.commands) == (
+            new.error,
+            new.warning,
+            new.commands,
+        )
+
+    results = {}
+    for name, parser in (("legacy", legacy), ("single-pass", single_pass)):
+        best = min(
+            timeit.repeat(
+                lambda: parse_all(parser, corpus), number=NUMBER, repeat=REPEAT
+            )
+        )
+        results[name] = best / NUMBER / len(corpus)
+    print(f"{len(corpus)} responses, {sum(map(len, corpus)) // 1024} KB")
+    for name, per_call in results.items():
+        print(f"{name:>12}: {per_call * 1e6:8.1f} us/response")
+    print(f"{'speedup':>12}: {results['legacy'] / results['single-pass']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Micro-benchmark for completion-marker stripping.
+
+Compares the old filter (a set of every marker issued so far, checked against
+each line) with `strip_marker_lines` on a ~30 KB terminal output, as the
+number of markers issued during the episode grows.
+
+Usage:
+    uv run python benchmarks/bench_strip_markers.py
+"""
+
+import random
+import timeit
+
+from terminus_kira.terminus_kira import _MARKER_PREFIX, strip_marker_lines
+
+OUTPUT_BYTES = 30_000
+MARKER_COUNTS = [10, 100, 1_000, 5_000]
+REPEAT = 5
+
+
+def legacy_strip(output: str, marker_seq: int) -> str:
+    markers = {f"{_MARKER_PREFIX}{seq}__" for seq in range(1, marker_seq + 1)}
+    lines = output.split("\n")
+    lines = [l for l in lines if not any(m in l for m in markers)]
+    return "\n".join(lines)
+
+
+def make_output(marker_seq: int) -> str:
+    rng = random.Random(0)
+    lines = []
+    size = 0
+    while size < OUTPUT_BYTES:
+        if rng.random() < 0.05:
+            seq = rng.randint(max(1, marker_seq - 20), marker_seq)
+            line = f"{_MARKER_PREFIX}{seq}__"
+        else:
+            line = "gcc -O2 -c src/module_%d.c -o build/module_%d.o" % (
+                rng.randint(0, 999),
+                rng.randint(0, 999),
+            )
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def main() -> None:
+    print(f"{'markers':>8} {'legacy (ms)':>12} {'compiled (ms)':>14} {'speedup':>8}")
+    for marker_seq in MARKER_COUNTS:
+        output = make_output(marker_seq)
+        assert legacy_strip(output, marker_seq) == strip_marker_lines(output)
+
+        legacy = min(
+            timeit.repeat(
+                lambda: legacy_strip(output, marker_seq), number=1, repeat=REPEAT
+            )
+        )
+        compiled = min(
+            timeit.repeat(
+                lambda: strip_marker_lines(output), number=10, repeat=REPEAT
+            )
+        ) / 10
+        print(
+            f"{marker_seq:>8} {legacy * 1000:>12.2f} {compiled * 1000:>14.3f} "
+            f"{legacy / compiled:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Benchmark driver for TerminusKIRA.
+
+Runs a task list under several agent configurations with `harbor run`,
+then aggregates per-trial wall-clock time, episodes, tokens, cache hit
+ratio, cost and harness time saved into CSV and JSON reports with
+percentiles.
+
+Example:
+    uv run python -m terminus_kira.bench \\
+        --dataset terminal-bench@2.0 --model anthropic/claude-opus-4-6 \\
+        --task hello-world --task fix-git -n 4 \\
+        --sweep cache_strategy=tail,pinned \\
+        --sweep time_limit_seconds=900,1800 \\
+        --output-dir bench-results
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import math
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+AGENT_IMPORT_PATH = "terminus_kira.terminus_kira:TerminusKIRA"
+_METRICS = (
+    "wall_clock_sec",
+    "episodes",
+    "input_tokens",
+    "output_tokens",
+    "cache_hit_ratio",
+    "cost_usd",
+    "time_saved_sec",
+)
+_PERCENTILES = (50, 90, 95)
+
+
+@dataclass
+class TrialRecord:
+    config: str
+    task_name: str
+    trial_name: str
+    reward: float | None
+    wall_clock_sec: float | None
+    episodes: int | None
+    input_tokens: int | None
+    output_tokens: int | None
+    cache_hit_ratio: float | None
+    cost_usd: float | None
+    time_saved_sec: float | None
+    error: str | None
+
+
+def expand_sweep(sweeps: list[str]) -> list[dict[str, str]]:
+    """Turn ["a=1,2", "b=x"] into the cartesian product of agent kwargs."""
+    axes = []
+    for sweep in sweeps:
+        key, _, values = sweep.partition("=")
+        if not key or not values:
+            raise ValueError(f"Invalid --sweep {sweep!r}, expected key=v1,v2")
+        axes.append([(key, value) for value in values.split(",")])
+    return [dict(combo) for combo in itertools.product(*axes)] or [{}]
+
+
+def config_name(agent_kwargs: dict[str, str]) -> str:
+    if not agent_kwargs:
+        return "default"
+    return "__".join(f"{k}-{v}" for k, v in sorted(agent_kwargs.items()))
+
+
+async def run_config(
+    args: argparse.Namespace,
+    agent_kwargs: dict[str, str],
+    jobs_dir: Path,
+) -> int:
+    """Run one configuration as a harbor job; returns the exit code."""
+    cmd = [
+        "harbor",
+        "run",
+        "--dataset",
+        args.dataset,
+        "--agent-import-path",
+        AGENT_IMPORT_PATH,
+        "--model",
+        args.model,
+        "--env",
+        args.env,
+        "--n-concurrent",
+        str(args.n_concurrent),
+        "--jobs-dir",
+        str(jobs_dir),
+        "--job-name",
+        config_name(agent_kwargs),
+    ]
+    for task in args.task:
+        cmd += ["--task-name", task]
+    if args.n_tasks:
+        cmd += ["--n-tasks", str(args.n_tasks)]
+    for key, value in agent_kwargs.items():
+        cmd += ["--agent-kwarg", f"{key}={value}"]
+
+    print(f"[bench] {' '.join(cmd)}")
+    process = await asyncio.create_subprocess_exec(*cmd)
+    return await process.wait()
+
+
+def _load_json(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _duration_sec(start: str | None, end: str | None) -> float | None:
+    if not start or not end:
+        return None
+    try:
+        delta = datetime.fromisoformat(end) - datetime.fromisoformat(start)
+    except ValueError:
+        return None
+    return delta.total_seconds()
+
+
+def _count_agent_steps(trial_dir: Path) -> int | None:
+    trajectory = _load_json(trial_dir / "agent" / "trajectory.json")
+    if trajectory is None:
+        return None
+    steps = trajectory.get("steps", [])
+    return sum(1 for step in steps if step.get("source") == "agent")
+
+
+def collect_trials(config: str, job_dir: Path) -> list[TrialRecord]:
+    """Read every trial result.json of a harbor job directory."""
+    records = []
+    for result_path in sorted(job_dir.glob("*/result.json")):
+        result = _load_json(result_path)
+        if result is None or "task_name" not in result:
+            continue
+        agent = result.get("agent_result") or {}
+        metadata = agent.get("metadata") or {}
+        rewards = (result.get("verifier_result") or {}).get("rewards") or {}
+        input_tokens = agent.get("n_input_tokens")
+        cache_tokens = agent.get("n_cache_tokens")
+        exception = result.get("exception_info") or {}
+        records.append(
+            TrialRecord(
+                config=config,
+                task_name=result["task_name"],
+                trial_name=result.get("trial_name", result_path.parent.name),
+                reward=rewards.get("reward"),
+                wall_clock_sec=_duration_sec(
+                    result.get("started_at"), result.get("finished_at")
+                ),
+                episodes=metadata.get("n_episodes")
+                or _count_agent_steps(result_path.parent),
+                input_tokens=input_tokens,
+                output_tokens=agent.get("n_output_tokens"),
+                cache_hit_ratio=(
+                    cache_tokens / input_tokens
+                    if input_tokens and cache_tokens is not None
+                    else None
+                ),
+                cost_usd=agent.get("cost_usd"),
+                time_saved_sec=metadata.get("time_saved_sec"),
+                error=exception.get("exception_type"),
+            )
+        )
+    return records
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(records: list[TrialRecord]) -> dict[str, Any]:
+    summary: dict[str, Any] = {}
+    for config in sorted({r.config for r in records}):
+        rows = [r for r in records if r.config == config]
+        rewards = [r.reward for r in rows if r.reward is not None]
+        config_summary: dict[str, Any] = {
+            "trials": len(rows),
+            "errors": sum(1 for r in rows if r.error),
+            "mean_reward": sum(rewards) / len(rewards) if rewards else None,
+        }
+        for metric in _METRICS:
+            values = [getattr(r, metric) for r in rows]
+            values = [v for v in values if v is not None]
+            if not values:
+                continue
+            config_summary[metric] = {
+                "mean": sum(values) / len(values),
+                "total": sum(values),
+                **{f"p{p}": percentile(values, p) for p in _PERCENTILES},
+            }
+        summary[config] = config_summary
+    return summary
+
+
+def write_reports(records: list[TrialRecord], output_dir: Path) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "trials.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(TrialRecord.__dataclass_fields__))
+        writer.writeheader()
+        for record in records:
+            writer.writerow(asdict(record))
+    (output_dir / "summary.json").write_text(
+        json.dumps(summarize(records), indent=2)
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    output_dir = Path(args.output_dir)
+    jobs_dir = output_dir / "jobs"
+    configs = expand_sweep(args.sweep)
+
+    if not args.report_only:
+        for agent_kwargs in configs:
+            code = await run_config(args, agent_kwargs, jobs_dir)
+            if code != 0:
+                print(f"[bench] {config_name(agent_kwargs)} exited with {code}")
+
+    records = []
+    for agent_kwargs in configs:
+        name = config_name(agent_kwargs)
+        records.extend(collect_trials(name, jobs_dir / name))
+    write_reports(records, output_dir)
+    print(json.dumps(summarize(records), indent=2))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", required=True)
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--env", default="docker")
+    parser.add_argument("--task", action="append", default=[], help="Task name")
+    parser.add_argument("--n-tasks", type=int, default=None)
+    parser.add_argument(
+        "-n", "--n-concurrent", type=int, default=4, help="Concurrent trials"
+    )
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        help="Agent kwarg values to sweep, e.g. cache_strategy=tail,pinned",
+    )
+    parser.add_argument("--output-dir", default="bench-results")
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Only aggregate results already in --output-dir",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    asyncio.run(main_async(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import json
+from typing import Any
+
+
+class CommandStreamScanner:
+    """Find the items of the top-level "commands" array while a response streams.
+
+    `feed` takes the next chunk of response text and returns every command
+    object whose closing brace has arrived, decoded with json.loads. Only
+    string/escape state and nesting depth are tracked, so each character is
+    looked at once. Text before the first "{" is ignored; scanning stops when
+    the top-level object closes. Items that do not decode are returned as
+    None so the caller can stop dispatching at the first bad one.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        # Last string seen directly in the top-level object (a key or a value)
+        self._last_string: str | None = None
+        self._key: str | None = None
+        self._in_commands = False
+        self._item_start: int | None = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list[Any]:
+        self._text += chunk
+        text = self._text
+        items = []
+        i = self._pos
+        while i < len(text) and not self.done:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1 : i]
+            elif self._depth == 0:
+                if c == "{":
+                    self._depth = 1
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == ":" and self._depth == 1:
+                self._key = self._last_string
+            elif c == "," and self._depth == 1:
+                self._key = None
+            elif c in "{[":
+                self._depth += 1
+                if c == "[" and self._depth == 2 and self._key == "commands":
+                    self._in_commands = True
+                elif c == "{" and self._in_commands and self._depth == 3:
+                    self._item_start = i
+            elif c in "}]":
+                if self._in_commands and self._depth == 3 and c == "}":
+                    items.append(self._decode(text[self._item_start : i + 1]))
+                    self._item_start = None
+                elif self._in_commands and self._depth == 2:
+                    self._in_commands = False
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+            i += 1
+        self._pos = i
+        return items
+
+    @staticmethod
+    def _decode(item: str) -> Any:
+        try:
+            return json.loads(item)
+        except json.JSONDecodeError:
+            return None
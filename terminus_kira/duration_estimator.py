@@ -0,0 +1,175 @@
+import json
+import os
+import re
+import shlex
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Keystrokes that are not shell commands (tmux key names, interrupts, ...)
+_KEY_RE = re.compile(r"^(C-|M-|S-)?[A-Za-z0-9]+$")
+# Control operators that start a new command in a chain
+_SEPARATORS = {"&&", "||", ";", "|", "&"}
+_ENV_ASSIGNMENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+_NUMBER_RE = re.compile(r"\d+")
+# Wrappers that do not tell us anything about the runtime
+_PREFIX_COMMANDS = {"sudo", "time", "nohup", "env", "exec", "nice", "timeout"}
+# Commands that are nearly instant and would hide the real work in a chain
+_TRIVIAL_COMMANDS = {"cd", "export", "source", ".", "set", "echo", "true"}
+
+
+def command_signature(keystrokes: str) -> str | None:
+    """Reduce keystrokes to `binary [first positional argument]`.
+
+    Paths are reduced to their basename and digits to N, so `python3
+    /app/train.py --epochs 5` and `python3 train.py` share a signature.
+    Returns None for keystrokes that are not a shell command.
+    """
+    text = keystrokes.strip().split("\n")[0].strip()
+    if not text or ("\n" not in keystrokes and _KEY_RE.match(text)):
+        return None
+
+    segments = _split_commands(text)
+    for i, tokens in enumerate(segments):
+        while tokens and (
+            tokens[0] in _PREFIX_COMMANDS or _ENV_ASSIGNMENT_RE.match(tokens[0])
+        ):
+            tokens = tokens[1:]
+        if not tokens:
+            continue
+        binary = os.path.basename(tokens[0])
+        if binary in _TRIVIAL_COMMANDS and i < len(segments) - 1:
+            continue
+        positional = next((t for t in tokens[1:] if not t.startswith("-")), None)
+        if positional is None:
+            return binary
+        positional = _NUMBER_RE.sub("N", os.path.basename(positional.rstrip("/")))
+        return f"{binary} {positional}"
+    return None
+
+
+def _split_commands(text: str) -> list[list[str]]:
+    """Tokenize a command line and split it into one token list per command.
+
+    Operators inside quotes (`grep 'a|b' f`) stay part of their word.
+    Redirections are dropped together with their target.
+    """
+    lexer = shlex.shlex(text, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        # Unbalanced quotes, most likely a command still being typed
+        tokens = text.split()
+
+    segments: list[list[str]] = [[]]
+    skip_next = False
+    for token in tokens:
+        if token in _SEPARATORS:
+            segments.append([])
+        elif skip_next:
+            skip_next = False
+        elif token and all(c in lexer.punctuation_chars for c in token):
+            skip_next = bool(token.strip("()"))
+        else:
+            segments[-1].append(token)
+    return [segment for segment in segments if segment]
+
+
+@dataclass
+class DurationStats:
+    samples: int = 0
+    mean_sec: float = 0.0
+    max_sec: float = 0.0
+    # Times the command was still running when the wait ran out
+    timeouts: int = 0
+
+
+class DurationEstimator:
+    """Learn how long commands actually take, per command signature.
+
+    Completion times measured through the markers update an exponentially
+    weighted mean. A command that outlasted its wait is counted as a timeout
+    and its runtime is recorded once a later marker shows it has finished,
+    so the next run of the same command gets a long enough budget and does
+    not need an extra "still running" episode. Stats can be loaded from and
+    saved to a JSON file to carry over between runs.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        alpha: float = 0.3,
+        headroom: float = 1.5,
+        max_wait_sec: float = 60.0,
+    ):
+        self.path = Path(path) if path else None
+        self.alpha = alpha
+        self.headroom = headroom
+        self.max_wait_sec = max_wait_sec
+        self._stats: dict[str, DurationStats] = {}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def predict(self, signature: str | None) -> float | None:
+        """Expected runtime in seconds, or None without history."""
+        stats = self._stats.get(signature) if signature else None
+        if stats is None or stats.samples == 0:
+            return None
+        return stats.mean_sec
+
+    def effective_wait(self, signature: str | None, requested_sec: float) -> float:
+        """Never wait less than requested, but extend for known slow commands.
+
+        Waiting longer is cheap because the harness wakes up as soon as the
+        completion marker appears.
+        """
+        predicted = self.predict(signature)
+        if predicted is None:
+            return requested_sec
+        return max(requested_sec, min(predicted * self.headroom, self.max_wait_sec))
+
+    def poll_interval(self, signature: str | None, default_sec: float = 0.5) -> float:
+        """Poll faster for commands known to finish quickly."""
+        predicted = self.predict(signature)
+        if predicted is None:
+            return default_sec
+        return min(default_sec, max(0.05, predicted / 4))
+
+    def record(
+        self, signature: str | None, elapsed_sec: float, completed: bool
+    ) -> None:
+        if signature is None:
+            return
+        stats = self._stats.setdefault(signature, DurationStats())
+        if not completed:
+            # Only a lower bound, and possibly a command that never returns
+            # (e.g. a server), so it must not stretch future waits by itself.
+            stats.timeouts += 1
+            return
+        if stats.samples == 0:
+            stats.mean_sec = elapsed_sec
+        else:
+            stats.mean_sec += self.alpha * (elapsed_sec - stats.mean_sec)
+        stats.samples += 1
+        stats.max_sec = max(stats.max_sec, elapsed_sec)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {sig: asdict(stats) for sig, stats in self._stats.items()},
+                indent=2,
+                sort_keys=True,
+            )
+        )
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+            self._stats = {sig: DurationStats(**stats) for sig, stats in data.items()}
+        except (OSError, ValueError, TypeError):
+            self._stats = {}
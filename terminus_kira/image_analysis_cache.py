@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_instruction(instruction: str) -> str:
+    """Normalize an image_read instruction so trivial rewordings share a key."""
+    return _WHITESPACE_RE.sub(" ", instruction).strip().rstrip(".!?").lower()
+
+
+class ImageAnalysisCache:
+    """LRU cache with TTL for image_read analyses.
+
+    Keys combine the image content hash, the normalized instruction and the
+    model name, so the same question about the same pixels is answered once.
+    With `cache_dir`, entries are also written to disk as one JSON file per
+    key, which lets repeated benchmark trials of the same task reuse them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_sec: float = 3600.0,
+        cache_dir: str | Path | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content_hash: str, instruction: str, model: str) -> str:
+        payload = json.dumps(
+            [content_hash, normalize_instruction(instruction), model]
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+        if entry is not None and time.time() - entry[0] <= self.ttl_sec:
+            self._remember(key, entry)
+            self.hits += 1
+            return entry[1]
+        self._entries.pop(key, None)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, response: str) -> None:
+        entry = (time.time(), response)
+        self._remember(key, entry)
+        if self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.json"
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps({"created_at": entry[0], "response": response})
+            )
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: str, entry: tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> tuple[float, str] | None:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            data = json.loads(path.read_text())
+            return float(data["created_at"]), str(data["response"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,247 @@
+import asyncio
+import base64
+import io
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional (pip install terminus-kira[images])
+    Image = None
+
+MAX_IMAGE_BYTES = 5 * 1024 * 1024  # 5MB Anthropic limit (base64 payload)
+# Largest file we are willing to copy out of the container for conversion
+MAX_SOURCE_IMAGE_BYTES = 50 * 1024 * 1024
+# Anthropic downsizes anything above ~1.15 megapixels, so sending more only
+# costs transfer time and tokens
+DEFAULT_PIXEL_BUDGET = 1568 * 728
+
+IMAGE_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+# Both are multiples of 3 so base64 blocks can be concatenated without padding
+_ENCODE_BLOCK_BYTES = 3 * 64 * 1024
+
+
+class ImagePreparationError(Exception):
+    """Raised when an image cannot be turned into an acceptable payload."""
+
+
+@dataclass
+class PreparedImage:
+    data_url: str
+    mime: str
+    content_hash: str
+    source_bytes: int
+    encoded_bytes: int
+    converted: bool = False
+
+
+def encoded_size(n_bytes: int) -> int:
+    """Size of the base64 encoding of n_bytes."""
+    return 4 * -(-n_bytes // 3)
+
+
+def _check_deadline(deadline: float) -> None:
+    if time.monotonic() > deadline:
+        raise TimeoutError
+
+
+def encode_data_url(path: Path, mime: str) -> str:
+    """Base64-encode a local file into a data URL, one block at a time.
+
+    The raw file is never held in memory as a whole, and the encoded blocks
+    are joined once into the final string.
+    """
+    parts = [f"data:{mime};base64,"]
+    with open(path, "rb") as f:
+        while block := f.read(_ENCODE_BLOCK_BYTES):
+            parts.append(base64.b64encode(block).decode("ascii"))
+    return "".join(parts)
+
+
+class ImagePreparer:
+    """Turn an image file into a data URL the vision API will accept.
+
+    Files that are already in a supported format, under the size limit and
+    within the pixel budget are encoded as-is. Everything else is decoded,
+    downscaled to the pixel budget and re-encoded as PNG (or JPEG when PNG
+    is still too large) in a worker thread that gives up once `timeout_sec`
+    has passed, checked between the decode and encode steps.
+    Conversion needs Pillow; without it such files are rejected with a hint
+    to convert them in the container.
+
+    Results are cached by content hash, so re-reading the same file costs
+    neither a transfer nor a conversion. The cache is bounded by the total
+    size of the data URLs it holds (`cache_bytes`), since each can be up to
+    `max_encoded_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_encoded_bytes: int = MAX_IMAGE_BYTES,
+        pixel_budget: int = DEFAULT_PIXEL_BUDGET,
+        timeout_sec: float = 10.0,
+        cache_bytes: int = 4 * MAX_IMAGE_BYTES,
+    ):
+        self.max_encoded_bytes = max_encoded_bytes
+        self.pixel_budget = pixel_budget
+        self.timeout_sec = timeout_sec
+        self._cache_bytes = cache_bytes
+        self._cached_bytes = 0
+        self._cache: OrderedDict[str, PreparedImage] = OrderedDict()
+
+    @property
+    def can_convert(self) -> bool:
+        return Image is not None
+
+    @property
+    def max_source_bytes(self) -> int:
+        """Largest file worth transferring for this preparer."""
+        if self.can_convert:
+            return MAX_SOURCE_IMAGE_BYTES
+        return self.max_encoded_bytes * 3 // 4
+
+    def get_cached(self, content_hash: str | None) -> PreparedImage | None:
+        if not content_hash or content_hash not in self._cache:
+            return None
+        self._cache.move_to_end(content_hash)
+        return self._cache[content_hash]
+
+    async def prepare(
+        self, path: Path, mime: str | None, content_hash: str
+    ) -> PreparedImage:
+        cached = self.get_cached(content_hash)
+        if cached is not None:
+            return cached
+
+        source_bytes = path.stat().st_size
+        if self._fits_as_is(path, mime, source_bytes):
+            prepared = PreparedImage(
+                data_url=encode_data_url(path, mime),
+                mime=mime,
+                content_hash=content_hash,
+                source_bytes=source_bytes,
+                encoded_bytes=encoded_size(source_bytes),
+            )
+        else:
+            if not self.can_convert:
+                raise ImagePreparationError(self._conversion_hint(mime, source_bytes))
+            try:
+                # The thread checks the deadline itself: cancelling the await
+                # would leave it running in the background
+                data, out_mime = await asyncio.to_thread(
+                    self._convert, path, time.monotonic() + self.timeout_sec
+                )
+            except TimeoutError:
+                raise ImagePreparationError(
+                    f"Image conversion took longer than {self.timeout_sec:.0f}s. "
+                    "Downscale the image in the terminal first, then use "
+                    "`image_read` on the smaller file."
+                ) from None
+            prepared = PreparedImage(
+                data_url="".join(
+                    [f"data:{out_mime};base64,", base64.b64encode(data).decode("ascii")]
+                ),
+                mime=out_mime,
+                content_hash=content_hash,
+                source_bytes=source_bytes,
+                encoded_bytes=encoded_size(len(data)),
+                converted=True,
+            )
+
+        self._remember(prepared)
+        return prepared
+
+    def _remember(self, prepared: PreparedImage) -> None:
+        if prepared.encoded_bytes > self._cache_bytes:
+            return
+        # Concurrent reads of the same image may both have prepared it
+        previous = self._cache.pop(prepared.content_hash, None)
+        if previous is not None:
+            self._cached_bytes -= previous.encoded_bytes
+        self._cache[prepared.content_hash] = prepared
+        self._cached_bytes += prepared.encoded_bytes
+        while self._cached_bytes > self._cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted.encoded_bytes
+
+    def _fits_as_is(self, path: Path, mime: str | None, source_bytes: int) -> bool:
+        if mime is None or encoded_size(source_bytes) > self.max_encoded_bytes:
+            return False
+        if not self.can_convert:
+            return True
+        # Image.open only reads the header
+        try:
+            with Image.open(path) as img:
+                return img.width * img.height <= self.pixel_budget
+        except Exception:
+            return True
+
+    def _conversion_hint(self, mime: str | None, source_bytes: int) -> str:
+        if mime is None:
+            return (
+                "Unsupported image format. Convert to PNG first, "
+                "then use `image_read` on the PNG file."
+            )
+        return (
+            f"Image is {source_bytes / (1024 * 1024):.1f}MB "
+            f"({encoded_size(source_bytes) / (1024 * 1024):.1f}MB base64-encoded), "
+            f"larger than the {self.max_encoded_bytes // (1024 * 1024)}MB limit. "
+            "Downscale or compress it first (e.g. to a smaller JPEG), "
+            "then use `image_read` on the smaller file."
+        )
+
+    def _convert(self, path: Path, deadline: float) -> tuple[bytes, str]:
+        """Decode, downscale to the pixel budget and re-encode (runs in a thread).
+
+        Raises TimeoutError at the first step boundary past `deadline`
+        (a time.monotonic() value).
+        """
+        try:
+            img = Image.open(path)
+            pixels = img.width * img.height
+            scale = min(1.0, math.sqrt(self.pixel_budget / pixels)) if pixels else 1.0
+            target = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+            # Let JPEG decode at reduced resolution directly
+            img.draft("RGB", target)
+            img.load()
+        except Exception as e:
+            raise ImagePreparationError(f"Could not decode image: {e}") from e
+
+        _check_deadline(deadline)
+        if getattr(img, "n_frames", 1) > 1:
+            img.seek(0)
+        if img.mode not in ("RGB", "RGBA", "L", "LA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        for _ in range(6):
+            if img.width * img.height > self.pixel_budget:
+                img.thumbnail(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+                _check_deadline(deadline)
+
+            png = io.BytesIO()
+            img.save(png, format="PNG", optimize=False)
+            if encoded_size(png.tell()) <= self.max_encoded_bytes:
+                return png.getvalue(), "image/png"
+            _check_deadline(deadline)
+
+            jpeg = io.BytesIO()
+            img.convert("RGB").save(jpeg, format="JPEG", quality=85)
+            if encoded_size(jpeg.tell()) <= self.max_encoded_bytes:
+                return jpeg.getvalue(), "image/jpeg"
+            _check_deadline(deadline)
+
+            target = (max(1, int(img.width * 0.75)), max(1, int(img.height * 0.75)))
+            img = img.resize(target, Image.Resampling.LANCZOS)
+
+        raise ImagePreparationError(
+            "Image could not be compressed below the size limit"
+        )
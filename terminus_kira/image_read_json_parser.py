@@ -1,5 +1,4 @@
 import json
-import re
 from dataclasses import dataclass, field
 
 from harbor.agents.terminus_2.terminus_json_plain_parser import (
@@ -8,6 +7,9 @@ from harbor.agents.terminus_2.terminus_json_plain_parser import (
     TerminusJSONPlainParser,
 )
 
+# Upper bound on images analyzed from a single response
+MAX_IMAGE_READS = 8
+
 
 @dataclass
 class ImageReadRequest:
@@ -18,6 +20,7 @@ class ImageReadRequest:
 @dataclass
 class ImageReadParseResult(ParseResult):
     image_read: ImageReadRequest | None = field(default=None)
+    image_reads: list[ImageReadRequest] = field(default_factory=list)
 
 
 class ImageReadJSONParser(TerminusJSONPlainParser):
@@ -73,20 +76,24 @@ class ImageReadJSONParser(TerminusJSONPlainParser):
                 return "Field 'commands' must be an array"
 
         if has_image_read:
-            image_read = data["image_read"]
-            if not isinstance(image_read, dict):
-                return "Field 'image_read' must be an object"
-            if "file_path" not in image_read:
-                return "Field 'image_read' missing required 'file_path'"
-            if not isinstance(image_read["file_path"], str):
-                return "Field 'image_read.file_path' must be a string"
-            if "image_read_instruction" not in image_read:
-                return "Field 'image_read' missing required 'image_read_instruction'"
-            if not isinstance(image_read["image_read_instruction"], str):
-                return "Field 'image_read.image_read_instruction' must be a string"
+            image_reads = data["image_read"]
+            if isinstance(image_reads, list):
+                if not image_reads:
+                    return "Field 'image_read' must not be an empty array"
+                if len(image_reads) > MAX_IMAGE_READS:
+                    return (
+                        f"Field 'image_read' accepts at most {MAX_IMAGE_READS} "
+                        f"images per response, got {len(image_reads)}"
+                    )
+            else:
+                image_reads = [image_reads]
+            for image_read in image_reads:
+                error = self._validate_image_read(image_read)
+                if error:
+                    return error
 
         # Check for correct order of fields
-        self._check_field_order(data, json_content, warnings)
+        self._check_field_order(data, warnings)
 
         # Validate task_complete if present
         task_complete = data.get("task_complete")
@@ -95,6 +102,21 @@ class ImageReadJSONParser(TerminusJSONPlainParser):
 
         return ""
 
+    @staticmethod
+    def _validate_image_read(image_read: object) -> str:
+        """Validate a single image_read object."""
+        if not isinstance(image_read, dict):
+            return "Field 'image_read' must be an object or an array of objects"
+        if "file_path" not in image_read:
+            return "Field 'image_read' missing required 'file_path'"
+        if not isinstance(image_read["file_path"], str):
+            return "Field 'image_read.file_path' must be a string"
+        if "image_read_instruction" not in image_read:
+            return "Field 'image_read' missing required 'image_read_instruction'"
+        if not isinstance(image_read["image_read_instruction"], str):
+            return "Field 'image_read.image_read_instruction' must be a string"
+        return ""
+
     def _try_parse_response(self, response: str) -> ImageReadParseResult:
         """Parse response with support for image_read."""
         warnings: list[str] = []
@@ -147,14 +169,17 @@ class ImageReadJSONParser(TerminusJSONPlainParser):
         if isinstance(is_complete, str):
             is_complete = is_complete.lower() in ("true", "1", "yes")
 
-        # Extract image_read if present
-        image_read = None
+        # Extract image_read (a single object or an array) if present
+        image_reads: list[ImageReadRequest] = []
         if "image_read" in parsed_data:
             fr_data = parsed_data["image_read"]
-            image_read = ImageReadRequest(
-                file_path=fr_data["file_path"],
-                image_read_instruction=fr_data["image_read_instruction"],
-            )
+            for item in fr_data if isinstance(fr_data, list) else [fr_data]:
+                image_reads.append(
+                    ImageReadRequest(
+                        file_path=item["file_path"],
+                        image_read_instruction=item["image_read_instruction"],
+                    )
+                )
             # Allow image_read + task_complete=true (e.g. verify screenshot then complete)
 
         # Parse commands if present
@@ -195,13 +220,17 @@ class ImageReadJSONParser(TerminusJSONPlainParser):
             is_task_complete=is_complete,
             error="",
             warning="- " + "\n- ".join(warnings) if warnings else "",
-            image_read=image_read,
+            image_read=image_reads[0] if image_reads else None,
+            image_reads=image_reads,
         )
 
-    def _check_field_order(
-        self, data: dict, response: str, warnings: list[str]
-    ) -> None:
-        """Check field order for both commands and image_read variants."""
+    def _check_field_order(self, data: dict, warnings: list[str]) -> None:
+        """Check field order for both commands and image_read variants.
+
+        json.loads keeps the keys of the top-level object in the order they
+        were decoded, so the order is read from `data` instead of searching
+        the raw response again for every field.
+        """
         if "commands" in data:
             expected_order = ["analysis", "plan", "commands"]
         elif "image_read" in data:
@@ -209,24 +238,11 @@ class ImageReadJSONParser(TerminusJSONPlainParser):
         else:
             expected_order = ["analysis", "plan"]
 
-        # Find positions of each field in the original response
-        positions = {}
-        for field_name in expected_order:
-            pattern = f'"({field_name})"\\s*:'
-            match = re.search(pattern, response)
-            if match:
-                positions[field_name] = match.start()
-
-        if len(positions) < 2:
+        actual_order = [f for f in data if f in expected_order]
+        if len(actual_order) < 2:
             return
 
-        present_fields = [
-            (f, positions[f]) for f in expected_order if f in positions
-        ]
-
-        actual_order = [f for f, _ in sorted(present_fields, key=lambda x: x[1])]
-        expected_present = [f for f in expected_order if f in positions]
-
+        expected_present = [f for f in expected_order if f in data]
         if actual_order != expected_present:
             actual_str = " → ".join(actual_order)
             expected_str = " → ".join(expected_present)
@@ -0,0 +1,38 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class LLMRateLimiter:
+    """Concurrency and request-rate limit shared by all LLM calls of a run.
+
+    Both the main chat and image analysis acquire a slot, so a burst of
+    image reads cannot push the run over the provider's rate limit.
+    `requests_per_minute` spaces out request starts evenly; None disables
+    the rate limit and only bounds concurrency.
+    """
+
+    def __init__(
+        self, max_concurrent: int = 8, requests_per_minute: float | None = None
+    ):
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+        self.waited_sec = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        start = time.monotonic()
+        async with self._semaphore:
+            if self._interval:
+                async with self._lock:
+                    now = time.monotonic()
+                    delay = max(0.0, self._next_start - now)
+                    self._next_start = max(now, self._next_start) + self._interval
+                if delay:
+                    await asyncio.sleep(delay)
+            self.waited_sec += time.monotonic() - start
+            yield
+
@@ -0,0 +1,116 @@
+import re
+from collections import deque
+
+# Lines worth keeping even when they fall in the elided middle of the output
+_IMPORTANT_LINE_RE = re.compile(
+    r"error|fail|fatal|exception|traceback|panic|abort|denied|not found"
+    r"|undefined|segmentation|killed|cannot|unable",
+    re.IGNORECASE,
+)
+
+_ELIDED_MARKER_BYTES = 32
+
+
+def _line_bytes(line: str) -> int:
+    return len(line.encode("utf-8", errors="replace")) + 1
+
+
+def _collapse_carriage_returns(line: str) -> str:
+    """Keep only what a terminal would finally show for a line with CRs."""
+    if "\r" not in line:
+        return line
+    for segment in reversed(line.split("\r")):
+        if segment:
+            return segment
+    return ""
+
+
+def condense_output(
+    text: str,
+    max_bytes: int = 30000,
+    head_ratio: float = 0.3,
+    important_ratio: float = 0.2,
+    min_repeat: int = 3,
+) -> str:
+    """Shrink terminal output while keeping the lines that matter.
+
+    In a single pass over the lines:
+
+    - carriage-return progress updates collapse to their final state,
+    - runs of more than `min_repeat` identical lines become one line plus a
+      repeat count,
+    - if the result is still larger than `max_bytes`, only a head window
+      (`head_ratio` of the budget) and a tail window are kept. Error-looking
+      lines from the elided middle are kept too, up to `important_ratio` of
+      the budget, each gap replaced by an elided-line count.
+    """
+    head_budget = int(max_bytes * head_ratio)
+    important_budget = int(max_bytes * important_ratio)
+
+    head: list[str] = []
+    head_bytes = 0
+    tail: deque[str] = deque()
+    tail_bytes = 0
+    # Middle: kept important lines and counts of elided lines, in order
+    middle: list[str | int] = []
+    important_bytes = 0
+
+    def emit(line: str) -> None:
+        nonlocal head_bytes, tail_bytes, important_bytes
+        size = _line_bytes(line)
+        if not tail and head_bytes + size <= head_budget:
+            head.append(line)
+            head_bytes += size
+            return
+        tail.append(line)
+        tail_bytes += size
+        # The tail gets whatever the head and kept middle lines leave over
+        while len(tail) > 1 and (
+            tail_bytes > max_bytes - head_bytes - important_bytes
+        ):
+            evicted = tail.popleft()
+            evicted_size = _line_bytes(evicted)
+            tail_bytes -= evicted_size
+            if (
+                important_bytes + evicted_size <= important_budget
+                and _IMPORTANT_LINE_RE.search(evicted)
+            ):
+                middle.append(evicted)
+                important_bytes += evicted_size
+            elif middle and isinstance(middle[-1], int):
+                middle[-1] += 1
+            else:
+                middle.append(1)
+                # Leave room for the elided-lines marker
+                important_bytes += _ELIDED_MARKER_BYTES
+
+    def emit_run(line: str, count: int) -> None:
+        if count > min_repeat:
+            emit(line)
+            emit(f"[previous line repeated {count - 1} more times]")
+        else:
+            for _ in range(count):
+                emit(line)
+
+    previous: str | None = None
+    run = 0
+    for raw_line in text.split("\n"):
+        line = _collapse_carriage_returns(raw_line)
+        if line == previous:
+            run += 1
+            continue
+        if previous is not None:
+            emit_run(previous, run)
+        previous = line
+        run = 1
+    if previous is not None:
+        emit_run(previous, run)
+
+    parts = list(head)
+    for item in middle:
+        if isinstance(item, int):
+            parts.append(f"[... {item} lines elided ...]")
+        else:
+            parts.append(item)
+    parts.extend(tail)
+    return "\n".join(parts)
@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any
+
+from harbor.llms.base import LLMResponse
+
+# Event kinds stored in a recording
+META = "meta"
+LLM_RESPONSE = "llm_response"
+CAPTURE_PANE = "capture_pane"
+INCREMENTAL_OUTPUT = "incremental_output"
+MARKER = "marker"
+IMAGE_READS = "image_reads"
+
+# LLMResponse fields restored on replay; usage is applied to the chat instead
+_LLM_RESPONSE_FIELDS = (
+    "content",
+    "reasoning_content",
+    "prompt_token_ids",
+    "completion_token_ids",
+    "logprobs",
+)
+
+
+class ReplayError(RuntimeError):
+    """The harness asked for more of an event kind than was recorded."""
+
+
+def _to_jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return vars(value)
+
+
+def llm_response_to_dict(response: LLMResponse) -> dict[str, Any]:
+    record = {
+        field: _to_jsonable(getattr(response, field, None))
+        for field in _LLM_RESPONSE_FIELDS
+    }
+    record["usage"] = _to_jsonable(getattr(response, "usage", None))
+    return record
+
+
+def llm_response_from_dict(record: dict[str, Any]) -> LLMResponse:
+    return LLMResponse(
+        **{field: record.get(field) for field in _LLM_RESPONSE_FIELDS}
+    )
+
+
+class Recording:
+    """JSONL file of everything the harness got from the model and terminal.
+
+    In record mode each event is appended (and flushed) as it happens. In
+    replay mode the file is loaded once and events are handed out in
+    recorded order, with a separate cursor per event kind, so a harness
+    change that, say, polls the pane a different number of times does not
+    shift the LLM responses.
+    """
+
+    def __init__(self, path: str | Path, replaying: bool = False):
+        self.path = Path(path)
+        self.replaying = replaying
+        self._events: dict[str, deque[Any]] = defaultdict(deque)
+        if replaying:
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("")
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self._events[event["kind"]].append(event["value"])
+
+    def record(self, kind: str, value: Any) -> None:
+        if self.replaying:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"kind": kind, "value": value}, default=str) + "\n")
+
+    def next(self, kind: str) -> Any:
+        events = self._events[kind]
+        if not events:
+            raise ReplayError(f"Recording {self.path} has no more {kind!r} events")
+        return events.popleft()
+
+    def peek(self, kind: str) -> Any | None:
+        events = self._events[kind]
+        return events[0] if events else None
+
+
+class RecordingSession:
+    """Wraps a TmuxSession and records what the harness reads from it."""
+
+    def __init__(self, wrapped, recording: Recording):
+        self.wrapped = wrapped
+        self._recording = recording
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+    async def capture_pane(self, *args, **kwargs) -> str:
+        pane = await self.wrapped.capture_pane(*args, **kwargs)
+        self._recording.record(CAPTURE_PANE, pane)
+        return pane
+
+    async def get_incremental_output(self, *args, **kwargs) -> str:
+        output = await self.wrapped.get_incremental_output(*args, **kwargs)
+        self._recording.record(INCREMENTAL_OUTPUT, output)
+        return output
+
+
+class ReplayEnvironment:
+    """Stands in for the container; everything it would return is recorded."""
+
+    async def exec(self, command: str, *args, **kwargs):
+        raise ReplayError(f"exec is not available in replay: {command!r}")
+
+    async def download_file(self, source_path: str, *args, **kwargs) -> None:
+        raise ReplayError(f"download is not available in replay: {source_path!r}")
+
+
+class ReplaySession:
+    """Local stand-in for TmuxSession that plays back recorded terminal reads.
+
+    Keystrokes are kept in `sent_keys` instead of being typed anywhere.
+    """
+
+    def __init__(self, recording: Recording):
+        self._recording = recording
+        self.environment = ReplayEnvironment()
+        self.sent_keys: list[str] = []
+        self._last_pane = ""
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def is_session_alive(self) -> bool:
+        return True
+
+    async def send_keys(self, keys, *args, **kwargs) -> None:
+        self.sent_keys.extend([keys] if isinstance(keys, str) else keys)
+
+    async def capture_pane(self, *args, **kwargs) -> str:
+        # Polling past the end of the recording keeps showing the last screen
+        if self._recording.peek(CAPTURE_PANE) is not None:
+            self._last_pane = self._recording.next(CAPTURE_PANE)
+        return self._last_pane
+
+    async def get_incremental_output(self, *args, **kwargs) -> str:
+        return self._recording.next(INCREMENTAL_OUTPUT)
+
+    def get_asciinema_timestamp(self) -> float:
+        return 0.0
+
+
+async def replay(
+    path: str | Path, logs_dir: str | Path, **agent_kwargs: Any
+) -> Any:
+    """Run TerminusKIRA against a recording, without network or containers.
+
+    Returns the agent context (token counts, metadata) of the replayed run.
+    """
+    from harbor.models.agent.context import AgentContext
+
+    from terminus_kira.terminus_kira import TerminusKIRA
+
+    meta = Recording(path, replaying=True).next(META)
+    agent = TerminusKIRA(
+        logs_dir=Path(logs_dir),
+        model_name=meta["model_name"],
+        replay_path=path,
+        **agent_kwargs,
+    )
+    context = AgentContext()
+    await agent.run(meta["instruction"], ReplayEnvironment(), context)
+    return context
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded TerminusKIRA run offline."
+    )
+    parser.add_argument("recording")
+    parser.add_argument("--logs-dir", default="replay-logs")
+    args = parser.parse_args(argv)
+    context = asyncio.run(replay(args.recording, args.logs_dir))
+    print(
+        json.dumps(
+            {
+                "n_input_tokens": context.n_input_tokens,
+                "n_output_tokens": context.n_output_tokens,
+                "metadata": context.metadata,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
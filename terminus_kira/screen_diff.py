@@ -0,0 +1,58 @@
+SCREEN_PREFIX = "Current Terminal Screen:\n"
+DIFF_PREFIX = (
+    "Current Terminal Screen (changed lines only, numbered from the top of the "
+    "screen; all other lines are unchanged from the previous screen):\n"
+)
+
+
+class ScreenDiffer:
+    """Replace repeated full-screen captures with a line-numbered diff.
+
+    When the incremental output falls back to the whole visible screen (TUIs
+    such as vim, top or less), lines are compared position by position with
+    the previous screen the model was shown. The diff is sent only when it is
+    smaller than `max_ratio` of the full screen, and a full screen is sent
+    again after `refresh_every` consecutive diffs so the model never drifts
+    too far from the real state.
+    """
+
+    def __init__(self, max_ratio: float = 0.6, refresh_every: int = 5):
+        self.max_ratio = max_ratio
+        self.refresh_every = refresh_every
+        self._previous: list[str] | None = None
+        self._diffs_in_a_row = 0
+
+    def reset(self) -> None:
+        self._previous = None
+        self._diffs_in_a_row = 0
+
+    def render(self, output: str) -> str:
+        if not output.startswith(SCREEN_PREFIX):
+            # Scrolling output: the model did not see a screen to diff against
+            self.reset()
+            return output
+
+        lines = output[len(SCREEN_PREFIX) :].split("\n")
+        previous, self._previous = self._previous, lines
+        if previous is None or self._diffs_in_a_row >= self.refresh_every:
+            self._diffs_in_a_row = 0
+            return output
+
+        width = len(str(max(len(lines), len(previous))))
+        changed = []
+        for i in range(max(len(lines), len(previous))):
+            new = lines[i] if i < len(lines) else ""
+            old = previous[i] if i < len(previous) else ""
+            if new != old:
+                changed.append(f"{i + 1:>{width}}| {new}")
+
+        if not changed:
+            self._diffs_in_a_row += 1
+            return DIFF_PREFIX + "(no changes)"
+
+        diff = DIFF_PREFIX + "\n".join(changed)
+        if len(diff) >= len(output) * self.max_ratio:
+            self._diffs_in_a_row = 0
+            return output
+        self._diffs_in_a_row += 1
+        return diff
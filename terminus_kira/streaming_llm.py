@@ -0,0 +1,140 @@
+from pathlib import Path
+from typing import Any, Callable
+
+import litellm
+from harbor.llms.base import LLMResponse, OutputLengthExceededError
+from harbor.llms.lite_llm import LiteLLM
+from harbor.llms.utils import add_anthropic_caching
+
+
+class StreamingLiteLLM(LiteLLM):
+    """harbor's LiteLLM, able to hand out the completion while it streams.
+
+    `call(..., on_text=fn)` makes a streaming request and passes every content
+    delta to `fn` as it arrives. The request is built like a regular call and
+    the result is the same LLMResponse (content, reasoning, usage and cost),
+    so `Chat.chat` records a streamed turn exactly like any other. Without
+    `on_text`, or when the call needs something a stream does not provide
+    (token IDs for rollout details, the Responses API, a response_format the
+    model only takes in the prompt), it is a regular call.
+
+    If the stream fails after some text was delivered, `on_error(exc)` is
+    asked whether to keep the partial response, since the caller may already
+    have acted on it. It is returned without usage instead of raising.
+    """
+
+    async def call(
+        self,
+        prompt: str,
+        message_history: list[dict[str, Any]] = [],
+        response_format: dict | None = None,
+        logging_path: Path | None = None,
+        on_text: Callable[[str], None] | None = None,
+        on_error: Callable[[Exception], bool] | None = None,
+        **kwargs,
+    ) -> LLMResponse:
+        if (
+            on_text is None
+            or self._use_responses_api
+            or self._collect_rollout_details
+            or (response_format is not None and not self._supports_response_format)
+        ):
+            return await super().call(
+                prompt, message_history, response_format, logging_path, **kwargs
+            )
+        return await self._stream(
+            prompt,
+            message_history,
+            response_format,
+            logging_path,
+            on_text,
+            on_error,
+            **kwargs,
+        )
+
+    async def _stream(
+        self,
+        prompt: str,
+        message_history: list[dict[str, Any]],
+        response_format: dict | None,
+        logging_path: Path | None,
+        on_text: Callable[[str], None],
+        on_error: Callable[[Exception], bool] | None,
+        **kwargs,
+    ) -> LLMResponse:
+        # Only meaningful for the Responses API
+        kwargs.pop("previous_response_id", None)
+        messages = add_anthropic_caching(
+            message_history + [{"role": "user", "content": prompt}], self._model_name
+        )
+        completion_kwargs = {
+            **self._build_base_kwargs(logging_path),
+            "messages": messages,
+            "temperature": self._temperature,
+            "response_format": response_format,
+            "reasoning_effort": self._reasoning_effort,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            **kwargs,
+        }
+        if self._max_thinking_tokens is not None and (
+            "anthropic" in self._model_name.lower()
+            or "claude" in self._model_name.lower()
+        ):
+            completion_kwargs["thinking"] = {
+                "type": "enabled",
+                "budget_tokens": max(self._max_thinking_tokens, 1024),
+            }
+        if self._session_id is not None:
+            completion_kwargs["extra_body"] = {
+                **completion_kwargs.get("extra_body", {}),
+                "session_id": self._session_id,
+            }
+
+        chunks = []
+        content: list[str] = []
+        reasoning: list[str] = []
+        try:
+            stream = await litellm.acompletion(**completion_kwargs)
+            finish_reason = None
+            async for chunk in stream:
+                chunks.append(chunk)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                thinking = getattr(choice.delta, "reasoning_content", None)
+                if thinking:
+                    reasoning.append(thinking)
+                text = getattr(choice.delta, "content", None)
+                if text:
+                    content.append(text)
+                    on_text(text)
+            if finish_reason == "length":
+                raise OutputLengthExceededError(
+                    f"Model {self._model_name} hit max_tokens limit. "
+                    "Response was truncated. Consider increasing max_tokens "
+                    "if possible.",
+                    truncated_response="".join(content),
+                )
+        except Exception as e:
+            if content and on_error is not None and on_error(e):
+                return LLMResponse(
+                    content="".join(content),
+                    reasoning_content="".join(reasoning) or None,
+                )
+            self._handle_litellm_error(e)
+
+        usage = None
+        try:
+            response = litellm.stream_chunk_builder(chunks, messages=messages)
+            if response is not None:
+                usage = self._extract_usage_info(response)
+        except Exception as e:
+            self._logger.warning(f"Could not compute usage of the stream: {e}")
+
+        return LLMResponse(
+            content="".join(content),
+            reasoning_content="".join(reasoning) or None,
+            usage=usage,
+        )
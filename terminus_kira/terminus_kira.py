@@ -1,12 +1,17 @@
 import asyncio
+import base64
+import hashlib
+import re
+import shlex
+import tempfile
 import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
-import litellm
 from harbor.agents.terminus_2.terminus_2 import Command, Terminus2
 from harbor.agents.terminus_2.tmux_session import TmuxSession
-from harbor.llms.base import LLMResponse
+from harbor.llms.base import BaseLLM, LLMBackend, LLMResponse
 from harbor.llms.chat import Chat
 from harbor.models.trajectories import (
     Metrics,
@@ -15,21 +20,86 @@ from harbor.models.trajectories import (
     Step,
     ToolCall,
 )
-from litellm.exceptions import BadRequestError
-from tenacity import (
-    retry,
-    retry_if_not_exception_type,
-    stop_after_attempt,
-    wait_exponential,
+from terminus_kira.command_stream import CommandStreamScanner
+from terminus_kira.duration_estimator import DurationEstimator, command_signature
+from terminus_kira.image_analysis_cache import ImageAnalysisCache
+from terminus_kira.image_prep import (
+    IMAGE_MIME_TYPES,
+    MAX_IMAGE_BYTES,
+    ImagePreparationError,
+    ImagePreparer,
 )
 from terminus_kira.image_read_json_parser import (
     ImageReadJSONParser,
     ImageReadRequest,
 )
-from anthropic_caching import add_anthropic_caching
+from terminus_kira.llm_limiter import LLMRateLimiter
+from terminus_kira.output_condenser import condense_output
+from terminus_kira.replay import (
+    IMAGE_READS,
+    LLM_RESPONSE,
+    MARKER,
+    META,
+    Recording,
+    RecordingSession,
+    ReplaySession,
+    llm_response_from_dict,
+    llm_response_to_dict,
+)
+from terminus_kira.screen_diff import DIFF_PREFIX, SCREEN_PREFIX, ScreenDiffer
+from terminus_kira.streaming_llm import StreamingLiteLLM
+from terminus_kira.timing import EpisodeTimer, TimingRecorder
+from terminus_kira.token_ledger import TokenLedger
+from terminus_kira.trajectory_log import TrajectoryLog
+from anthropic_caching import (
+    MAX_CACHE_BREAKPOINTS,
+    CacheBreakpointPlanner,
+    apply_cache_breakpoints,
+    is_anthropic_model,
+)
 
 _MARKER_PREFIX = "__CMD_DONE_"
-MAX_IMAGE_BYTES = 5 * 1024 * 1024  # 5MB Anthropic limit
+_MARKER_RE = re.compile(re.escape(_MARKER_PREFIX) + r"\d+__")
+_COMPLETION_MODES = ("wait_for", "poll")
+_CACHE_STRATEGIES = ("tail", "pinned", "rolling")
+# harbor's LiteLLM marks the last 3 messages of every request by itself
+_LLM_TAIL_BREAKPOINTS = 3
+# Multiple of 3 so per-chunk base64 decodes independently
+_EXEC_CHUNK_BYTES = 3 * 1024 * 1024
+
+
+def strip_marker_lines(output: str) -> str:
+    """Remove every line that contains a completion marker.
+
+    A single compiled pattern matches markers of any sequence number, so the
+    cost depends only on the output size, not on how many markers were issued.
+    Markers from earlier batches that are still on screen are removed as well.
+    """
+    if _MARKER_PREFIX not in output:
+        return output
+    return "\n".join(
+        line for line in output.split("\n") if not _MARKER_RE.search(line)
+    )
+
+
+@dataclass
+class _CommandBatch:
+    """State of the commands of one response while they are being run."""
+
+    finished: list[tuple[str, float]] = field(default_factory=list)
+    pipelining: bool = False
+    # Keystrokes of commands already run while the response was streaming
+    executed: list[str] = field(default_factory=list)
+    # Why the stream ended early, if it failed after commands were dispatched
+    error: str | None = None
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1024 * 1024):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 class TerminusKIRA(Terminus2):
@@ -38,10 +108,45 @@ class TerminusKIRA(Terminus2):
         *args,
         time_limit_seconds: float | None = None,
         response_format: str | dict | None = "json_object",
+        completion_mode: str = "wait_for",
+        cache_strategy: str | CacheBreakpointPlanner = "tail",
+        image_cache_ttl_sec: float = 3600.0,
+        image_cache_dir: str | Path | None = None,
+        max_concurrent_image_reads: int = 4,
+        pipeline_after_sec: float | None = None,
+        export_timings: bool = True,
+        incremental_trajectory: bool = True,
+        trajectory_dump_every: int = 10,
+        condense_output: bool = True,
+        screen_diff: bool = True,
+        duration_stats_path: str | Path | None = None,
+        record_path: str | Path | None = None,
+        replay_path: str | Path | None = None,
+        max_concurrent_llm_requests: int = 8,
+        llm_requests_per_minute: float | None = None,
+        stream_commands: bool = False,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self._time_limit_seconds = time_limit_seconds
+        if completion_mode not in _COMPLETION_MODES:
+            raise ValueError(
+                f"Invalid completion_mode: {completion_mode!r}. "
+                f"Expected one of {_COMPLETION_MODES}."
+            )
+        self._completion_mode = completion_mode
+        self._token_ledger = TokenLedger(self._model_name)
+        self._cache_planner = self._make_cache_planner(
+            cache_strategy, token_counter=self._token_ledger.count_message
+        )
+        # Token count of the history, started while the previous commands ran
+        self._pending_token_count: asyncio.Task | None = None
+        self._episode_metrics: dict = {}
+        self._image_preparer = ImagePreparer()
+        self._max_concurrent_image_reads = max(1, max_concurrent_image_reads)
+        self._image_analysis_cache = ImageAnalysisCache(
+            ttl_sec=image_cache_ttl_sec, cache_dir=image_cache_dir
+        )
         # Normalize response_format: string → dict
         if isinstance(response_format, str):
             self._response_format = {"type": response_format}
@@ -51,6 +156,36 @@ class TerminusKIRA(Terminus2):
             self._response_format = None
         self._total_time_saved = 0.0
         self._marker_seq = 0
+        # Opt-in: return partial output after this many seconds and keep
+        # tracking the still-running command by its marker sequence number
+        self._pipeline_after_sec = pipeline_after_sec
+        self._in_flight: dict[int, tuple[str, float]] = {}
+        self._timed_out: dict[int, tuple[str | None, float]] = {}
+        # wait-for channels that will be (or were) signalled with nobody waiting
+        self._undrained_markers: list[str] = []
+        self._export_timings_enabled = export_timings
+        self._timings = TimingRecorder()
+        self._timer = EpisodeTimer(episode=-1)
+        self._incremental_trajectory = incremental_trajectory
+        self._trajectory_log: TrajectoryLog | None = None
+        # Episodes between full trajectory.json rewrites with the step log on
+        self._trajectory_dump_every = max(1, trajectory_dump_every)
+        self._condense_output = condense_output
+        self._screen_differ = ScreenDiffer() if screen_diff else None
+        self._duration_estimator = DurationEstimator(path=duration_stats_path)
+        self._llm_limiter = LLMRateLimiter(
+            max_concurrent=max_concurrent_llm_requests,
+            requests_per_minute=llm_requests_per_minute,
+        )
+        # Opt-in: stream completions and run commands as soon as they close
+        self._stream_commands = stream_commands
+        self._streamed_batch: _CommandBatch | None = None
+        if record_path is not None and replay_path is not None:
+            raise ValueError("record_path and replay_path are mutually exclusive.")
+        self._record_path = record_path
+        self._recording: Recording | None = (
+            Recording(replay_path, replaying=True) if replay_path else None
+        )
         if time_limit_seconds is not None:
             self._prompt_template = self._prompt_template.replace(
                 "{time_limit}", str(int(time_limit_seconds))
@@ -59,6 +194,45 @@ class TerminusKIRA(Terminus2):
             # Remove TIME BUDGET section when no time limit is given
             self._remove_time_budget_section()
 
+    def _init_llm(self, llm_backend: LLMBackend | str, **kwargs) -> BaseLLM:
+        """Use the LiteLLM subclass that can also stream (stream_commands)."""
+        backend = (
+            llm_backend.value if isinstance(llm_backend, LLMBackend) else llm_backend
+        )
+        if backend != LLMBackend.LITELLM.value:
+            return super()._init_llm(llm_backend=llm_backend, **kwargs)
+        llm_kwargs = kwargs.pop("llm_kwargs", None) or {}
+        return StreamingLiteLLM(**kwargs, **llm_kwargs)
+
+    @staticmethod
+    def _make_cache_planner(
+        cache_strategy: str | CacheBreakpointPlanner,
+        token_counter=None,
+    ) -> CacheBreakpointPlanner:
+        """Build the breakpoint planner for the main conversation.
+
+        - "tail": only the last 3 messages (what the LLM client does anyway)
+        - "pinned": additionally pin the system prompt
+        - "rolling": additionally place one breakpoint by token distance
+        """
+        if isinstance(cache_strategy, CacheBreakpointPlanner):
+            return cache_strategy
+        if cache_strategy not in _CACHE_STRATEGIES:
+            raise ValueError(
+                f"Invalid cache_strategy: {cache_strategy!r}. "
+                f"Expected one of {_CACHE_STRATEGIES}."
+            )
+        return CacheBreakpointPlanner(
+            tail_breakpoints=_LLM_TAIL_BREAKPOINTS,
+            pin_system=cache_strategy == "pinned",
+            max_breakpoints=(
+                _LLM_TAIL_BREAKPOINTS
+                if cache_strategy == "tail"
+                else MAX_CACHE_BREAKPOINTS
+            ),
+            token_counter=token_counter,
+        )
+
     def _remove_time_budget_section(self) -> None:
         """Remove TIME BUDGET section when no time limit is provided."""
         lines = self._prompt_template.split("\n")
@@ -82,56 +256,396 @@ class TerminusKIRA(Terminus2):
     ) -> tuple[bool, str]:
         """Reduce unnecessary waiting for fast-finishing commands using completion markers.
 
-        Sends a unique echo marker after each command. If the marker appears
-        in the output, proceeds immediately without waiting the full duration.
-        If duration is exceeded, continues as normal.
+        Sends a unique marker after each command. In "wait_for" mode the marker
+        line also signals a tmux wait-for channel, so the harness wakes up as soon
+        as the shell returns. In "poll" mode the pane is captured until the marker
+        appears. Either way, if duration is exceeded, continues as normal.
+
+        With `pipeline_after_sec` set, a command that is still running after
+        that long is left in flight: the remaining commands are sent right
+        away (they queue behind it) and partial output is returned, so the
+        model can plan while it runs. In-flight commands are tracked by marker
+        and reported as finished once a later marker completes.
+
+        Commands that already ran while the response was streaming are
+        skipped; only the output capture is left for them.
         """
-        for command in commands:
-            self._marker_seq += 1
-            marker = f"{_MARKER_PREFIX}{self._marker_seq}__"
-            start = time.monotonic()
-
-            # Send the command (no keystroke transformation)
-            await session.send_keys(
-                command.keystrokes, block=False, min_timeout_sec=0.0
+        batch, self._streamed_batch = self._streamed_batch or _CommandBatch(), None
+        skip = 0
+        while (
+            skip < min(len(commands), len(batch.executed))
+            and commands[skip].keystrokes == batch.executed[skip]
+        ):
+            skip += 1
+        if skip < len(batch.executed):
+            self.logger.warning(
+                f"[stream] {len(batch.executed) - skip} command(s) ran while "
+                "streaming but are not in the parsed response"
             )
-            # Send marker: runs when the previous command finishes and shell returns
-            await session.send_keys(
-                f"echo '{marker}'\n", block=False, min_timeout_sec=0.0
-            )
-
-            # Poll until marker appears; break out if duration is exceeded
-            await asyncio.sleep(min(0.3, command.duration_sec))
-            while time.monotonic() - start < command.duration_sec:
-                if marker in await session.capture_pane():
-                    break
-                await asyncio.sleep(0.5)
-
-            saved = command.duration_sec - (time.monotonic() - start)
-            if saved > 0.1:
-                self._total_time_saved += saved
-                self.logger.debug(
-                    f"[polling] saved {saved:.1f}s "
-                    f"(duration={command.duration_sec:.1f}s) "
-                    f"cmd={command.keystrokes!r}"
-                )
+        for command in commands[skip:]:
+            await self._run_command(command, session, batch)
 
         # Strip lines containing markers so only the original command output is visible to the LLM
-        output = await session.get_incremental_output()
-        markers = {f"{_MARKER_PREFIX}{seq}__" for seq in range(1, self._marker_seq + 1)}
-        lines = output.split("\n")
-        lines = [l for l in lines if not any(m in l for m in markers)]
-        output = "\n".join(lines)
+        with self._timer.span("capture_output"):
+            self._timer.count("capture_pane")
+            output = strip_marker_lines(await session.get_incremental_output())
+        if self._screen_differ is not None:
+            output = self._screen_differ.render(output)
+        output += self._pipeline_status(batch.finished)
         return False, self._limit_output_length(output)
 
+    async def _run_command(
+        self, command: Command, session: TmuxSession, batch: _CommandBatch
+    ) -> None:
+        """Send one command plus its marker and wait for it to complete."""
+        self._marker_seq += 1
+        marker = f"{_MARKER_PREFIX}{self._marker_seq}__"
+        start = time.monotonic()
+
+        # Send the command (no keystroke transformation)
+        await session.send_keys(command.keystrokes, block=False, min_timeout_sec=0.0)
+        # Send marker: runs when the previous command finishes and shell returns
+        await session.send_keys(
+            self._marker_keystrokes(marker), block=False, min_timeout_sec=0.0
+        )
+        if self._completion_mode == "wait_for":
+            # Until a wait on it succeeds (pipelined, timed out, polled)
+            self._undrained_markers.append(marker)
+
+        if batch.pipelining:
+            # Queued behind a command that is still running
+            self._in_flight[self._marker_seq] = (command.keystrokes, start)
+            return
+
+        # Stretch the wait for commands known to run longer than requested
+        signature = command_signature(command.keystrokes)
+        duration_sec = self._duration_estimator.effective_wait(
+            signature, command.duration_sec
+        )
+        wait_sec = duration_sec
+        if self._pipeline_after_sec is not None:
+            wait_sec = min(wait_sec, self._pipeline_after_sec)
+        with self._timer.span(
+            "command",
+            signature=signature,
+            requested_sec=command.duration_sec,
+            predicted_sec=self._duration_estimator.predict(signature),
+            wait_budget_sec=duration_sec,
+        ) as span_args:
+            completed = await self._wait_for_marker(
+                marker,
+                session,
+                start,
+                wait_sec,
+                poll_interval=self._duration_estimator.poll_interval(signature),
+            )
+            elapsed = time.monotonic() - start
+            span_args["completed"] = completed
+            span_args["actual_sec"] = round(elapsed, 4)
+        self._duration_estimator.record(signature, elapsed, completed)
+        if completed:
+            batch.finished.extend(self._pop_finished(self._marker_seq))
+        elif wait_sec < duration_sec:
+            # Hand control back to the model while the command keeps running
+            self._in_flight[self._marker_seq] = (command.keystrokes, start)
+            batch.pipelining = True
+        else:
+            # Learn its real runtime once a later marker completes
+            self._timed_out[self._marker_seq] = (signature, start)
+
+        saved = duration_sec - (time.monotonic() - start)
+        if saved > 0.1:
+            self._total_time_saved += saved
+            self.logger.debug(
+                f"[{self._completion_mode}] saved {saved:.1f}s "
+                f"(duration={duration_sec:.1f}s) "
+                f"cmd={command.keystrokes!r}"
+            )
+
+    def _pop_finished(self, seq: int) -> list[tuple[str, float]]:
+        """Mark every in-flight command up to marker `seq` as finished.
+
+        Markers complete in order, so a completed marker implies that all
+        commands queued before it have finished too.
+        """
+        for timed_out_seq in [s for s in self._timed_out if s <= seq]:
+            signature, start = self._timed_out.pop(timed_out_seq)
+            self._duration_estimator.record(
+                signature, time.monotonic() - start, completed=True
+            )
+
+        finished = []
+        for in_flight_seq in sorted(self._in_flight):
+            if in_flight_seq > seq:
+                break
+            keystrokes, start = self._in_flight.pop(in_flight_seq)
+            elapsed = time.monotonic() - start
+            self._duration_estimator.record(
+                command_signature(keystrokes), elapsed, completed=True
+            )
+            finished.append((keystrokes, elapsed))
+        return finished
+
+    def _pipeline_status(self, finished: list[tuple[str, float]]) -> str:
+        """Describe pipelined commands that finished or are still running."""
+        lines = []
+        if finished:
+            lines.append("[Pipelined commands finished since last turn]")
+            lines.extend(
+                f"- {keystrokes.strip()!r} (after {elapsed:.0f}s)"
+                for keystrokes, elapsed in finished
+            )
+        if self._in_flight:
+            lines.append(
+                "[Still running — output above is partial. You may plan or send "
+                "follow-up commands now; they run after these finish. To just "
+                "wait, send an empty command with a duration.]"
+            )
+            now = time.monotonic()
+            lines.extend(
+                f"- {keystrokes.strip()!r} (running for {now - start:.0f}s)"
+                for keystrokes, start in self._in_flight.values()
+            )
+        return "\n\n" + "\n".join(lines) if lines else ""
+
+    def _marker_keystrokes(self, marker: str) -> str:
+        """Return the keystrokes that announce completion of the previous command."""
+        if self._completion_mode == "wait_for":
+            # The channel name contains the marker, so the echoed command line
+            # is stripped together with the marker output.
+            return f"echo '{marker}'; tmux wait-for -S {marker}\n"
+        return f"echo '{marker}'\n"
+
+    async def _wait_for_marker(
+        self,
+        marker: str,
+        session: TmuxSession,
+        start: float,
+        duration_sec: float,
+        poll_interval: float = 0.5,
+    ) -> bool:
+        """Wait for the marker, recording or replaying only the outcome.
+
+        Markers differ between runs, so the polls themselves cannot be
+        replayed.
+        """
+        recording = self._recording
+        if recording is not None and recording.replaying:
+            return recording.next(MARKER)
+        if isinstance(session, RecordingSession):
+            session = session.wrapped
+        completed = await self._await_marker(
+            marker, session, start, duration_sec, poll_interval
+        )
+        if recording is not None:
+            recording.record(MARKER, completed)
+        return completed
+
+    async def _await_marker(
+        self,
+        marker: str,
+        session: TmuxSession,
+        start: float,
+        duration_sec: float,
+        poll_interval: float = 0.5,
+    ) -> bool:
+        """Block until the marker command has run or duration_sec has elapsed.
+
+        Returns True if the marker command ran, False on timeout.
+
+        In "wait_for" mode a single `tmux wait-for` exec blocks inside the
+        container until the shell signals the marker channel. tmux remembers
+        signals sent before anyone waits, so there is no race with fast
+        commands. The wake-up latency is one `environment.exec` round trip
+        (for Docker a `docker exec`, typically tens of milliseconds), not
+        the sub-millisecond tmux signal itself, but there is no polling
+        interval and no pane capture per check. If tmux cannot be reached,
+        falls back to polling.
+
+        A marker that timed out is still signalled once its command
+        finishes, and tmux keeps that signal until someone waits for it.
+        Markers complete in order, so after a successful wait the same exec
+        drains the channels of earlier markers nobody waited for.
+        """
+        if self._completion_mode == "wait_for":
+            remaining = duration_sec - (time.monotonic() - start)
+            if remaining <= 0:
+                return False
+            self._timer.count("tmux_wait_for")
+            command = f"timeout {remaining:.3f}s tmux wait-for {marker}"
+            stale = [m for m in self._undrained_markers if m != marker]
+            if stale:
+                # A marker typed into a program reading stdin never signals,
+                # so each drain gets a short timeout of its own
+                drains = "; ".join(f"timeout 1s tmux wait-for {m}" for m in stale)
+                command += f" && {{ {drains}; true; }}"
+            result = await session.environment.exec(command=command)
+            # 0: signalled, 124: timed out (command still running)
+            if result.return_code == 0:
+                self._undrained_markers.clear()
+                return True
+            if result.return_code == 124:
+                return False
+            self.logger.debug(
+                f"[wait_for] tmux wait-for failed (rc={result.return_code}), "
+                f"falling back to polling: {result.stderr or ''}"
+            )
+
+        # Poll until marker appears; break out if duration is exceeded
+        await asyncio.sleep(
+            min(0.3, max(0.0, duration_sec - (time.monotonic() - start)))
+        )
+        while time.monotonic() - start < duration_sec:
+            # Match the echoed output line, not the typed-ahead echo command
+            self._timer.count("capture_pane")
+            pane = await session.capture_pane()
+            if any(line.strip() == marker for line in pane.split("\n")):
+                return True
+            await asyncio.sleep(poll_interval)
+        return False
+
     async def run(self, *args, **kwargs):
         self._total_time_saved = 0.0
-        result = await super().run(*args, **kwargs)
-        self.logger.debug(f"[polling] total time saved: {self._total_time_saved:.1f}s")
+        self._in_flight = {}
+        self._timed_out = {}
+        self._undrained_markers = []
+        self._timings = TimingRecorder()
+        if self._screen_differ is not None:
+            self._screen_differ.reset()
+        self._trajectory_log = self._open_trajectory_log()
+        self._start_recording(*args, **kwargs)
+        try:
+            result = await super().run(*args, **kwargs)
+        finally:
+            if self._pending_token_count is not None:
+                self._pending_token_count.cancel()
+                self._pending_token_count = None
+            if isinstance(self._session, RecordingSession):
+                self._session = self._session.wrapped
+            if self._trajectory_log is not None:
+                # Steps added after the last episode (the base run has
+                # already written the final trajectory.json)
+                self._trajectory_log.flush(self._trajectory_steps)
+            self._export_timings()
+            self._duration_estimator.save()
+            self._record_time_saved(kwargs.get("context", args[2] if len(args) > 2 else None))
+        self.logger.debug(f"[{self._completion_mode}] total time saved: {self._total_time_saved:.1f}s")
         return result
 
+    def _start_recording(self, *args, **kwargs) -> None:
+        """Record the terminal and LLM I/O of this run, or replay a recording.
+
+        Replay swaps in a local stub session, so no container or network is
+        needed. Proactive summarization makes unrecorded LLM calls and is
+        turned off while replaying.
+        """
+        if self._recording is not None and self._recording.replaying:
+            self._session = ReplaySession(self._recording)
+            self._enable_summarize = False
+            return
+        if self._record_path is None:
+            return
+        self._recording = Recording(self._record_path)
+        self._recording.record(
+            META,
+            {
+                "instruction": kwargs.get("instruction", args[0] if args else ""),
+                "model_name": self._model_name,
+            },
+        )
+        if self._session is not None:
+            self._session = RecordingSession(self._session, self._recording)
+
+    def _replayed_llm_response(self, chat: Chat, prompt: str) -> LLMResponse:
+        """Play back the next recorded response as if the chat had made it."""
+        record = self._recording.next(LLM_RESPONSE)
+        response = llm_response_from_dict(record)
+        chat._messages.append({"role": "user", "content": prompt})
+        chat._messages.append({"role": "assistant", "content": response.content})
+        usage = record.get("usage") or {}
+        chat._cumulative_input_tokens += usage.get("prompt_tokens") or 0
+        chat._cumulative_output_tokens += usage.get("completion_tokens") or 0
+        chat._cumulative_cache_tokens += usage.get("cache_tokens") or 0
+        return response
+
+    async def _summarize(
+        self, chat: Chat, original_instruction: str, session: TmuxSession
+    ):
+        """Summarize, then start the screen diff over with a full screen.
+
+        The handoff replaces the history, so the previous screen the differ
+        remembers is no longer in the model's context.
+        """
+        result = await super()._summarize(chat, original_instruction, session)
+        if self._screen_differ is not None:
+            self._screen_differ.reset()
+        return result
+
+    def _count_total_tokens(self, chat: Chat) -> int:
+        """Token count of the conversation from the incremental ledger."""
+        return self._token_ledger.total(chat._messages)
+
+    def _record_time_saved(self, context) -> None:
+        """Expose the harness time saved in the trial result for benchmarking."""
+        if context is None:
+            return
+        context.metadata = {
+            **(context.metadata or {}),
+            "time_saved_sec": round(self._total_time_saved, 3),
+        }
+
+    def _export_timings(self) -> None:
+        """Write per-episode timing spans next to the trajectory."""
+        if not self._export_timings_enabled or not self._timings.episodes:
+            return
+        logs_dir = getattr(self, "logs_dir", None)
+        if logs_dir is None:
+            return
+        try:
+            self._timings.export_jsonl(Path(logs_dir) / "timings.jsonl")
+            self._timings.export_chrome_trace(Path(logs_dir) / "timings.trace.json")
+        except OSError as e:
+            self.logger.debug(f"[timing] failed to export timings: {e}")
+
+    def _open_trajectory_log(self) -> TrajectoryLog | None:
+        logs_dir = getattr(self, "logs_dir", None)
+        if not self._incremental_trajectory or logs_dir is None:
+            return None
+        path = Path(logs_dir) / "trajectory.steps.jsonl"
+        path.unlink(missing_ok=True)
+        return TrajectoryLog(path)
+
+    def _dump_trajectory(self) -> None:
+        with self._timer.span("dump_trajectory"):
+            super()._dump_trajectory()
+
+    def _flush_trajectory(self) -> None:
+        """Persist the steps of the episode that just finished.
+
+        With incremental trajectories the new steps are appended to the step
+        log every episode, and trajectory.json is rewritten only every
+        `trajectory_dump_every` episodes (and by the base class on
+        summarization splits and at the end of the run), so a crashed run
+        still leaves a recent trajectory.json. Otherwise the whole trajectory
+        is rewritten every episode.
+        """
+        if self._trajectory_log is None:
+            self._dump_trajectory()
+            return
+        with self._timer.span("flush_trajectory"):
+            self._trajectory_log.flush(self._trajectory_steps)
+        if self._n_episodes % self._trajectory_dump_every == 0:
+            self._dump_trajectory()
+
     def _limit_output_length(self, output: str, max_bytes: int = 30000) -> str:
-        return super()._limit_output_length(output, max_bytes)
+        with self._timer.span("limit_output", input_bytes=len(output)):
+            # Screen captures are already bounded by the pane size, and the
+            # screen diff numbers lines by their position on the raw screen
+            if self._condense_output and not output.startswith(
+                (SCREEN_PREFIX, DIFF_PREFIX)
+            ):
+                output = condense_output(output, max_bytes)
+            return super()._limit_output_length(output, max_bytes)
 
     @staticmethod
     def name() -> str:
@@ -175,15 +689,30 @@ class TerminusKIRA(Terminus2):
         original_instruction: str = "",
         session: TmuxSession | None = None,
     ) -> tuple[
-        list[Command], bool, str, str, str, LLMResponse, ImageReadRequest | None
+        list[Command], bool, str, str, str, LLMResponse, list[ImageReadRequest]
     ]:
-        """Extended version that also returns image_read request if present."""
-        llm_response = await self._query_llm(
-            chat, prompt, logging_paths, original_instruction, session
-        )
+        """Extended version that also returns image_read requests if present."""
+        self._streamed_batch = None
+        if self._recording is not None and self._recording.replaying:
+            llm_response = self._replayed_llm_response(chat, prompt)
+        else:
+            llm_response = None
+            if self._stream_commands and session is not None:
+                llm_response = await self._query_llm_streaming(
+                    chat, prompt, logging_paths, session
+                )
+            if llm_response is None:
+                llm_response = await self._query_llm(
+                    chat, prompt, logging_paths, original_instruction, session
+                )
+            if self._recording is not None:
+                self._recording.record(
+                    LLM_RESPONSE, llm_response_to_dict(llm_response)
+                )
 
         # Parse the response using the format-specific parser
-        result = self._parser.parse_response(llm_response.content)
+        with self._timer.span("parse"):
+            result = self._parser.parse_response(llm_response.content)
 
         # Collect error/warning feedback for next prompt
         feedback = ""
@@ -198,6 +727,31 @@ class TerminusKIRA(Terminus2):
         if result.warning:
             self.logger.debug(f"Parser warnings: {result.warning}")
 
+        batch = self._streamed_batch
+        if batch is not None and batch.executed and (batch.error or result.error):
+            # Some commands already ran: asking again would run them twice, so
+            # report what ran and let the model continue from their output
+            reason = batch.error or result.error
+            ran = "\n".join(f"- {keystrokes!r}" for keystrokes in batch.executed)
+            feedback = (
+                f"WARNINGS: Your previous response could not be used ({reason}). "
+                f"Only these commands from it were run:\n{ran}\n"
+                "Their output is below."
+            )
+            commands = [
+                Command(keystrokes=keystrokes, duration_sec=0)
+                for keystrokes in batch.executed
+            ]
+            return (
+                commands,
+                False,
+                feedback,
+                result.analysis,
+                result.plan,
+                llm_response,
+                [],
+            )
+
         # Convert ParsedCommands to Commands
         commands = []
         for parsed_cmd in result.commands:
@@ -208,8 +762,8 @@ class TerminusKIRA(Terminus2):
                 )
             )
 
-        # Extract image_read from ImageReadParseResult
-        image_read = getattr(result, "image_read", None)
+        # Extract image_read requests from ImageReadParseResult
+        image_reads = getattr(result, "image_reads", None) or []
 
         return (
             commands,
@@ -218,42 +772,150 @@ class TerminusKIRA(Terminus2):
             result.analysis,
             result.plan,
             llm_response,
-            image_read,
+            image_reads,
         )
 
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
-        retry=retry_if_not_exception_type(BadRequestError),
-    )
-    async def _call_llm_for_image(
+    async def _query_llm_streaming(
         self,
-        messages: list[dict],
-        model: str,
-        temperature: float,
-        max_tokens: int,
-    ) -> object:
-        """Call litellm.acompletion with retry for transient errors.
-
-        Retries on rate limit, network, and server errors.
-        Does NOT retry on BadRequestError (e.g. image too large).
+        chat: Chat,
+        prompt: str,
+        logging_paths: tuple[Path | None, Path | None, Path | None],
+        session: TmuxSession,
+    ) -> LLMResponse | None:
+        """Stream the completion and run each command as soon as it is complete.
+
+        analysis and plan come before commands, so the first commands start
+        while the rest of the response is still being generated. Commands are
+        run in order until the first one that does not decode cleanly. They
+        are remembered in `_streamed_batch` so `_execute_commands` skips them.
+        The request goes through `chat.chat` like any other, so the cache
+        planner and the chat's own accounting apply; only the LLM call streams
+        (see StreamingLiteLLM). Returns None if streaming failed before any
+        command was dispatched, so the caller can fall back to the regular
+        request. A failure after that keeps the partial response and records
+        the error in the batch.
+        """
+        if not isinstance(self._llm, StreamingLiteLLM):
+            return None
+        batch = _CommandBatch()
+        queue: asyncio.Queue[Command | None] = asyncio.Queue()
+        received: list[str] = []
+
+        async def _dispatch() -> None:
+            while (command := await queue.get()) is not None:
+                await self._run_command(command, session, batch)
+                batch.executed.append(command.keystrokes)
+                self._timer.count("streamed_commands")
+
+        dispatcher = asyncio.create_task(_dispatch())
+        scanner = CommandStreamScanner()
+        accepting = True
+        dispatched = 0
+
+        def _on_text(text: str) -> None:
+            nonlocal accepting, dispatched
+            received.append(text)
+            for item in scanner.feed(text):
+                if not accepting:
+                    break
+                keystrokes = item.get("keystrokes") if isinstance(item, dict) else None
+                duration = item.get("duration", 1.0) if keystrokes is not None else None
+                if not isinstance(keystrokes, str) or not isinstance(
+                    duration, (int, float)
+                ):
+                    accepting = False
+                    break
+                queue.put_nowait(
+                    Command(keystrokes=keystrokes, duration_sec=min(duration, 60))
+                )
+                dispatched += 1
+
+        def _on_error(error: Exception) -> bool:
+            # Once commands are under way, asking again would run them twice
+            if not dispatched:
+                return False
+            self.logger.warning(
+                f"[stream] streaming failed after {dispatched} command(s) "
+                f"were dispatched: {error}"
+            )
+            batch.error = f"{type(error).__name__}: {error}"
+            return True
+
+        logging_path, prompt_path, response_path = logging_paths
+        failed = None
+        try:
+            llm_response = await chat.chat(
+                prompt, logging_path=logging_path, on_text=_on_text, on_error=_on_error
+            )
+        except Exception as e:
+            failed = e
+        finally:
+            queue.put_nowait(None)
+            await dispatcher
+            self._streamed_batch = batch
+
+        if failed is not None:
+            if not batch.executed:
+                self.logger.debug(f"[stream] streaming failed, falling back: {failed}")
+                return None
+            # Failed outside the stream itself, so the chat has no record of
+            # the turn; the batch error tells the model what happened
+            self.logger.warning(
+                f"[stream] request failed after {len(batch.executed)} "
+                f"command(s) ran: {failed}"
+            )
+            batch.error = f"{type(failed).__name__}: {failed}"
+            llm_response = LLMResponse(content="".join(received))
+
+        if prompt_path is not None:
+            prompt_path.write_text(prompt)
+        if response_path is not None:
+            response_path.write_text(llm_response.content)
+        return llm_response
+
+    async def _call_llm_for_image(self, content: list[dict]) -> LLMResponse:
+        """Ask the chat's LLM about an image, outside the conversation.
+
+        Goes through the same LLM client as the chat, so the request has the
+        same settings (api_base, llm kwargs, reasoning, prompt caching) and
+        the same retry policy, and it takes a slot from the shared limiter.
         """
-        kwargs = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "drop_params": True,
-        }
         # NOTE: no response_format here — image analysis returns free-form text
-        if hasattr(self, "_reasoning_effort") and self._reasoning_effort:
-            kwargs["reasoning_effort"] = self._reasoning_effort
-        if hasattr(self, "_max_thinking_tokens") and self._max_thinking_tokens:
-            kwargs["thinking"] = {
-                "type": "enabled",
-                "budget_tokens": self._max_thinking_tokens,
-            }
-        return await litellm.acompletion(**kwargs)
+        async with self._llm_limiter.slot():
+            return await self._llm.call(
+                prompt=content, max_tokens=self._llm.get_model_output_limit()
+            )
+
+    async def _download_image(
+        self, file_path: str, local_path: Path, size: int
+    ) -> None:
+        """Copy an image out of the container into local_path.
+
+        Uses the environment's file download API when available, so the raw
+        bytes never pass through exec stdout. Otherwise falls back to reading
+        the file in chunks with `dd | base64`.
+        """
+        environment = self._session.environment
+        try:
+            await environment.download_file(file_path, local_path)
+            return
+        except Exception as e:
+            self.logger.debug(
+                f"[image_read] download_file failed, using chunked exec: {e}"
+            )
+
+        quoted = shlex.quote(file_path)
+        with open(local_path, "wb") as f:
+            for chunk_index in range(max(1, -(-size // _EXEC_CHUNK_BYTES))):
+                result = await environment.exec(
+                    command=(
+                        f"dd if={quoted} bs={_EXEC_CHUNK_BYTES} "
+                        f"skip={chunk_index} count=1 2>/dev/null | base64 -w 0"
+                    )
+                )
+                if result.return_code != 0:
+                    raise RuntimeError(result.stderr or "chunked read failed")
+                f.write(base64.b64decode((result.stdout or "").strip()))
 
     async def _execute_image_read(
         self,
@@ -263,80 +925,222 @@ class TerminusKIRA(Terminus2):
     ) -> str:
         """Execute a file read command to analyze an image file.
 
-        Reads the file from the container via base64, sends it as a multimodal
+        Checks the file size and content hash inside the container first. On a
+        cache miss, copies the file out of the container and prepares it
+        (downscaling or converting it if needed), sends it as a multimodal
         message to the LLM, and returns the analysis result.
         """
         if self._session is None:
             raise RuntimeError("Session is not set")
 
         file_path = image_read.file_path
-
-        # Read image from container as base64 via harbor environment exec
-        result = await self._session.environment.exec(command=f"base64 {file_path}")
-        if result.return_code != 0:
-            error_output = result.stderr or ""
-            return f"ERROR: Failed to read file '{file_path}': {error_output}"
-
-        b64 = (result.stdout or "").replace("\n", "")
+        preparer = self._image_preparer
 
         # Determine MIME type from file extension
         ext = Path(file_path).suffix.lower()
-        mime_map = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        mime = mime_map.get(ext)
-        if mime is None:
+        mime = IMAGE_MIME_TYPES.get(ext)
+        if mime is None and not preparer.can_convert:
             return (
                 f"ERROR: Unsupported image format '{ext}'. "
                 f"Convert to PNG first (e.g. convert image{ext} to image.png), then use `image_read` on the PNG file."
             )
 
+        # Check the size (and hash for the cache) before transferring anything
+        quoted = shlex.quote(file_path)
+        result = await self._session.environment.exec(
+            command=f"stat -L -c %s {quoted} && (sha256sum {quoted} || true)"
+        )
+        if result.return_code != 0:
+            error_output = result.stderr or ""
+            return f"ERROR: Failed to read file '{file_path}': {error_output}"
+        stat_lines = (result.stdout or "").split()
+        size = int(stat_lines[0]) if stat_lines else 0
+        content_hash = stat_lines[1] if len(stat_lines) > 1 else None
+        if size > preparer.max_source_bytes:
+            return (
+                f"ERROR: Image '{file_path}' is {size / (1024 * 1024):.1f}MB, "
+                f"larger than the {preparer.max_source_bytes // (1024 * 1024)}MB "
+                "that can be read. Downscale or compress it first (e.g. to a "
+                "smaller JPEG), then use `image_read` on the smaller file."
+            )
+
+        try:
+            prepared = preparer.get_cached(content_hash)
+            if prepared is None:
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    local_path = Path(tmp_dir) / f"image{ext}"
+                    await self._download_image(file_path, local_path, size)
+                    if content_hash is None:
+                        content_hash = _hash_file(local_path)
+                    prepared = await preparer.prepare(local_path, mime, content_hash)
+        except ImagePreparationError as e:
+            return f"ERROR: Cannot use image '{file_path}': {e}"
+        except Exception as e:
+            return f"ERROR: Failed to read file '{file_path}': {e}"
+
+        if prepared.converted:
+            self.logger.debug(
+                f"[image_read] converted {file_path} "
+                f"({prepared.source_bytes} bytes -> {prepared.mime}, "
+                f"{prepared.encoded_bytes} bytes encoded)"
+            )
+
+        # Reuse an earlier analysis of the same image for the same question
+        cache_key = ImageAnalysisCache.make_key(
+            prepared.content_hash,
+            image_read.image_read_instruction,
+            self._model_name,
+        )
+        cached_text = self._image_analysis_cache.get(cache_key)
+        metric = (
+            "image_cache_hits" if cached_text is not None else "image_cache_misses"
+        )
+        self._episode_metrics[metric] = self._episode_metrics.get(metric, 0) + 1
+        if cached_text is not None:
+            return f"File Read Result for '{file_path}':\n{cached_text}"
+
         # Construct multimodal user message
-        multimodal_messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": image_read.image_read_instruction},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:{mime};base64,{b64}"},
-                    },
-                ],
-            },
+        content = [
+            {"type": "text", "text": image_read.image_read_instruction},
+            {"type": "image_url", "image_url": {"url": prepared.data_url}},
         ]
 
-        messages = add_anthropic_caching(multimodal_messages, self._model_name)
-
-        # Call LLM with retry logic
         try:
-            response = await self._call_llm_for_image(
-                messages=messages,
-                model=self._model_name,
-                temperature=self._temperature,
-                max_tokens=self._llm.get_model_output_limit(),
-            )
+            response = await self._call_llm_for_image(content)
         except Exception as e:
             return f"ERROR: {e}"
 
-        response_text = response["choices"][0]["message"]["content"]
+        response_text = response.content
 
-        # Manually update token counts from litellm response
-        usage = response.get("usage", {})
-        if usage:
-            chat._cumulative_input_tokens += usage.get("prompt_tokens", 0)
-            chat._cumulative_output_tokens += usage.get("completion_tokens", 0)
-            prompt_details = usage.get("prompt_tokens_details")
-            cached = (
-                getattr(prompt_details, "cached_tokens", 0) if prompt_details else 0
-            )
-            chat._cumulative_cache_tokens += cached or 0
+        # The analysis is not part of the conversation, but its tokens and
+        # cost count towards the run
+        usage = response.usage
+        if usage is not None:
+            chat._cumulative_input_tokens += usage.prompt_tokens
+            chat._cumulative_output_tokens += usage.completion_tokens
+            chat._cumulative_cache_tokens += usage.cache_tokens
+            chat._cumulative_cost += usage.cost_usd
+
+        if response_text:
+            self._image_analysis_cache.put(cache_key, response_text)
 
         return f"File Read Result for '{file_path}':\n{response_text}"
 
+    async def _execute_image_reads(
+        self,
+        image_reads: list[ImageReadRequest],
+        chat: Chat,
+        original_instruction: str = "",
+    ) -> str:
+        """Analyze several images concurrently and combine the results.
+
+        At most `max_concurrent_image_reads` images are fetched and analyzed
+        at once. A failure on one image is reported in its own section and
+        does not affect the others.
+        """
+        recording = self._recording
+        if recording is not None and recording.replaying:
+            return recording.next(IMAGE_READS)
+        result = await self._analyze_images(image_reads, chat, original_instruction)
+        if recording is not None:
+            recording.record(IMAGE_READS, result)
+        return result
+
+    async def _analyze_images(
+        self,
+        image_reads: list[ImageReadRequest],
+        chat: Chat,
+        original_instruction: str = "",
+    ) -> str:
+        if len(image_reads) == 1:
+            return await self._execute_image_read(
+                image_reads[0], chat, original_instruction
+            )
+
+        semaphore = asyncio.Semaphore(self._max_concurrent_image_reads)
+
+        async def _read_one(image_read: ImageReadRequest) -> str:
+            async with semaphore:
+                try:
+                    return await self._execute_image_read(
+                        image_read, chat, original_instruction
+                    )
+                except Exception as e:
+                    return f"ERROR: Failed to read file '{image_read.file_path}': {e}"
+
+        results = await asyncio.gather(*(_read_one(r) for r in image_reads))
+        return "\n\n".join(
+            f"[{i}/{len(results)}] {result}" for i, result in enumerate(results, 1)
+        )
+
+    def _wrap_chat(self, chat: Chat) -> None:
+        """Route every chat.chat() call through the run's LLM plumbing.
+
+        Adds the response format, places the cache breakpoints the planner
+        chose (Anthropic models) and records the expected cache metrics,
+        holds a rate limiter slot and times the request. Streamed turns
+        (`on_text=...`, see StreamingLiteLLM) take the same path and also
+        record the time to the first token.
+        """
+        original_chat_fn = chat.chat
+
+        async def _request(prompt, **kwargs):
+            on_text = kwargs.get("on_text")
+            async with self._llm_limiter.slot():
+                if on_text is None:
+                    with self._timer.span("llm_request"):
+                        return await original_chat_fn(prompt, **kwargs)
+
+                with self._timer.span("llm_request", streamed=True) as span_args:
+                    start = time.perf_counter()
+
+                    def _timed_on_text(text: str) -> None:
+                        if "ttft_sec" not in span_args:
+                            ttft = round(time.perf_counter() - start, 4)
+                            span_args["ttft_sec"] = ttft
+                            self._episode_metrics["ttft_sec"] = ttft
+                        on_text(text)
+
+                    kwargs["on_text"] = _timed_on_text
+                    return await original_chat_fn(prompt, **kwargs)
+
+        async def _chat_with_format(prompt, **kwargs):
+            if self._response_format:
+                kwargs.setdefault("response_format", self._response_format)
+            if not is_anthropic_model(self._model_name):
+                return await _request(prompt, **kwargs)
+
+            history = chat._messages
+            plan = self._cache_planner.plan(
+                history + [{"role": "user", "content": prompt}]
+            )
+            self._episode_metrics["expected_cached_tokens"] = (
+                plan.expected_cached_tokens
+            )
+            self._episode_metrics["expected_cache_hit_rate"] = round(
+                plan.expected_hit_rate, 4
+            )
+
+            # The LLM client marks the tail itself; swap in marked copies of the
+            # earlier breakpoints for the duration of this call only.
+            head_indices = [
+                i
+                for i in plan.indices
+                if i < len(history) + 1 - _LLM_TAIL_BREAKPOINTS
+            ]
+            marked = apply_cache_breakpoints(history, head_indices)
+            originals = {i: history[i] for i in head_indices}
+            for i in head_indices:
+                history[i] = marked[i]
+            try:
+                return await _request(prompt, **kwargs)
+            finally:
+                for i, msg in originals.items():
+                    if i < len(history) and history[i] is marked[i]:
+                        history[i] = msg
+
+        chat.chat = _chat_with_format
+
     async def _run_agent_loop(
         self,
         initial_prompt: str,
@@ -363,15 +1167,7 @@ class TerminusKIRA(Terminus2):
             self._response_format = None
             self._llm._temperature = None
 
-        # Wrap chat.chat() to pass response_format and extra headers
-        _original_chat_fn = chat.chat
-
-        async def _chat_with_format(prompt, **kwargs):
-            if self._response_format:
-                kwargs.setdefault("response_format", self._response_format)
-            return await _original_chat_fn(prompt, **kwargs)
-
-        chat.chat = _chat_with_format
+        self._wrap_chat(chat)
 
         self._context.n_input_tokens = 0
         self._context.n_output_tokens = 0
@@ -380,16 +1176,27 @@ class TerminusKIRA(Terminus2):
 
         for episode in range(self._max_episodes):
             self._n_episodes = episode + 1
+            self._episode_metrics = {}
+            self._timer = self._timings.start_episode(episode)
             if not await self._session.is_session_alive():
                 self.logger.debug("Session has ended, breaking out of agent loop")
                 return episode + 1
 
+            pending, self._pending_token_count = self._pending_token_count, None
             if original_instruction and self._enable_summarize:
-                proactive_summary_result = await self._check_proactive_summarization(
-                    chat,
-                    original_instruction,
-                    self._session,
-                )
+                with self._timer.span("summarization_check", overlapped=bool(pending)):
+                    if pending is not None:
+                        await pending
+                    # Runs after the previous commands finished, so a summary
+                    # and handoff see their output; the ledger already holds
+                    # the counts, so this does not tokenize anything again
+                    proactive_summary_result = (
+                        await self._check_proactive_summarization(
+                            chat,
+                            original_instruction,
+                            self._session,
+                        )
+                    )
                 if proactive_summary_result:
                     prompt, subagent_refs = proactive_summary_result
                     self._pending_subagent_refs = subagent_refs
@@ -410,7 +1217,7 @@ class TerminusKIRA(Terminus2):
                 analysis,
                 plan,
                 llm_response,
-                image_read,
+                image_reads,
             ) = await self._handle_llm_interaction(
                 chat, prompt, logging_paths, original_instruction, self._session
             )
@@ -471,10 +1278,11 @@ class TerminusKIRA(Terminus2):
 
             self._record_asciinema_marker(
                 f"Episode {episode}: {len(commands)} commands"
-                + (" (image_read)" if image_read else ""),
+                + (f" ({len(image_reads)} image_read)" if image_reads else ""),
             )
 
             if feedback and "ERROR:" in feedback:
+                self._episode_metrics["timing"] = self._timer.summary()
                 prompt = (
                     f"Previous response had parsing errors:\n{feedback}\n\n"
                     f"Please fix these issues and provide a proper "
@@ -506,31 +1314,48 @@ class TerminusKIRA(Terminus2):
                             prompt_token_ids=llm_response.prompt_token_ids,
                             completion_token_ids=llm_response.completion_token_ids,
                             logprobs=llm_response.logprobs,
+                            extra=self._episode_metrics or None,
                         ),
                     )
                 )
                 continue
 
+            if original_instruction and self._enable_summarize and not is_task_complete:
+                # Tokenize the new messages while the commands run; only the
+                # count overlaps, the check and any summary wait for the output.
+                # The worker thread gets a snapshot of the history, since the
+                # loop keeps appending to chat._messages meanwhile; the ledger
+                # locks its own state against the planner's counts.
+                self._pending_token_count = asyncio.create_task(
+                    asyncio.to_thread(self._token_ledger.total, list(chat._messages))
+                )
+
             # --- Execute action and build tool_calls (divergent) ---
             tool_calls_list: list[ToolCall] = []
-            if image_read is not None:
-                raw_result = await self._execute_image_read(
-                    image_read, chat, original_instruction
-                )
+            if image_reads:
+                with self._timer.span("image_read", images=len(image_reads)):
+                    raw_result = await self._execute_image_reads(
+                        image_reads, chat, original_instruction
+                    )
                 limited_result = raw_result
                 if not self._save_raw_content_in_trajectory:
-                    tool_calls_list.append(
-                        ToolCall(
-                            tool_call_id=f"call_{episode}_image_read",
-                            function_name="image_read",
-                            arguments={
-                                "file_path": image_read.file_path,
-                                "image_read_instruction": (
-                                    image_read.image_read_instruction
+                    for i, image_read in enumerate(image_reads):
+                        tool_calls_list.append(
+                            ToolCall(
+                                tool_call_id=(
+                                    f"call_{episode}_image_read"
+                                    if len(image_reads) == 1
+                                    else f"call_{episode}_image_read_{i + 1}"
                                 ),
-                            },
+                                function_name="image_read",
+                                arguments={
+                                    "file_path": image_read.file_path,
+                                    "image_read_instruction": (
+                                        image_read.image_read_instruction
+                                    ),
+                                },
+                            )
                         )
-                    )
             else:
                 timeout_occurred, raw_result = await self._execute_commands(
                     commands, self._session,
@@ -581,6 +1406,7 @@ class TerminusKIRA(Terminus2):
                 )
 
             # --- Record trajectory step (common) ---
+            self._episode_metrics["timing"] = self._timer.summary()
             cache_tokens_used = chat.total_cache_tokens - tokens_before_cache
             step_cost = chat.total_cost - cost_before
 
@@ -608,10 +1434,11 @@ class TerminusKIRA(Terminus2):
                         prompt_token_ids=llm_response.prompt_token_ids,
                         completion_token_ids=llm_response.completion_token_ids,
                         logprobs=llm_response.logprobs,
+                        extra=self._episode_metrics or None,
                     ),
                 )
             )
-            self._dump_trajectory()
+            self._flush_trajectory()
 
             if is_task_complete and was_pending_completion:
                 return episode + 1
@@ -0,0 +1,91 @@
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+
+class EpisodeTimer:
+    """Timing spans and counters collected during one agent episode."""
+
+    def __init__(self, episode: int):
+        self.episode = episode
+        self.spans: list[dict[str, Any]] = []
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[dict[str, Any]]:
+        """Time a block. Extra fields can be added to the yielded args dict."""
+        start_wall = time.time()
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.spans.append(
+                {
+                    "name": name,
+                    "start": start_wall,
+                    "duration_sec": time.perf_counter() - start,
+                    "args": args,
+                }
+            )
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self) -> dict[str, Any]:
+        """Total seconds per span name plus counters, for the trajectory step."""
+        totals: dict[str, float] = {}
+        for span in self.spans:
+            totals[span["name"]] = totals.get(span["name"], 0.0) + span["duration_sec"]
+        summary: dict[str, Any] = {
+            f"{name}_sec": round(total, 4) for name, total in totals.items()
+        }
+        commands = [s["args"] for s in self.spans if s["name"] == "command"]
+        if commands:
+            summary["commands"] = [dict(c) for c in commands]
+        summary.update(self.counters)
+        return summary
+
+
+class TimingRecorder:
+    """Keeps the timers of a run and exports them as JSONL or a Chrome trace."""
+
+    def __init__(self):
+        self.episodes: list[EpisodeTimer] = []
+
+    def start_episode(self, episode: int) -> EpisodeTimer:
+        timer = EpisodeTimer(episode)
+        self.episodes.append(timer)
+        return timer
+
+    def export_jsonl(self, path: Path) -> None:
+        """One line per episode with its summary and raw spans."""
+        with open(path, "w") as f:
+            for timer in self.episodes:
+                record = {
+                    "episode": timer.episode,
+                    "summary": timer.summary(),
+                    "spans": timer.spans,
+                }
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def export_chrome_trace(self, path: Path) -> None:
+        """Write a trace viewable in chrome://tracing or Perfetto."""
+        events = []
+        for timer in self.episodes:
+            for span in timer.spans:
+                events.append(
+                    {
+                        "name": span["name"],
+                        "cat": "terminus-kira",
+                        "ph": "X",
+                        "ts": int(span["start"] * 1_000_000),
+                        "dur": int(span["duration_sec"] * 1_000_000),
+                        "pid": 1,
+                        "tid": 1,
+                        "args": {"episode": timer.episode, **span["args"]},
+                    }
+                )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events}, f, default=str)
@@ -0,0 +1,78 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import litellm
+
+from anthropic_caching import estimate_message_tokens
+
+
+def _message_key(msg: Any) -> tuple[str, str]:
+    role = msg.get("role") if isinstance(msg, dict) else getattr(msg, "role", None)
+    content = (
+        msg.get("content") if isinstance(msg, dict) else getattr(msg, "content", None)
+    )
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    return role or "", content
+
+
+class TokenLedger:
+    """Running token count of a conversation, updated as messages are appended.
+
+    `total` compares the message list with the one it saw last time by
+    identity, so an append only tokenizes the new messages and a rewritten
+    history (summarization) recounts from the first changed message. Counts
+    are also cached per message content, so copies of a message (e.g. with a
+    cache_control marker added) and repeated prompts are not tokenized again.
+    Each message is counted on its own, which slightly overestimates the
+    total; that errs on the side of summarizing early.
+
+    Safe to call from a worker thread: `total` keeps its own copy of the
+    list it was given, and a lock guards the cache and the running counts.
+    """
+
+    def __init__(self, model_name: str, max_cached: int = 4096):
+        self.model_name = model_name
+        self.max_cached = max_cached
+        self._cache: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._messages: list[Any] = []
+        # _prefix[i] is the token count of messages[:i + 1]
+        self._prefix: list[int] = []
+        self._lock = threading.RLock()
+
+    def count_message(self, msg: Any) -> int:
+        key = _message_key(msg)
+        with self._lock:
+            count = self._cache.get(key)
+            if count is not None:
+                self._cache.move_to_end(key)
+                return count
+        try:
+            count = litellm.token_counter(model=self.model_name, messages=[msg])
+        except Exception:
+            count = estimate_message_tokens(msg)
+        with self._lock:
+            self._cache[key] = count
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return count
+
+    def total(self, messages: list[Any]) -> int:
+        with self._lock:
+            return self._total(list(messages))
+
+    def _total(self, messages: list[Any]) -> int:
+        unchanged = 0
+        limit = min(len(messages), len(self._messages))
+        while unchanged < limit and messages[unchanged] is self._messages[unchanged]:
+            unchanged += 1
+
+        del self._prefix[unchanged:]
+        running = self._prefix[-1] if self._prefix else 0
+        for msg in messages[unchanged:]:
+            running += self.count_message(msg)
+            self._prefix.append(running)
+        self._messages = messages
+        return running
@@ -0,0 +1,68 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from harbor.models.trajectories import Step
+
+
+class TrajectoryLog:
+    """Append-only JSONL log of trajectory steps.
+
+    Each flush writes only the steps added since the previous flush and
+    fsyncs the file, so the cost per episode is proportional to the new step
+    rather than the whole trajectory. Every line is a complete JSON object,
+    so a crash can at worst leave one truncated final line, which
+    `read_steps` skips.
+
+    When the last flushed step is no longer at its position in the step
+    list (the trajectory was split on summarization and rebuilt, whatever
+    its new length), a new segment starts; each line records the segment it
+    belongs to.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._flushed = 0
+        # The last step written, compared by identity to detect a new segment
+        self._last_step: Step | None = None
+        self._segment = 0
+
+    def flush(self, steps: list[Step]) -> int:
+        """Append steps that have not been written yet. Returns how many."""
+        if self._flushed and (
+            len(steps) < self._flushed
+            or steps[self._flushed - 1] is not self._last_step
+        ):
+            self._segment += 1
+            self._flushed = 0
+        new_steps = steps[self._flushed :]
+        if not new_steps:
+            return 0
+
+        lines = []
+        for step in new_steps:
+            record = step.model_dump(mode="json", exclude_none=True)
+            record["segment"] = self._segment
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._flushed = len(steps)
+        self._last_step = steps[-1]
+        return len(new_steps)
+
+    @staticmethod
+    def read_steps(path: Path) -> list[dict[str, Any]]:
+        """Read all complete step records, ignoring a truncated last line."""
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return records
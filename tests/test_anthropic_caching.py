@@ -0,0 +1,67 @@
+from anthropic_caching import (
+    CacheBreakpointPlanner,
+    add_anthropic_caching,
+    apply_cache_breakpoints,
+)
+
+
+def message(role, tokens):
+    # estimate_message_tokens counts 4 characters per token plus 4
+    return {"role": role, "content": "x" * (4 * (tokens - 4))}
+
+
+def conversation(n, tokens=600):
+    return [message("system", 2000)] + [
+        message("user" if i % 2 == 0 else "assistant", tokens) for i in range(n)
+    ]
+
+
+def has_breakpoint(msg):
+    return isinstance(msg["content"], list) and "cache_control" in msg["content"][0]
+
+
+def test_tail_strategy_marks_last_messages():
+    plan = CacheBreakpointPlanner(tail_breakpoints=3, max_breakpoints=3).plan(
+        conversation(6)
+    )
+    assert plan.indices == [4, 5, 6]
+
+
+def test_pinned_strategy_marks_system_prompt():
+    plan = CacheBreakpointPlanner(pin_system=True, max_breakpoints=4).plan(
+        conversation(6)
+    )
+    assert plan.indices == [0, 4, 5, 6]
+
+
+def test_rolling_breakpoint_needs_token_distance():
+    planner = CacheBreakpointPlanner(min_token_distance=1000)
+    plan = planner.plan(conversation(8))
+    # Two 600-token messages back from the tail reach the distance
+    assert plan.indices == [4, 6, 7, 8]
+
+
+def test_expected_cache_hit_from_previous_plan():
+    planner = CacheBreakpointPlanner(tail_breakpoints=3, max_breakpoints=3)
+    messages = conversation(6)
+    first = planner.plan(messages)
+    assert first.expected_cached_tokens == 0
+
+    second = planner.plan(messages + [message("user", 600), message("assistant", 600)])
+    assert second.expected_cached_tokens == first.prefix_tokens[6]
+    assert 0 < second.expected_hit_rate < 1
+
+
+def test_apply_cache_breakpoints_does_not_modify_input():
+    messages = conversation(3)
+    marked = apply_cache_breakpoints(messages, [0, 3])
+    assert has_breakpoint(marked[0]) and has_breakpoint(marked[3])
+    assert marked[1] is messages[1]
+    assert all(isinstance(m["content"], str) for m in messages)
+
+
+def test_add_anthropic_caching_only_for_anthropic_models():
+    messages = conversation(4)
+    assert add_anthropic_caching(messages, "openai/gpt-4o") is messages
+    marked = add_anthropic_caching(messages, "anthropic/claude-opus-4")
+    assert [has_breakpoint(m) for m in marked] == [False, False, True, True, True]
@@ -0,0 +1,52 @@
+from terminus_kira.command_stream import CommandStreamScanner
+
+RESPONSE = (
+    '{"analysis": "look {around}", "plan": "run [it]", "commands": ['
+    '{"keystrokes": "ls -la\\n", "duration": 0.1}, '
+    '{"keystrokes": "echo \\"}\\"\\n", "duration": 1}'
+    '], "task_complete": false}'
+)
+
+
+def feed_in_chunks(scanner, text, size):
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(scanner.feed(text[i : i + size]))
+    return items
+
+
+def test_commands_are_returned_when_complete():
+    scanner = CommandStreamScanner()
+    assert scanner.feed(RESPONSE) == [
+        {"keystrokes": "ls -la\n", "duration": 0.1},
+        {"keystrokes": 'echo "}"\n', "duration": 1},
+    ]
+    assert scanner.done
+
+
+def test_chunk_boundaries_do_not_matter():
+    expected = CommandStreamScanner().feed(RESPONSE)
+    for size in (1, 3, 7):
+        assert feed_in_chunks(CommandStreamScanner(), RESPONSE, size) == expected
+
+
+def test_item_is_emitted_as_soon_as_it_closes():
+    scanner = CommandStreamScanner()
+    head = RESPONSE.index("}, ") + 1
+    assert scanner.feed(RESPONSE[:head]) == [
+        {"keystrokes": "ls -la\n", "duration": 0.1}
+    ]
+    assert not scanner.done
+
+
+def test_text_before_object_and_nested_commands_key_are_ignored():
+    scanner = CommandStreamScanner()
+    text = (
+        'Sure:\n{"plan": {"commands": [{"x": 1}]}, "commands": [{"keystrokes": "a"}]}'
+    )
+    assert scanner.feed(text) == [{"keystrokes": "a"}]
+
+
+def test_undecodable_item_is_none():
+    scanner = CommandStreamScanner()
+    assert scanner.feed('{"commands": [{"keystrokes": bad}]}') == [None]
@@ -0,0 +1,79 @@
+import pytest
+
+from terminus_kira.duration_estimator import DurationEstimator, command_signature
+
+
+@pytest.mark.parametrize(
+    ("keystrokes", "signature"),
+    [
+        ("python3 /app/train.py --epochs 5\n", "python3 train.py"),
+        ("python3 train.py\n", "python3 train.py"),
+        ("cd /app && make -j8 build\n", "make build"),
+        ("sudo FOO=1 nice pytest -x tests/\n", "pytest tests"),
+        ("cd /app && cd /app\n", "cd app"),
+        ("ls\n", "ls"),
+        ("wget https://x/file-v2.tar.gz\n", "wget file-vN.tar.gz"),
+        ("grep 'a|b' f.txt\n", "grep a|b"),
+        ('echo "x; y" && make all\n', "make all"),
+        ('echo "x && y"\n', "echo x && y"),
+        ("make build 2>&1 | tee build.log\n", "make build"),
+        ("(cd /app && pytest > out.txt)\n", "pytest"),
+        ("python3 'unterminated\n", "python3 'unterminated"),
+        ("C-c", None),
+        ("q", None),
+        ("", None),
+    ],
+)
+def test_command_signature(keystrokes, signature):
+    assert command_signature(keystrokes) == signature
+
+
+def test_unknown_command_waits_as_requested():
+    estimator = DurationEstimator()
+    assert estimator.predict("make build") is None
+    assert estimator.effective_wait("make build", 5.0) == 5.0
+    assert estimator.poll_interval("make build") == 0.5
+
+
+def test_wait_is_extended_for_known_slow_commands():
+    estimator = DurationEstimator(headroom=1.5, max_wait_sec=60)
+    estimator.record("make build", 20.0, completed=True)
+    assert estimator.predict("make build") == 20.0
+    assert estimator.effective_wait("make build", 5.0) == 30.0
+    assert estimator.effective_wait("make build", 45.0) == 45.0
+
+    estimator.record("make build", 100.0, completed=True)
+    assert estimator.effective_wait("make build", 5.0) == 60.0
+
+
+def test_fast_commands_poll_faster():
+    estimator = DurationEstimator()
+    estimator.record("ls", 0.1, completed=True)
+    assert estimator.poll_interval("ls") == 0.05
+
+
+def test_timeouts_do_not_change_the_mean():
+    estimator = DurationEstimator()
+    estimator.record("server", 60.0, completed=False)
+    assert estimator.predict("server") is None
+
+
+def test_mean_is_exponentially_weighted():
+    estimator = DurationEstimator(alpha=0.5)
+    estimator.record("make", 10.0, completed=True)
+    estimator.record("make", 20.0, completed=True)
+    assert estimator.predict("make") == 15.0
+
+
+def test_stats_round_trip(tmp_path):
+    path = tmp_path / "durations.json"
+    estimator = DurationEstimator(path=path)
+    estimator.record("make build", 12.0, completed=True)
+    estimator.save()
+    assert DurationEstimator(path=path).predict("make build") == 12.0
+
+
+def test_corrupt_stats_file_is_ignored(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text("{not json")
+    assert DurationEstimator(path=path).predict("make build") is None
@@ -0,0 +1,41 @@
+from terminus_kira.image_analysis_cache import ImageAnalysisCache
+
+
+def test_key_ignores_trivial_instruction_rewording():
+    a = ImageAnalysisCache.make_key("hash", "Describe the chart.", "model")
+    b = ImageAnalysisCache.make_key("hash", "  describe   the chart ", "model")
+    assert a == b
+    assert a != ImageAnalysisCache.make_key("hash", "Describe the chart", "other")
+    assert a != ImageAnalysisCache.make_key("other", "Describe the chart", "model")
+
+
+def test_get_and_put():
+    cache = ImageAnalysisCache()
+    assert cache.get("k") is None
+    cache.put("k", "a chart")
+    assert cache.get("k") == "a chart"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("terminus_kira.image_analysis_cache.time.time", lambda: now[0])
+    cache = ImageAnalysisCache(ttl_sec=10)
+    cache.put("k", "a chart")
+    now[0] += 11
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ImageAnalysisCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+
+def test_entries_persist_in_cache_dir(tmp_path):
+    ImageAnalysisCache(cache_dir=tmp_path).put("k", "a chart")
+    assert ImageAnalysisCache(cache_dir=tmp_path).get("k") == "a chart"
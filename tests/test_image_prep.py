@@ -0,0 +1,72 @@
+import asyncio
+import base64
+import io
+
+import pytest
+
+from terminus_kira.image_prep import (
+    ImagePreparationError,
+    ImagePreparer,
+    encode_data_url,
+    encoded_size,
+)
+
+
+def test_encode_data_url_matches_one_shot_encoding(tmp_path):
+    path = tmp_path / "image.png"
+    data = bytes(range(256)) * 4000  # spans several encode blocks
+    path.write_bytes(data)
+    assert encode_data_url(path, "image/png") == (
+        "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+    )
+
+
+def test_encoded_size():
+    for n in range(10):
+        assert encoded_size(n) == len(base64.b64encode(b"x" * n))
+
+
+def prepare(preparer, path, mime, content_hash):
+    return asyncio.run(preparer.prepare(path, mime, content_hash))
+
+
+def test_cache_is_bounded_by_total_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr("terminus_kira.image_prep.Image", None)
+    preparer = ImagePreparer(cache_bytes=2 * encoded_size(3000))
+    for name in "abc":
+        path = tmp_path / f"{name}.png"
+        path.write_bytes(name.encode() * 3000)
+        prepare(preparer, path, "image/png", name)
+
+    assert preparer.get_cached("a") is None
+    assert preparer.get_cached("b") is not None
+    assert preparer.get_cached("c") is not None
+
+
+def test_oversized_image_without_pillow_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr("terminus_kira.image_prep.Image", None)
+    path = tmp_path / "big.png"
+    path.write_bytes(b"x" * 3000)
+    with pytest.raises(ImagePreparationError, match="larger than"):
+        prepare(ImagePreparer(max_encoded_bytes=1000), path, "image/png", "h")
+
+
+def test_large_image_is_downscaled(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "big.bmp"
+    Image.new("RGB", (2000, 1500), "red").save(path)
+
+    prepared = prepare(ImagePreparer(pixel_budget=100 * 100), path, None, "h")
+    assert prepared.converted and prepared.mime == "image/png"
+    data = base64.b64decode(prepared.data_url.split(",", 1)[1])
+    with Image.open(io.BytesIO(data)) as img:
+        assert img.width * img.height <= 100 * 100
+
+
+def test_conversion_past_deadline_times_out(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "big.bmp"
+    Image.new("RGB", (2000, 1500), "red").save(path)
+
+    with pytest.raises(ImagePreparationError, match="took longer"):
+        prepare(ImagePreparer(pixel_budget=100 * 100, timeout_sec=0), path, None, "h")
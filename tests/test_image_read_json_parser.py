@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from terminus_kira.image_read_json_parser import (
+    MAX_IMAGE_READS,
+    ImageReadJSONParser,
+    ImageReadRequest,
+)
+
+
+def image(i: int) -> dict:
+    return {"file_path": f"/app/img{i}.png", "image_read_instruction": f"read {i}"}
+
+
+def respond(image_read) -> str:
+    return json.dumps(
+        {"analysis": "a", "plan": "p", "image_read": image_read, "task_complete": False}
+    )
+
+
+def parse(response: str):
+    return ImageReadJSONParser()._try_parse_response(response)
+
+
+def test_single_object_image_read():
+    result = parse(respond(image(0)))
+
+    assert result.error == ""
+    assert result.image_read == ImageReadRequest("/app/img0.png", "read 0")
+    assert result.image_reads == [result.image_read]
+    assert result.commands == []
+
+
+def test_array_image_read_keeps_order():
+    result = parse(respond([image(0), image(1), image(2)]))
+
+    assert result.error == ""
+    assert [r.file_path for r in result.image_reads] == [
+        "/app/img0.png",
+        "/app/img1.png",
+        "/app/img2.png",
+    ]
+    assert result.image_read == result.image_reads[0]
+
+
+def test_array_at_limit_is_accepted():
+    result = parse(respond([image(i) for i in range(MAX_IMAGE_READS)]))
+
+    assert result.error == ""
+    assert len(result.image_reads) == MAX_IMAGE_READS
+
+
+def test_array_over_limit_is_rejected():
+    result = parse(respond([image(i) for i in range(MAX_IMAGE_READS + 1)]))
+
+    assert f"at most {MAX_IMAGE_READS}" in result.error
+    assert result.image_reads == []
+
+
+def test_empty_array_is_rejected():
+    result = parse(respond([]))
+
+    assert "must not be an empty array" in result.error
+
+
+@pytest.mark.parametrize(
+    "entry, message",
+    [
+        ("/app/img.png", "must be an object or an array of objects"),
+        ({"image_read_instruction": "x"}, "missing required 'file_path'"),
+        ({"file_path": 3, "image_read_instruction": "x"}, "file_path' must be"),
+        ({"file_path": "/app/img.png"}, "missing required 'image_read_instruction'"),
+    ],
+)
+def test_invalid_entry_is_rejected(entry, message):
+    single = parse(respond(entry))
+    in_array = parse(respond([image(0), entry]))
+
+    assert message in single.error
+    assert message in in_array.error
+    assert in_array.image_reads == []
+
+
+def test_commands_and_image_read_are_exclusive():
+    response = json.dumps(
+        {"analysis": "a", "plan": "p", "commands": [], "image_read": image(0)}
+    )
+
+    assert "mutually exclusive" in parse(response).error
+
+
+def test_field_order_warning():
+    response = json.dumps({"plan": "p", "analysis": "a", "image_read": image(0)})
+    result = parse(response)
+
+    assert result.error == ""
+    assert "wrong order" in result.warning
@@ -0,0 +1,35 @@
+from terminus_kira.output_condenser import condense_output
+
+
+def test_small_output_is_unchanged():
+    text = "line 1\nline 2\nline 3"
+    assert condense_output(text, max_bytes=1000) == text
+
+
+def test_carriage_return_progress_keeps_final_state():
+    text = "downloading\r10%\r50%\r100%\ndone"
+    assert condense_output(text) == "100%\ndone"
+
+
+def test_repeated_lines_are_collapsed():
+    text = "\n".join(["start"] + ["same"] * 10 + ["end"])
+    assert condense_output(text) == (
+        "start\nsame\n[previous line repeated 9 more times]\nend"
+    )
+
+
+def test_short_runs_are_kept():
+    text = "a\na\na\nb"
+    assert condense_output(text, min_repeat=3) == text
+
+
+def test_large_output_keeps_head_tail_and_errors():
+    lines = [f"compiling module {i:04d}" for i in range(2000)]
+    lines[1000] = "error: undefined reference to `main'"
+    out = condense_output("\n".join(lines), max_bytes=2000)
+
+    assert len(out.encode()) <= 2000
+    assert out.startswith("compiling module 0000")
+    assert out.endswith("compiling module 1999")
+    assert "error: undefined reference to `main'" in out
+    assert "lines elided ..." in out
@@ -0,0 +1,56 @@
+from terminus_kira.screen_diff import DIFF_PREFIX, SCREEN_PREFIX, ScreenDiffer
+
+
+def screen(lines):
+    return SCREEN_PREFIX + "\n".join(lines)
+
+
+BASE = [f"row {i} " + "x" * 40 for i in range(20)]
+
+
+def test_first_screen_is_sent_in_full():
+    differ = ScreenDiffer()
+    assert differ.render(screen(BASE)) == screen(BASE)
+
+
+def test_changed_lines_are_numbered_from_the_top():
+    differ = ScreenDiffer()
+    differ.render(screen(BASE))
+    changed = list(BASE)
+    changed[4] = "edited"
+    assert differ.render(screen(changed)) == DIFF_PREFIX + " 5| edited"
+
+
+def test_unchanged_screen():
+    differ = ScreenDiffer()
+    differ.render(screen(BASE))
+    assert differ.render(screen(BASE)) == DIFF_PREFIX + "(no changes)"
+
+
+def test_large_change_sends_full_screen():
+    differ = ScreenDiffer()
+    differ.render(screen(BASE))
+    changed = [line.upper() for line in BASE]
+    assert differ.render(screen(changed)) == screen(changed)
+
+
+def test_full_screen_after_refresh_every_diffs():
+    differ = ScreenDiffer(refresh_every=2)
+    differ.render(screen(BASE))
+    assert differ.render(screen(BASE)).startswith(DIFF_PREFIX)
+    assert differ.render(screen(BASE)).startswith(DIFF_PREFIX)
+    assert differ.render(screen(BASE)) == screen(BASE)
+
+
+def test_scrolling_output_resets():
+    differ = ScreenDiffer()
+    differ.render(screen(BASE))
+    assert differ.render("plain output") == "plain output"
+    assert differ.render(screen(BASE)) == screen(BASE)
+
+
+def test_reset_sends_full_screen_again():
+    differ = ScreenDiffer()
+    differ.render(screen(BASE))
+    differ.reset()
+    assert differ.render(screen(BASE)) == screen(BASE)
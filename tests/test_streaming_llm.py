@@ -0,0 +1,178 @@
+import asyncio
+import logging
+
+import litellm
+import pytest
+from harbor.llms.chat import Chat
+from litellm.types.utils import (
+    Choices,
+    Delta,
+    Message,
+    ModelResponse,
+    ModelResponseStream,
+    StreamingChoices,
+    Usage,
+)
+
+from terminus_kira.llm_limiter import LLMRateLimiter
+from terminus_kira.streaming_llm import StreamingLiteLLM
+from terminus_kira.terminus_kira import TerminusKIRA
+from terminus_kira.timing import EpisodeTimer
+
+MODEL = "anthropic/claude-sonnet-4-5-20250929"
+PIECES = ['{"analysis": "a", "plan": "p", ', '"commands": []}']
+USAGE = {"prompt_tokens": 1200, "completion_tokens": 20}
+
+
+def fake_acompletion(calls, fail_after=None):
+    async def stream():
+        for i, piece in enumerate(PIECES):
+            if i == fail_after:
+                raise ConnectionError("stream dropped")
+            yield ModelResponseStream(
+                model=MODEL, choices=[StreamingChoices(delta=Delta(content=piece))]
+            )
+        yield ModelResponseStream(
+            model=MODEL,
+            choices=[StreamingChoices(delta=Delta(), finish_reason="stop")],
+        )
+        yield ModelResponseStream(model=MODEL, choices=[], usage=Usage(**USAGE))
+
+    async def acompletion(**kwargs):
+        calls.append(kwargs)
+        if kwargs.get("stream"):
+            return stream()
+        return ModelResponse(
+            model=MODEL,
+            choices=[
+                Choices(
+                    message=Message(role="assistant", content="".join(PIECES)),
+                    finish_reason="stop",
+                )
+            ],
+            usage=Usage(**USAGE),
+        )
+
+    return acompletion
+
+
+def make_agent():
+    agent = TerminusKIRA.__new__(TerminusKIRA)
+    agent.logger = logging.getLogger("test")
+    agent._model_name = MODEL
+    agent._response_format = {"type": "json_object"}
+    agent._cache_planner = TerminusKIRA._make_cache_planner(
+        "pinned", token_counter=lambda msg: 2000
+    )
+    agent._episode_metrics = {}
+    agent._llm_limiter = LLMRateLimiter()
+    agent._timer = EpisodeTimer(episode=0)
+    return agent
+
+
+def make_chat(agent):
+    chat = Chat(StreamingLiteLLM(model_name=MODEL, temperature=0.7))
+    chat._messages.extend(
+        [
+            {"role": "system", "content": "system prompt"},
+            {"role": "user", "content": "Begin."},
+            {"role": "assistant", "content": "first reply"},
+        ]
+    )
+    agent._wrap_chat(chat)
+    return chat
+
+
+def chat_state(chat):
+    return (
+        chat.messages,
+        chat.total_input_tokens,
+        chat.total_output_tokens,
+        chat.total_cache_tokens,
+        chat.total_cost,
+    )
+
+
+def test_streamed_and_regular_turns_leave_the_same_state(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion(calls))
+
+    regular_agent = make_agent()
+    regular_chat = make_chat(regular_agent)
+    regular = asyncio.run(regular_chat.chat("next prompt"))
+
+    streamed_agent = make_agent()
+    streamed_chat = make_chat(streamed_agent)
+    received = []
+    streamed = asyncio.run(streamed_chat.chat("next prompt", on_text=received.append))
+
+    assert received == PIECES
+    assert streamed.content == regular.content
+    assert streamed.usage == regular.usage
+    assert chat_state(streamed_chat) == chat_state(regular_chat)
+    assert streamed_chat.total_cost > 0
+
+    # Same request apart from streaming, including the planner's breakpoints
+    regular_call, streamed_call = calls
+    assert streamed_call.pop("stream") is True
+    assert streamed_call.pop("stream_options") == {"include_usage": True}
+    for kwargs in (regular_call, streamed_call):
+        kwargs.pop("logger_fn")
+        kwargs.pop("previous_response_id", None)
+    assert streamed_call == regular_call
+    system = streamed_call["messages"][0]["content"][0]
+    assert system["cache_control"] == {"type": "ephemeral"}
+
+    ttft = streamed_agent._episode_metrics.pop("ttft_sec")
+    assert ttft >= 0
+    assert streamed_agent._episode_metrics == regular_agent._episode_metrics
+    assert "expected_cached_tokens" in regular_agent._episode_metrics
+
+
+def test_partial_stream_is_kept_when_the_caller_asks(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion(calls, fail_after=1))
+    chat = make_chat(make_agent())
+    errors = []
+
+    def on_error(error):
+        errors.append(error)
+        return True
+
+    response = asyncio.run(
+        chat.chat("next prompt", on_text=lambda text: None, on_error=on_error)
+    )
+
+    assert response.content == PIECES[0]
+    assert response.usage is None
+    assert [type(e) for e in errors] == [ConnectionError]
+    assert chat.messages[-1] == {"role": "assistant", "content": PIECES[0]}
+
+
+def test_stream_failure_is_raised_when_the_caller_declines(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellm, "acompletion", fake_acompletion(calls, fail_after=1))
+    chat = make_chat(make_agent())
+    history = list(chat.messages)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            chat.chat(
+                "next prompt", on_text=lambda text: None, on_error=lambda e: False
+            )
+        )
+    assert chat.messages == history
+
+
+def test_agent_builds_the_streaming_llm_with_its_settings(tmp_path):
+    agent = TerminusKIRA(
+        logs_dir=tmp_path,
+        model_name=MODEL,
+        api_base="http://llm.local",
+        llm_kwargs={"timeout": 30},
+    )
+
+    assert isinstance(agent._llm, StreamingLiteLLM)
+    kwargs = agent._llm._build_base_kwargs()
+    assert kwargs["api_base"] == "http://llm.local"
+    assert kwargs["timeout"] == 30
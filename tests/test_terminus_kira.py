@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+
+from harbor.agents.terminus_2.terminus_2 import Terminus2
+from harbor.llms.base import LLMResponse
+from harbor.models.trajectories import Step
+
+from terminus_kira.llm_limiter import LLMRateLimiter
+from terminus_kira.terminus_kira import (
+    _MARKER_PREFIX,
+    TerminusKIRA,
+    strip_marker_lines,
+)
+from terminus_kira.timing import EpisodeTimer
+from terminus_kira.trajectory_log import TrajectoryLog
+
+
+def test_strip_marker_lines_removes_marker_lines_only():
+    output = "\n".join(
+        [
+            "$ make",
+            f"$ echo '{_MARKER_PREFIX}12__'; tmux wait-for -S {_MARKER_PREFIX}12__",
+            "built",
+            f"{_MARKER_PREFIX}12__",
+            f"{_MARKER_PREFIX}3__",
+            "$ ",
+        ]
+    )
+    assert strip_marker_lines(output) == "$ make\nbuilt\n$ "
+
+
+def test_strip_marker_lines_keeps_similar_text():
+    output = f"{_MARKER_PREFIX}x__\n{_MARKER_PREFIX}"
+    assert strip_marker_lines(output) == output
+    assert strip_marker_lines("plain") == "plain"
+
+
+class FakeExecResult:
+    def __init__(self, return_code, stdout="", stderr=""):
+        self.return_code = return_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class FakeEnvironment:
+    def __init__(self, return_codes):
+        self.return_codes = list(return_codes)
+        self.commands = []
+
+    async def exec(self, command):
+        self.commands.append(command)
+        return FakeExecResult(self.return_codes.pop(0), stderr="no server")
+
+
+class FakeSession:
+    def __init__(self, return_codes=(), panes=()):
+        self.environment = FakeEnvironment(return_codes)
+        self.panes = list(panes)
+        self.sent = []
+
+    async def send_keys(self, keys, block=False, min_timeout_sec=0.0):
+        self.sent.append(keys)
+
+    async def capture_pane(self):
+        return self.panes.pop(0) if self.panes else ""
+
+
+def make_agent(completion_mode="wait_for"):
+    agent = TerminusKIRA.__new__(TerminusKIRA)
+    agent._completion_mode = completion_mode
+    agent._timer = EpisodeTimer(episode=0)
+    agent._undrained_markers = []
+    agent.logger = logging.getLogger("test")
+    return agent
+
+
+def await_marker(agent, marker, session, duration_sec=5.0, poll_interval=0.01):
+    return asyncio.run(
+        agent._await_marker(
+            marker, session, time.monotonic(), duration_sec, poll_interval
+        )
+    )
+
+
+def test_wait_for_signal():
+    agent, session = make_agent(), FakeSession(return_codes=[0])
+    agent._undrained_markers.append("M1")
+    assert await_marker(agent, "M1", session)
+    assert session.environment.commands[0].endswith("tmux wait-for M1")
+    assert agent._undrained_markers == []
+
+
+def test_wait_for_timeout_leaves_marker_to_drain():
+    agent, session = make_agent(), FakeSession(return_codes=[124, 0])
+    agent._undrained_markers.append("M1")
+    assert not await_marker(agent, "M1", session, duration_sec=0.5)
+    assert agent._undrained_markers == ["M1"]
+    assert session.panes == []
+
+    # The next successful wait also consumes the earlier signal
+    agent._undrained_markers.append("M2")
+    assert await_marker(agent, "M2", session)
+    command = session.environment.commands[1]
+    assert "tmux wait-for M2 && { timeout 1s tmux wait-for M1; true; }" in command
+    assert agent._undrained_markers == []
+
+
+def test_wait_for_falls_back_to_polling():
+    agent = make_agent()
+    session = FakeSession(return_codes=[1], panes=["$ make", "$ make\nM1\n$ "])
+    assert await_marker(agent, "M1", session)
+    assert len(session.environment.commands) == 1
+    assert session.panes == []
+    assert agent._timer.counters["capture_pane"] == 2
+
+
+def test_polling_times_out():
+    agent = make_agent()
+    session = FakeSession(return_codes=[1], panes=["$ sleep 100"] * 100)
+    assert not await_marker(agent, "M1", session, duration_sec=0.4)
+
+
+def test_poll_mode_does_not_exec():
+    agent = make_agent("poll")
+    session = FakeSession(panes=["echo 'M1'\nM1"])
+    assert await_marker(agent, "M1", session)
+    assert session.environment.commands == []
+
+
+def test_marker_keystrokes_signal_channel_only_in_wait_for_mode():
+    assert make_agent()._marker_keystrokes("M1") == ("echo 'M1'; tmux wait-for -S M1\n")
+    assert make_agent("poll")._marker_keystrokes("M1") == "echo 'M1'\n"
+
+
+def test_trajectory_json_is_rewritten_every_n_episodes(tmp_path, monkeypatch):
+    dumps = []
+    monkeypatch.setattr(
+        Terminus2, "_dump_trajectory", lambda self: dumps.append(self._n_episodes)
+    )
+    agent = make_agent()
+    agent._trajectory_log = TrajectoryLog(tmp_path / "trajectory.steps.jsonl")
+    agent._trajectory_dump_every = 3
+    agent._trajectory_steps = []
+
+    for episode in range(1, 8):
+        agent._n_episodes = episode
+        agent._trajectory_steps.append(
+            Step(step_id=episode, source="agent", message=f"step {episode}")
+        )
+        agent._flush_trajectory()
+
+    assert dumps == [3, 6]
+    assert len(TrajectoryLog.read_steps(agent._trajectory_log.path)) == 7
+
+
+def test_trajectory_json_is_rewritten_every_episode_without_step_log(monkeypatch):
+    dumps = []
+    monkeypatch.setattr(
+        Terminus2, "_dump_trajectory", lambda self: dumps.append(self._n_episodes)
+    )
+    agent = make_agent()
+    agent._trajectory_log = None
+
+    for episode in range(1, 4):
+        agent._n_episodes = episode
+        agent._flush_trajectory()
+
+    assert dumps == [1, 2, 3]
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+
+    async def call(self, prompt, **kwargs):
+        self.calls.append((prompt, kwargs))
+        return LLMResponse(content="a red square")
+
+    def get_model_output_limit(self):
+        return 4096
+
+
+def test_image_analysis_goes_through_the_chat_llm_and_limiter():
+    agent = make_agent()
+    agent._llm = FakeLLM()
+    agent._llm_limiter = LLMRateLimiter(max_concurrent=1)
+    content = [
+        {"type": "text", "text": "What is this?"},
+        {"type": "image_url", "image_url": {"url": "data:image/png;base64,AA=="}},
+    ]
+
+    response = asyncio.run(agent._call_llm_for_image(content))
+
+    assert response.content == "a red square"
+    assert agent._llm.calls == [(content, {"max_tokens": 4096})]
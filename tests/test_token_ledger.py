@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import litellm
+
+from terminus_kira.token_ledger import TokenLedger
+
+
+def fake_counter(calls):
+    def token_counter(model, messages):
+        calls.append(messages[0]["content"])
+        return len(messages[0]["content"])
+
+    return token_counter
+
+
+def test_append_only_counts_new_messages(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellm, "token_counter", fake_counter(calls))
+    ledger = TokenLedger("model")
+    messages = [
+        {"role": "system", "content": "aaaa"},
+        {"role": "user", "content": "bb"},
+    ]
+    assert ledger.total(messages) == 6
+
+    messages.append({"role": "assistant", "content": "ccc"})
+    assert ledger.total(messages) == 9
+    assert calls == ["aaaa", "bb", "ccc"]
+
+
+def test_rewritten_history_recounts_from_first_change(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellm, "token_counter", fake_counter(calls))
+    ledger = TokenLedger("model")
+    messages = [
+        {"role": "system", "content": "aaaa"},
+        {"role": "user", "content": "bb"},
+        {"role": "assistant", "content": "ccc"},
+    ]
+    ledger.total(messages)
+
+    messages[1:] = [{"role": "user", "content": "summary"}]
+    assert ledger.total(messages) == 11
+    assert calls == ["aaaa", "bb", "ccc", "summary"]
+
+
+def test_copies_of_a_message_are_not_counted_again(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellm, "token_counter", fake_counter(calls))
+    ledger = TokenLedger("model")
+    msg = {"role": "user", "content": "hello"}
+    assert ledger.count_message(msg) == ledger.count_message(dict(msg)) == 5
+    assert calls == ["hello"]
+
+
+def test_falls_back_to_estimate(monkeypatch):
+    def broken(model, messages):
+        raise ValueError("unknown model")
+
+    monkeypatch.setattr(litellm, "token_counter", broken)
+    assert (
+        TokenLedger("model").count_message({"role": "user", "content": "x" * 40}) == 14
+    )
+
+
+def test_concurrent_totals_from_threads_agree(monkeypatch):
+    monkeypatch.setattr(litellm, "token_counter", fake_counter([]))
+    ledger = TokenLedger("model")
+    messages = [{"role": "user", "content": "x" * (i % 7 + 1)} for i in range(200)]
+    expected = sum(len(m["content"]) for m in messages)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        totals = list(
+            pool.map(lambda n: ledger.total(messages[:n]), [200, 50, 200, 120] * 5)
+        )
+
+    assert ledger.total(messages) == expected
+    assert totals[0::4] == [expected] * 5
+    assert totals[1::4] == [sum(len(m["content"]) for m in messages[:50])] * 5
+
+
+def test_caller_mutating_its_list_does_not_corrupt_the_ledger(monkeypatch):
+    monkeypatch.setattr(litellm, "token_counter", fake_counter([]))
+    ledger = TokenLedger("model")
+    messages = [{"role": "user", "content": "aaaa"}]
+    assert ledger.total(messages) == 4
+
+    messages[0] = {"role": "user", "content": "bb"}
+    assert ledger.total(messages) == 2
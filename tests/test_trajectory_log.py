@@ -0,0 +1,61 @@
+from harbor.models.trajectories import Step
+
+from terminus_kira.trajectory_log import TrajectoryLog
+
+
+def make_steps(*messages):
+    return [
+        Step(step_id=i, source="agent", message=message)
+        for i, message in enumerate(messages, 1)
+    ]
+
+
+def test_flush_appends_only_new_steps(tmp_path):
+    log = TrajectoryLog(tmp_path / "steps.jsonl")
+    steps = make_steps("a", "b")
+    assert log.flush(steps) == 2
+    assert log.flush(steps) == 0
+    steps += make_steps("a", "b", "c")[2:]
+    assert log.flush(steps) == 1
+
+    records = TrajectoryLog.read_steps(log.path)
+    assert [r["message"] for r in records] == ["a", "b", "c"]
+    assert {r["segment"] for r in records} == {0}
+
+
+def test_shorter_rebuilt_list_starts_a_new_segment(tmp_path):
+    log = TrajectoryLog(tmp_path / "steps.jsonl")
+    log.flush(make_steps("a", "b", "c"))
+    log.flush(make_steps("summary"))
+
+    records = TrajectoryLog.read_steps(log.path)
+    assert [(r["message"], r["segment"]) for r in records] == [
+        ("a", 0),
+        ("b", 0),
+        ("c", 0),
+        ("summary", 1),
+    ]
+
+
+def test_longer_rebuilt_list_starts_a_new_segment(tmp_path):
+    log = TrajectoryLog(tmp_path / "steps.jsonl")
+    log.flush(make_steps("a", "b"))
+    log.flush(make_steps("x", "y", "z"))
+
+    records = TrajectoryLog.read_steps(log.path)
+    assert [(r["message"], r["segment"]) for r in records] == [
+        ("a", 0),
+        ("b", 0),
+        ("x", 1),
+        ("y", 1),
+        ("z", 1),
+    ]
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    log = TrajectoryLog(tmp_path / "steps.jsonl")
+    log.flush(make_steps("a", "b"))
+    with open(log.path, "a") as f:
+        f.write('{"step_id": 3, "mess')
+
+    assert len(TrajectoryLog.read_steps(log.path)) == 2